@@ -4,7 +4,7 @@ from sqlalchemy import text
 
 from app.api.v1.contracts.responses import HealthCheckResponse
 from app.database.session_manager import get_session_manager
-from app.services.storage_service import get_minio_client
+from app.services.storage_service import get_minio_storage
 
 health_check_router = APIRouter(tags=["Health Check"])
 
@@ -36,8 +36,7 @@ async def health_check():
         health_status.api = "unhealthy"
 
     try:
-        minio = get_minio_client()
-        minio.list_buckets()
+        await get_minio_storage().ping()
         health_status.storage = "healthy"
     except Exception as e:
         print(f"Health Check Storage Error: {e}")
@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import Literal
+from typing import Any, Literal
+from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -14,8 +15,32 @@ class EntryUpdateRequest(BaseRequest):
     description: str | None = Field(default=None, max_length=2047)
 
 
+class UploadInitiateRequest(BaseRequest):
+    filename: str = Field(min_length=1, max_length=255)
+    size_bytes: int = Field(gt=0, description="Exact size of the CVSX file in bytes")
+    lattice_to_mesh: bool = Field(
+        default=True,
+        description="Transform lattice to mesh (True) or volume (False)",
+    )
+
+
+class JsonPatchOperation(BaseRequest):
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str = Field(description="JSON Pointer to the target location")
+    value: Any = Field(default=None, description="Required for add, replace and test")
+    from_: str | None = Field(
+        default=None,
+        alias="from",
+        description="JSON Pointer to the source location, required for move and copy",
+    )
+
+
 class EntryDownloadQuery(BaseRequest):
     format_type: Literal["mvsx", "mvstory"] = Field(default="mvsx")
+    presigned: bool = Field(
+        default=False,
+        description="Return a short-lived URL to download the file from object storage",
+    )
 
 
 class EntryPaginationQuery(BaseRequest):
@@ -23,6 +48,22 @@ class EntryPaginationQuery(BaseRequest):
     per_page: int = Field(default=10, ge=1, le=100)
     sort_by: Literal["name", "size_bytes", "created_at", "status"] = Field(default="created_at")
     sort_order: Literal["asc", "desc"] = Field(default="desc")
+    cursor: str | None = Field(
+        default=None,
+        description="`next_cursor` of the previous page; when set, `page` is ignored",
+    )
+    include_total: bool = Field(
+        default=True,
+        description="Count all entries to fill in `total_items` and `total_pages`",
+    )
+
+
+class EntryBulkRequest(BaseRequest):
+    ids: list[UUID] = Field(min_length=1, max_length=100, description="IDs of the entries")
+
+
+class EntryBulkShareLinkRequest(EntryBulkRequest):
+    is_active: bool = Field(description="Whether the share links are active")
 
 
 class ShareLinkUpdateRequest(BaseRequest):
@@ -31,6 +72,10 @@ class ShareLinkUpdateRequest(BaseRequest):
 
 class ShareLinkDownloadQuery(BaseRequest):
     format_type: Literal["mvsx", "mvstory"] = Field(default="mvsx")
+    presigned: bool = Field(
+        default=False,
+        description="Return a short-lived URL to download the file from object storage",
+    )
 
 
 class CreateApiKeyRequest(BaseRequest):
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Any, Literal
 from uuid import UUID
 
 from pydantic import AwareDatetime, BaseModel, ConfigDict, Field
@@ -41,12 +41,63 @@ class EntryResponse(TimestampResponseMixin, UuidResponseMixin, BaseResponse):
     error_message: str | None
 
 
+class UploadPartUrlResponse(BaseResponse):
+    part_number: int = Field(ge=1)
+    url: str
+
+
+class UploadSessionResponse(UuidResponseMixin, BaseResponse):
+    size_bytes: int
+    part_size: int = Field(description="Size of every part except the last one")
+    expires_at: AwareDatetime
+    parts: list[UploadPartUrlResponse] = Field(
+        description="Presigned PUT URLs, one per part, to upload the file to"
+    )
+
+
+class UploadedPartResponse(BaseResponse):
+    part_number: int = Field(ge=1)
+    size: int | None
+    etag: str
+
+
+class UploadStatusResponse(UuidResponseMixin, BaseResponse):
+    size_bytes: int
+    part_size: int
+    expires_at: AwareDatetime
+    received_bytes: int
+    parts: list[UploadedPartResponse] = Field(description="Parts received so far")
+
+
+class PresignedUrlResponse(BaseResponse):
+    url: str = Field(description="Presigned GET URL, valid until `expires_at`")
+    expires_at: AwareDatetime
+
+
+class ModelChangeResponse(BaseResponse):
+    revision: int
+    patch: list[dict[str, Any]] = Field(
+        description="JSON Patch (RFC 6902) from the previous revision"
+    )
+    author_id: UUID | None
+    created_at: AwareDatetime
+
+
+class ModelChangesResponse(BaseResponse):
+    revision: int = Field(description="Current revision of the model, also sent as its ETag")
+    changes: list[ModelChangeResponse] = Field(description="Changes in revision order")
+
+
 class PaginatedResponse[T](BaseResponse):
     page: int = Field(ge=1)
     per_page: int = Field(ge=1, le=100)
-    total_pages: int
-    total_items: int
+    total_pages: int | None
+    total_items: int | None
     items: list[T]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Cursor of the page after this one, null on the last page",
+    )
 
 
 class ApiKeyResponse(TimestampResponseMixin, UuidResponseMixin, BaseResponse):
@@ -2,6 +2,7 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException, Request, status
 
+from app.api.v1.middleware.auth_middleware import resolve_user
 from app.database.models.user_model import User
 from app.services.api_key_service import ApiKeyService, get_api_key_service
 from app.services.auth_service import AuthService, get_auth_service
@@ -11,8 +12,8 @@ from app.services.share_link_service import ShareLinkService, get_share_link_ser
 from app.services.user_service import UserService, get_user_service
 
 
-def get_required_user_from_state(request: Request) -> User:
-    user = getattr(request.state, "user", None)
+async def get_required_user_from_state(request: Request) -> User:
+    user = await resolve_user(request)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -21,8 +22,8 @@ def get_required_user_from_state(request: Request) -> User:
     return user
 
 
-def get_optional_user_from_state(request: Request) -> User | None:
-    return getattr(request.state, "user", None)
+async def get_optional_user_from_state(request: Request) -> User | None:
+    return await resolve_user(request)
 
 
 ApiKeyServiceDep = Annotated[ApiKeyService, Depends(get_api_key_service)]
@@ -7,7 +7,7 @@ from fastapi import APIRouter, HTTPException, Request, Response, status
 from fastapi.responses import RedirectResponse
 
 from app.api.v1.contracts.responses import UserResponse
-from app.api.v1.deps import AuthServiceDep, RequireUserDep, UserServiceDep
+from app.api.v1.deps import AuthServiceDep, OptionalUserDep, RequireUserDep, UserServiceDep
 from app.api.v1.tags import Tags
 from app.core.settings import get_settings
 from app.core.settings.api_settings import get_api_settings
@@ -180,8 +180,8 @@ async def get_user(
     status_code=status.HTTP_200_OK,
     response_model=bool,
 )
-async def verify_auth(request: Request):
-    return request.state.user is not None
+async def verify_auth(user: OptionalUserDep):
+    return user is not None
 
 
 if get_api_settings().MODE == ModeEnum.development:
@@ -1,17 +1,22 @@
+import posixpath
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from tempfile import TemporaryDirectory
+from urllib.parse import quote
 from uuid import UUID
 
-from fastapi import (
-    BackgroundTasks,
-)
-from fastapi.responses import FileResponse
+from fastapi import Response
+from fastapi.responses import FileResponse, StreamingResponse
 
+from app.api.v1.contracts.responses import PresignedUrlResponse
 from app.api.v1.deps import (
     EntryServiceDep,
     ProcessingServiceDep,
 )
+from app.core.model_codec import accepts_encoding, decode_model
+from app.core.settings.minio_settings import get_minio_settings
 from app.database.models.user_model import User
+from app.services.model_cache_service import StoredDocument
+from app.services.storage_service import get_minio_storage
 
 
 class DownloadFormat(str, Enum):
@@ -31,36 +36,98 @@ DOWNLOAD_CONFIG = {
 }
 
 
-def cleanup_temp_dir(temp_dir: TemporaryDirectory):
-    temp_dir.cleanup()
-
-
 async def handle_download(
     entry_id: UUID,
     user: User | None,
     entry_service: EntryServiceDep,
     processing_service: ProcessingServiceDep,
-    background_tasks: BackgroundTasks,
     format_type: DownloadFormat,
-) -> FileResponse:
+    presigned: bool = False,
+) -> FileResponse | StreamingResponse | PresignedUrlResponse:
     entry = await entry_service.get_entry_by_id(
         entry_id=entry_id,
         user=user,
     )
 
-    temp_dir = TemporaryDirectory()
-    background_tasks.add_task(cleanup_temp_dir, temp_dir)
+    config = DOWNLOAD_CONFIG[format_type]
+    filename = f"{entry.name}{config['extension']}"
+
+    if presigned:
+        object_name = await processing_service.get_shared_export(
+            entry_id=entry.id,
+            target=format_type,
+            internal_storage_key_prefix=entry.storage_key,
+        )
+        return presigned_download(object_name, filename, config["media_type"])
 
-    filepath = await processing_service.generate_export(
+    export = await processing_service.get_export(
+        entry_id=entry.id,
         target=format_type,
         internal_storage_key_prefix=entry.storage_key,
-        tempdir=temp_dir.name,
     )
 
-    config = DOWNLOAD_CONFIG[format_type]
+    if isinstance(export, str):
+        return FileResponse(
+            path=export,
+            media_type=config["media_type"],
+            filename=filename,
+        )
 
-    return FileResponse(
-        path=filepath,
+    return StreamingResponse(
+        content=export,
         media_type=config["media_type"],
-        filename=f"{entry.name}{config['extension']}",
+        headers={"Content-Disposition": content_disposition(filename)},
+    )
+
+
+def presigned_download(
+    object_name: str,
+    filename: str | None = None,
+    media_type: str | None = None,
+) -> PresignedUrlResponse:
+    expires = timedelta(seconds=get_minio_settings().MINIO_PRESIGNED_URL_EXPIRY_SECONDS)
+    expires_at = datetime.now(timezone.utc) + expires
+
+    response_headers = {
+        "response-content-disposition": content_disposition(
+            filename or posixpath.basename(object_name)
+        ),
+    }
+    if media_type:
+        response_headers["response-content-type"] = media_type
+
+    url = get_minio_storage().presigned_get_url(
+        object_name=object_name,
+        expires=expires,
+        response_headers=response_headers,
     )
+    return PresignedUrlResponse(url=url, expires_at=expires_at)
+
+
+def set_model_cache_headers(response: Response, etag: str) -> None:
+    # let clients keep the model but revalidate it with If-None-Match on every load
+    response.headers["ETag"] = f'"{etag}"'
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def model_response(stored: StoredDocument, accept_encoding: str | None) -> Response:
+    """Serves the stored model document, still compressed when the client accepts it."""
+    headers = {"Vary": "Accept-Encoding"}
+    if accepts_encoding(accept_encoding, stored.encoding):
+        content = stored.data
+        if stored.encoding != "identity":
+            headers["Content-Encoding"] = stored.encoding
+    else:
+        content = decode_model(stored.data)
+
+    response = Response(content=content, media_type="application/json", headers=headers)
+    set_model_cache_headers(response, stored.etag)
+    return response
+
+
+def content_disposition(filename: str) -> str:
+    # same encoding as FileResponse uses for its filename argument
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
@@ -1,32 +1,55 @@
 from math import ceil
-from typing import Annotated
+from typing import Annotated, Any
 from uuid import UUID
 
 from cvsx2mvsx.models.internal.entry import InternalEntry
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Body,
     File,
+    Header,
     Path,
     Query,
+    Request,
+    Response,
     UploadFile,
     status,
 )
 
 from app.api.v1.contracts.requests import (
+    EntryBulkRequest,
+    EntryBulkShareLinkRequest,
     EntryDownloadQuery,
     EntryPaginationQuery,
     EntryUpdateRequest,
+    JsonPatchOperation,
+    UploadInitiateRequest,
+)
+from app.api.v1.contracts.responses import (
+    EntryResponse,
+    ModelChangeResponse,
+    ModelChangesResponse,
+    PaginatedResponse,
+    PresignedUrlResponse,
+    ShareLinkResponse,
+    UploadedPartResponse,
+    UploadPartUrlResponse,
+    UploadSessionResponse,
+    UploadStatusResponse,
 )
-from app.api.v1.contracts.responses import EntryResponse, PaginatedResponse, ShareLinkResponse
 from app.api.v1.deps import (
     EntryServiceDep,
     ProcessingServiceDep,
     RequireUserDep,
 )
-from app.api.v1.endpoints.common import handle_download
+from app.api.v1.endpoints.common import (
+    handle_download,
+    model_response,
+    presigned_download,
+    set_model_cache_headers,
+)
 from app.api.v1.tags import Tags
+from app.services.storage_service import MAX_PARTS
 
 router = APIRouter(prefix="/entries", tags=[Tags.entries])
 
@@ -40,7 +63,6 @@ async def upload_cvsx(
     dataset_file: Annotated[UploadFile, File()],
     entry_service: EntryServiceDep,
     user: RequireUserDep,
-    background_tasks: BackgroundTasks,
     lattice_to_mesh: bool = Query(
         True, description="Transform lattice to mesh (True) or volume (False)"
     ),
@@ -48,11 +70,175 @@ async def upload_cvsx(
     return await entry_service.create_entry(
         user=user,
         dataset_file=dataset_file,
-        background_tasks=background_tasks,
         lattice_to_mesh=lattice_to_mesh,
     )
 
 
+@router.post(
+    "/uploads",
+    status_code=status.HTTP_201_CREATED,
+    response_model=UploadSessionResponse,
+)
+async def initiate_upload(
+    request: Annotated[UploadInitiateRequest, Body()],
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    upload_session, part_urls = await entry_service.initiate_upload(
+        user=user,
+        filename=request.filename,
+        size_bytes=request.size_bytes,
+        lattice_to_mesh=request.lattice_to_mesh,
+    )
+
+    return UploadSessionResponse(
+        id=upload_session.id,
+        size_bytes=upload_session.size_bytes,
+        part_size=upload_session.part_size,
+        expires_at=upload_session.expires_at,
+        parts=[
+            UploadPartUrlResponse(part_number=part_number, url=url)
+            for part_number, url in enumerate(part_urls, start=1)
+        ],
+    )
+
+
+@router.get(
+    "/uploads/{upload_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=UploadStatusResponse,
+)
+async def get_upload_status(
+    upload_id: Annotated[UUID, Path(title="Upload ID")],
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    upload_session, parts = await entry_service.get_upload_status(
+        upload_session_id=upload_id,
+        user=user,
+    )
+
+    return UploadStatusResponse(
+        id=upload_session.id,
+        size_bytes=upload_session.size_bytes,
+        part_size=upload_session.part_size,
+        expires_at=upload_session.expires_at,
+        received_bytes=sum(part.size or 0 for part in parts),
+        parts=[UploadedPartResponse.model_validate(part) for part in parts],
+    )
+
+
+@router.put(
+    "/uploads/{upload_id}/parts/{part_number}",
+    status_code=status.HTTP_200_OK,
+    response_model=UploadedPartResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
+async def upload_part(
+    upload_id: Annotated[UUID, Path(title="Upload ID")],
+    part_number: Annotated[int, Path(title="Part number", ge=1, le=MAX_PARTS)],
+    request: Request,
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    return await entry_service.upload_part(
+        upload_session_id=upload_id,
+        user=user,
+        part_number=part_number,
+        chunks=request.stream(),
+    )
+
+
+@router.post(
+    "/uploads/{upload_id}/complete",
+    status_code=status.HTTP_201_CREATED,
+    response_model=EntryResponse,
+)
+async def complete_upload(
+    upload_id: Annotated[UUID, Path(title="Upload ID")],
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    return await entry_service.complete_upload(
+        upload_session_id=upload_id,
+        user=user,
+    )
+
+
+@router.delete(
+    "/uploads/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def abort_upload(
+    upload_id: Annotated[UUID, Path(title="Upload ID")],
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    await entry_service.abort_upload(
+        upload_session_id=upload_id,
+        user=user,
+    )
+
+
+@router.post(
+    "/bulk/fetch",
+    status_code=status.HTTP_200_OK,
+    response_model=list[EntryResponse],
+    description="Returns the requested entries in request order.",
+)
+async def get_entries_by_ids(
+    request: Annotated[EntryBulkRequest, Body()],
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    return await entry_service.get_entries_by_ids(
+        entry_ids=request.ids,
+        user=user,
+    )
+
+
+@router.post(
+    "/bulk/share-link",
+    status_code=status.HTTP_200_OK,
+    response_model=list[ShareLinkResponse],
+    description="Activates or deactivates the share links of the requested entries.",
+)
+async def update_share_links(
+    request: Annotated[EntryBulkShareLinkRequest, Body()],
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    return await entry_service.update_share_links(
+        entry_ids=request.ids,
+        user=user,
+        is_active=request.is_active,
+    )
+
+
+@router.post(
+    "/bulk/delete",
+    status_code=status.HTTP_200_OK,
+    response_model=None,
+    description="Deletes the requested entries. Nothing is deleted unless all of them can be.",
+)
+async def delete_entries(
+    request: Annotated[EntryBulkRequest, Body()],
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    await entry_service.delete_entries(
+        entry_ids=request.ids,
+        user=user,
+    )
+
+
 @router.get(
     "/{entry_id}",
     status_code=status.HTTP_200_OK,
@@ -95,15 +281,19 @@ async def list_user_entries(
     entry_service: EntryServiceDep,
     user: RequireUserDep,
 ):
-    entries, total_items = await entry_service.list_user_entries(
+    entries, total_items, next_cursor = await entry_service.list_user_entries(
         user_id=user.id,
         page=pagination_query.page,
         per_page=pagination_query.per_page,
         sort_by=pagination_query.sort_by,
         sort_order=pagination_query.sort_order,
+        cursor=pagination_query.cursor,
+        include_total=pagination_query.include_total,
     )
 
-    total_pages = ceil(total_items / pagination_query.per_page)
+    total_pages = None
+    if total_items is not None:
+        total_pages = ceil(total_items / pagination_query.per_page)
 
     return PaginatedResponse(
         page=pagination_query.page,
@@ -111,6 +301,7 @@ async def list_user_entries(
         total_pages=total_pages,
         total_items=total_items,
         items=list(entries),
+        next_cursor=next_cursor,
     )
 
 
@@ -123,16 +314,27 @@ async def get_entry_model(
     entry_id: Annotated[UUID, Path(title="Entry ID")],
     entry_service: EntryServiceDep,
     user: RequireUserDep,
+    if_none_match: Annotated[str | None, Header()] = None,
+    accept_encoding: Annotated[str | None, Header()] = None,
 ):
-    return await entry_service.get_internal_model(
+    stored = await entry_service.get_internal_model_document(
         entry_id=entry_id,
         user=user,
+        if_none_match=if_none_match,
     )
+    return model_response(stored, accept_encoding)
 
 
 @router.get(
     "/{entry_id}/download",
     status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/zip": {}},
+            "model": PresignedUrlResponse,
+            "description": "The export file, or a presigned URL when `presigned` is set",
+        }
+    },
 )
 async def download(
     entry_id: Annotated[UUID, Path(title="Entry ID")],
@@ -140,18 +342,36 @@ async def download(
     entry_service: EntryServiceDep,
     processing_service: ProcessingServiceDep,
     user: RequireUserDep,
-    background_tasks: BackgroundTasks,
 ):
     return await handle_download(
         entry_id=entry_id,
         format_type=query.format_type,
+        presigned=query.presigned,
         entry_service=entry_service,
         processing_service=processing_service,
         user=user,
-        background_tasks=background_tasks,
     )
 
 
+@router.get(
+    "/{entry_id}/assets/{asset_path:path}",
+    status_code=status.HTTP_200_OK,
+    response_model=PresignedUrlResponse,
+)
+async def get_asset_url(
+    entry_id: Annotated[UUID, Path(title="Entry ID")],
+    asset_path: Annotated[str, Path(title="Asset path within the entry")],
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    object_name = await entry_service.get_asset_object_name(
+        entry_id=entry_id,
+        user=user,
+        asset_path=asset_path,
+    )
+    return presigned_download(object_name)
+
+
 @router.put(
     "/{entry_id}",
     status_code=status.HTTP_200_OK,
@@ -180,13 +400,95 @@ async def update_entry(
 async def update_entry_model(
     entry_id: Annotated[UUID, Path(title="Entry ID")],
     model: Annotated[InternalEntry, Body(title="Internal Model JSON")],
+    response: Response,
     entry_service: EntryServiceDep,
     user: RequireUserDep,
+    if_match: Annotated[str | None, Header()] = None,
 ):
-    return await entry_service.update_internal_model(
+    stored = await entry_service.update_internal_model(
         entry_id=entry_id,
         user=user,
         model=model,
+        if_match=if_match,
+    )
+    set_model_cache_headers(response, stored.etag)
+    return stored.model
+
+
+@router.patch(
+    "/{entry_id}/model",
+    status_code=status.HTTP_200_OK,
+    response_model=InternalEntry,
+    description=(
+        "Applies a JSON Patch (RFC 6902, a list of operations) or a JSON Merge Patch "
+        "(RFC 7396, an object) to the internal model."
+    ),
+)
+async def patch_entry_model(
+    entry_id: Annotated[UUID, Path(title="Entry ID")],
+    patch: Annotated[list[JsonPatchOperation] | dict[str, Any], Body(title="Patch document")],
+    response: Response,
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+    if_match: Annotated[str | None, Header()] = None,
+):
+    stored = await entry_service.patch_internal_model(
+        entry_id=entry_id,
+        user=user,
+        patch=(
+            [operation.model_dump(by_alias=True, exclude_unset=True) for operation in patch]
+            if isinstance(patch, list)
+            else patch
+        ),
+        if_match=if_match,
+    )
+    set_model_cache_headers(response, stored.etag)
+    return stored.model
+
+
+@router.get(
+    "/{entry_id}/model/changes",
+    status_code=status.HTTP_200_OK,
+    response_model=ModelChangesResponse,
+    description=(
+        "Lists the JSON Patches applied to the internal model after revision `since`, "
+        "so editors holding that revision can catch up without downloading the model."
+    ),
+)
+async def get_entry_model_changes(
+    entry_id: Annotated[UUID, Path(title="Entry ID")],
+    since: Annotated[int, Query(ge=0, title="Revision the client already has")],
+    response: Response,
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    revision, changes = await entry_service.get_model_changes(
+        entry_id=entry_id,
+        user=user,
+        since=since,
+    )
+    response.headers["ETag"] = f'"{revision}"'
+    return ModelChangesResponse(
+        revision=revision,
+        changes=[ModelChangeResponse.model_validate(change) for change in changes],
+    )
+
+
+@router.get(
+    "/{entry_id}/model/revisions/{revision}",
+    status_code=status.HTTP_200_OK,
+    response_model=InternalEntry,
+)
+async def get_entry_model_revision(
+    entry_id: Annotated[UUID, Path(title="Entry ID")],
+    revision: Annotated[int, Path(ge=0, title="Revision")],
+    entry_service: EntryServiceDep,
+    user: RequireUserDep,
+):
+    return await entry_service.get_model_revision(
+        entry_id=entry_id,
+        user=user,
+        revision=revision,
     )
 
 
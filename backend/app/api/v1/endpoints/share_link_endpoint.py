@@ -2,18 +2,25 @@ from typing import Annotated
 from uuid import UUID
 
 from cvsx2mvsx.models.internal.entry import InternalEntry
-from fastapi import APIRouter, BackgroundTasks, Body, Path, Query, status
+from fastapi import APIRouter, Body, Header, Path, Query, status
 
 from app.api.v1.contracts.requests import ShareLinkDownloadQuery, ShareLinkUpdateRequest
-from app.api.v1.contracts.responses import EntryResponse, ShareLinkResponse
+from app.api.v1.contracts.responses import (
+    EntryResponse,
+    PresignedUrlResponse,
+    ShareLinkResponse,
+)
 from app.api.v1.deps import (
     EntryServiceDep,
-    OptionalUserDep,
     ProcessingServiceDep,
     RequireUserDep,
     ShareLinkServiceDep,
 )
-from app.api.v1.endpoints.common import handle_download
+from app.api.v1.endpoints.common import (
+    handle_download,
+    model_response,
+    presigned_download,
+)
 from app.api.v1.tags import Tags
 
 router = APIRouter(prefix="/share_links", tags=[Tags.share_links])
@@ -42,21 +49,31 @@ async def get_entry_model(
     share_link_id: Annotated[UUID, Path(title="Share Link ID")],
     entry_service: EntryServiceDep,
     link_service: ShareLinkServiceDep,
-    user: OptionalUserDep,
+    if_none_match: Annotated[str | None, Header()] = None,
+    accept_encoding: Annotated[str | None, Header()] = None,
 ):
     entry = await link_service.get_entry_from_share_link(
         share_link_id=share_link_id,
     )
 
-    return await entry_service.get_internal_model(
+    stored = await entry_service.get_internal_model_document(
         entry_id=entry.id,
         user=None,
+        if_none_match=if_none_match,
     )
+    return model_response(stored, accept_encoding)
 
 
 @router.get(
     "/{share_link_id}/download",
     status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/zip": {}},
+            "model": PresignedUrlResponse,
+            "description": "The export file, or a presigned URL when `presigned` is set",
+        }
+    },
 )
 async def download(
     share_link_id: Annotated[UUID, Path(title="Share Link ID")],
@@ -64,7 +81,6 @@ async def download(
     entry_service: EntryServiceDep,
     link_service: ShareLinkServiceDep,
     processing_service: ProcessingServiceDep,
-    background_tasks: BackgroundTasks,
 ):
     entry = await link_service.get_entry_from_share_link(
         share_link_id=share_link_id,
@@ -72,13 +88,35 @@ async def download(
     return await handle_download(
         entry_id=entry.id,
         format_type=query.format_type,
+        presigned=query.presigned,
         entry_service=entry_service,
         processing_service=processing_service,
         user=None,
-        background_tasks=background_tasks,
     )
 
 
+@router.get(
+    "/{share_link_id}/assets/{asset_path:path}",
+    status_code=status.HTTP_200_OK,
+    response_model=PresignedUrlResponse,
+)
+async def get_asset_url(
+    share_link_id: Annotated[UUID, Path(title="Share Link ID")],
+    asset_path: Annotated[str, Path(title="Asset path within the entry")],
+    entry_service: EntryServiceDep,
+    link_service: ShareLinkServiceDep,
+):
+    entry = await link_service.get_entry_from_share_link(
+        share_link_id=share_link_id,
+    )
+    object_name = await entry_service.get_asset_object_name(
+        entry_id=entry.id,
+        user=None,
+        asset_path=asset_path,
+    )
+    return presigned_download(object_name)
+
+
 @router.put(
     "/{share_link_id}",
     status_code=status.HTTP_200_OK,
@@ -1,65 +1,109 @@
-from typing import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.settings.api_settings import get_api_settings
+from app.database.models.user_model import User
 from app.database.session_manager import get_session_manager
 from app.services.api_key_service import ApiKeyService
 from app.services.auth_service import AuthService
-from app.services.user_service import UserService
+from app.services.user_service import UserService, get_user_cache
 
-RequestResponseEndpoint = Callable[[Request], Awaitable[Response]]
+_UNRESOLVED = object()
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
+@dataclass(frozen=True)
+class Credentials:
+    """What a request authenticated with: a raw API key or verified JWT claims."""
+
+    api_key: str | None = None
+    claims: dict[str, Any] | None = None
+
+    async def resolve(self) -> User | None:
+        if self.api_key:
+            return await self._resolve_api_key(self.api_key)
+        if self.claims:
+            return await self._resolve_jwt(self.claims)
+        return None
+
+    @staticmethod
+    async def _resolve_api_key(token: str) -> User | None:
+        async with get_session_manager().session() as session:
+            api_key_service = ApiKeyService(session)
+            return await api_key_service.get_user_by_key(token)
+
+    @staticmethod
+    async def _resolve_jwt(claims: dict[str, Any]) -> User | None:
+        user_id = claims.get("sub")
+        if not user_id:
+            return None
+
+        cache = get_user_cache()
+        user = cache.get(user_id)
+        if user is None:
+            async with get_session_manager().session() as session:
+                user_service = UserService(session)
+                user = await user_service.get_user_by_id(user_id)
+            if user:
+                cache.put(user_id, user)
+
+        return user
+
+
+class AuthMiddleware:
+    """Stores the credentials of an HTTP request in `request.state.credentials`.
+
+    Only the token itself is checked here. The user is looked up by `resolve_user`
+    once an endpoint depends on it, so routes that never do skip the database.
+    Written as plain ASGI rather than on `BaseHTTPMiddleware`, so requests and
+    responses, streaming ones included, pass through without extra tasks or
+    memory streams.
+    """
+
     def __init__(
         self,
         app: ASGIApp,
         auth_service: AuthService,
     ):
-        super().__init__(app)
+        self.app = app
         self.auth_service: AuthService = auth_service
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        request.state.user = None
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state["credentials"] = None
 
-        token = request.cookies.get(get_api_settings().JWT_ACCESS_TOKEN_COOKIE)
+        connection = HTTPConnection(scope)
+        token = connection.cookies.get(get_api_settings().JWT_ACCESS_TOKEN_COOKIE)
 
         if not token:
-            auth_header = request.headers.get("Authorization")
+            auth_header = connection.headers.get("Authorization")
             if auth_header and auth_header.startswith("Bearer "):
                 token = auth_header.split(" ")[1]
 
-        if not token:
-            return await call_next(request)
+        if token:
+            if token.startswith(ApiKeyService.PREFIX):
+                state["credentials"] = Credentials(api_key=token)
+            else:
+                claims = self.auth_service.verify_token(token)
+                if claims:
+                    state["credentials"] = Credentials(claims=claims)
 
-        if token.startswith(ApiKeyService.PREFIX):
-            await self._authenticate_via_api_key(request, token)
-        else:
-            await self._authenticate_via_jwt(request, token)
+        await self.app(scope, receive, send)
 
-        return await call_next(request)
 
-    async def _authenticate_via_api_key(self, request: Request, token: str):
-        async with get_session_manager().session() as session:
-            api_key_service = ApiKeyService(session)
-            user = await api_key_service.get_user_by_key(token)
-            if user:
-                request.state.user = user
+async def resolve_user(connection: HTTPConnection) -> User | None:
+    """Looks up the user of the request on first use and keeps it on the request."""
+    user = getattr(connection.state, "user", _UNRESOLVED)
+    if user is not _UNRESOLVED:
+        return user
 
-    async def _authenticate_via_jwt(self, request: Request, token: str):
-        payload = self.auth_service.verify_token(token)
-        if not payload:
-            return
-
-        user_id = payload.get("sub")
-        if not user_id:
-            return
-
-        async with get_session_manager().session() as session:
-            user_service = UserService(session)
-            user = await user_service.get_user_by_id(user_id)
-            request.state.user = user
+    credentials: Credentials | None = getattr(connection.state, "credentials", None)
+    user = await credentials.resolve() if credentials else None
+    connection.state.user = user
+    return user
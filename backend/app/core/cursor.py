@@ -0,0 +1,30 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor carries the sort key of the last row of a page. It is only encoded,
+not signed: a forged cursor can do no more than start a page elsewhere in the
+caller's own listing.
+"""
+
+import base64
+import json
+from typing import Any
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values: list[Any]) -> str:
+    data = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(data)
+    except ValueError as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if not isinstance(values, list):
+        raise InvalidCursor("Malformed cursor")
+    return values
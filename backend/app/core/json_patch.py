@@ -0,0 +1,203 @@
+"""JSON Patch (RFC 6902) and JSON Merge Patch (RFC 7396) for plain JSON documents.
+
+The apply functions may modify `document` in place and return the patched document,
+which is not necessarily the same object (e.g. when the root is replaced).
+Callers that need the original untouched must pass a copy.
+"""
+
+import copy
+from typing import Any
+
+Json = Any
+
+
+class JsonPatchError(ValueError):
+    """The patch document itself is malformed."""
+
+
+class JsonPatchConflict(JsonPatchError):
+    """The patch is well-formed but cannot be applied to the document."""
+
+
+def apply_json_patch(document: Json, operations: list[dict[str, Json]]) -> Json:
+    for operation in operations:
+        document = _apply_operation(document, operation)
+    return document
+
+
+def apply_merge_patch(document: Json, patch: Json) -> Json:
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    if not isinstance(document, dict):
+        document = {}
+    for key, value in patch.items():
+        if value is None:
+            document.pop(key, None)
+        else:
+            document[key] = apply_merge_patch(document.get(key), value)
+    return document
+
+
+def diff_json(source: Json, target: Json) -> list[dict[str, Json]]:
+    """Returns a JSON Patch that turns `source` into `target`.
+
+    Objects are compared member by member and arrays element by element; an array
+    that changed length is patched by appending or truncating its tail when the
+    common prefix is unchanged, and replaced as a whole otherwise.
+    """
+    operations: list[dict[str, Json]] = []
+    _diff(source, target, "", operations)
+    return operations
+
+
+def format_pointer(tokens: list[str]) -> str:
+    return "".join("/" + token.replace("~", "~0").replace("/", "~1") for token in tokens)
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _apply_operation(document: Json, operation: dict[str, Json]) -> Json:
+    op = operation.get("op")
+    path = _require(operation, "path")
+    tokens = parse_pointer(path)
+
+    match op:
+        case "add":
+            return _add(document, tokens, copy.deepcopy(_require(operation, "value")))
+        case "remove":
+            _remove(document, tokens)
+            return document
+        case "replace":
+            value = copy.deepcopy(_require(operation, "value"))
+            if not tokens:
+                return value
+            _remove(document, tokens)
+            return _add(document, tokens, value)
+        case "move":
+            from_tokens = parse_pointer(_require(operation, "from"))
+            if tokens[: len(from_tokens)] == from_tokens and tokens != from_tokens:
+                raise JsonPatchConflict(f"Cannot move {path!r} into one of its children")
+            value = _remove(document, from_tokens)
+            return _add(document, tokens, value)
+        case "copy":
+            from_tokens = parse_pointer(_require(operation, "from"))
+            value = copy.deepcopy(_resolve(document, from_tokens))
+            return _add(document, tokens, value)
+        case "test":
+            if not _json_equal(_resolve(document, tokens), _require(operation, "value")):
+                raise JsonPatchConflict(f"Test failed at {path!r}")
+            return document
+        case _:
+            raise JsonPatchError(f"Unknown operation: {op!r}")
+
+
+def _diff(source: Json, target: Json, path: str, operations: list[dict[str, Json]]) -> None:
+    if _json_equal(source, target):
+        return
+
+    if isinstance(source, dict) and isinstance(target, dict):
+        for key in source:
+            if key not in target:
+                operations.append({"op": "remove", "path": path + format_pointer([key])})
+        for key, value in target.items():
+            member_path = path + format_pointer([key])
+            if key in source:
+                _diff(source[key], value, member_path, operations)
+            else:
+                operations.append({"op": "add", "path": member_path, "value": value})
+        return
+
+    if isinstance(source, list) and isinstance(target, list):
+        common = min(len(source), len(target))
+        if len(source) != len(target) and not all(
+            _json_equal(a, b) for a, b in zip(source[:common], target[:common])
+        ):
+            operations.append({"op": "replace", "path": path, "value": target})
+            return
+        for index in range(common):
+            _diff(source[index], target[index], f"{path}/{index}", operations)
+        for index in range(len(source) - 1, common - 1, -1):
+            operations.append({"op": "remove", "path": f"{path}/{index}"})
+        for value in target[common:]:
+            operations.append({"op": "add", "path": f"{path}/-", "value": value})
+        return
+
+    operations.append({"op": "replace", "path": path, "value": target})
+
+
+def _require(operation: dict[str, Json], member: str) -> Json:
+    if member not in operation:
+        raise JsonPatchError(f"Operation {operation.get('op')!r} requires {member!r}")
+    return operation[member]
+
+
+def _resolve(document: Json, tokens: list[str]) -> Json:
+    for token in tokens:
+        document = _child(document, token)
+    return document
+
+
+def _child(container: Json, token: str) -> Json:
+    if isinstance(container, dict):
+        if token not in container:
+            raise JsonPatchConflict(f"Member {token!r} does not exist")
+        return container[token]
+    if isinstance(container, list):
+        index = _array_index(container, token)
+        if index >= len(container):
+            raise JsonPatchConflict(f"Index {token!r} is out of range")
+        return container[index]
+    raise JsonPatchConflict(f"Cannot reference {token!r} in a scalar value")
+
+
+def _add(document: Json, tokens: list[str], value: Json) -> Json:
+    if not tokens:
+        return value
+
+    parent = _resolve(document, tokens[:-1])
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        index = len(parent) if token == "-" else _array_index(parent, token)
+        if index > len(parent):
+            raise JsonPatchConflict(f"Index {token!r} is out of range")
+        parent.insert(index, value)
+    else:
+        raise JsonPatchConflict(f"Cannot add {token!r} to a scalar value")
+    return document
+
+
+def _remove(document: Json, tokens: list[str]) -> Json:
+    if not tokens:
+        raise JsonPatchConflict("Cannot remove the document root")
+
+    parent = _resolve(document, tokens[:-1])
+    token = tokens[-1]
+    _child(parent, token)
+    if isinstance(parent, dict):
+        return parent.pop(token)
+    return parent.pop(_array_index(parent, token))
+
+
+def _array_index(array: list, token: str) -> int:
+    if not token.isdigit() or (token.startswith("0") and token != "0"):
+        raise JsonPatchConflict(f"Invalid array index: {token!r}")
+    return int(token)
+
+
+def _json_equal(a: Json, b: Json) -> bool:
+    # booleans are not numbers in JSON, although True == 1 in Python
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    return a == b
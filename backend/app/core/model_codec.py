@@ -0,0 +1,113 @@
+"""Storage encoding of internal model documents (`internal.json`).
+
+Documents are stored as compact JSON, optionally compressed. The encoding is
+recognized from the leading magic bytes, so legacy plain (pretty-printed) JSON
+objects keep working next to compressed ones without any migration.
+"""
+
+import gzip
+import json
+import os
+from typing import Literal
+
+try:
+    import zstandard
+except ImportError:  # optional, zstd documents need the `zstandard` package
+    zstandard = None
+
+ModelEncoding = Literal["identity", "gzip", "zstd"]
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class ModelCodecError(ValueError):
+    pass
+
+
+def detect_encoding(data: bytes) -> ModelEncoding:
+    if data.startswith(GZIP_MAGIC):
+        return "gzip"
+    if data.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return "identity"
+
+
+def encode_model(data: bytes, encoding: ModelEncoding) -> bytes:
+    match encoding:
+        case "identity":
+            return data
+        case "gzip":
+            # mtime=0 keeps the output, and thus the object ETag, deterministic
+            return gzip.compress(data, compresslevel=6, mtime=0)
+        case "zstd":
+            return _zstd().ZstdCompressor(level=3).compress(data)
+    raise ModelCodecError(f"Unsupported model encoding: {encoding}")
+
+
+def decode_model(data: bytes) -> bytes:
+    match detect_encoding(data):
+        case "gzip":
+            return gzip.decompress(data)
+        case "zstd":
+            return _zstd().ZstdDecompressor().decompress(data)
+    return data
+
+
+def decode_model_file(path: str) -> None:
+    """Rewrites an encoded model file as plain JSON, for tools that read it directly."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if detect_encoding(data) == "identity":
+        return
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(decode_model(data))
+    os.replace(temp_path, path)
+
+
+def encode_model_file(path: str, encoding: ModelEncoding) -> None:
+    """Rewrites a plain JSON model file as compact JSON in the given storage encoding."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if detect_encoding(data) != "identity":
+        return
+
+    compact = json.dumps(json.loads(data), separators=(",", ":"), ensure_ascii=False)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(encode_model(compact.encode("utf-8"), encoding))
+    os.replace(temp_path, path)
+
+
+def accepts_encoding(accept_encoding: str | None, encoding: ModelEncoding) -> bool:
+    """Whether an `Accept-Encoding` header allows a response in `encoding`."""
+    if encoding == "identity":
+        return True
+    if not accept_encoding:
+        return False
+
+    wildcard = False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding == encoding:
+            return quality > 0
+        if coding == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+def _zstd():
+    if zstandard is None:
+        raise ModelCodecError("zstd model encoding requires the `zstandard` package")
+    return zstandard
@@ -3,12 +3,14 @@ from functools import lru_cache
 from app.core.settings.api_settings import ApiSettings
 from app.core.settings.minio_settings import MinioSettings
 from app.core.settings.postgres_settings import PostgresSettings
+from app.core.settings.worker_settings import WorkerSettings
 
 
 class Settings(
     ApiSettings,
     MinioSettings,
     PostgresSettings,
+    WorkerSettings,
 ): ...
 
 
@@ -1,5 +1,7 @@
 import os
+import tempfile
 from functools import lru_cache
+from typing import Literal
 
 from app.core.settings.base_settings import BaseAppSettings
 
@@ -58,9 +60,31 @@ class ApiSettings(BaseAppSettings):
     OIDC_TOKEN_URL: str = f"{OIDC_ISSUER_URL}/token"
     OIDC_USERINFO_URL: str = f"{OIDC_ISSUER_URL}/userinfo"
 
+    # AUTH CACHE
+    USER_CACHE_TTL_SECONDS: float = 60
+    USER_CACHE_MAX_ENTRIES: int = 10_000
+    API_KEY_CACHE_TTL_SECONDS: float = 30
+    API_KEY_CACHE_MAX_ENTRIES: int = 10_000
+    API_KEY_USAGE_FLUSH_SECONDS: float = 10
+
     # STORAGE
     STORAGE_QUOTA: int = 20 * 1024 * 1024 * 1024
     STORAGE_MAX_UPLOAD_SIZE: int = 2 * 1024 * 1024 * 1024
+    UPLOAD_SESSION_EXPIRY_SECONDS: int = 24 * 60 * 60
+
+    # MODEL STORAGE
+    MODEL_STORAGE_ENCODING: Literal["identity", "gzip", "zstd"] = "gzip"
+    MODEL_SNAPSHOT_INTERVAL: int = 50
+
+    # MODEL CACHE
+    MODEL_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # EXPORT CACHE
+    EXPORT_CACHE_DIR: str = os.path.join(tempfile.gettempdir(), "volseg-exports")
+    EXPORT_CACHE_MAX_BYTES: int = 5 * 1024 * 1024 * 1024
+    EXPORT_CACHE_SHARED: bool = True
+    EXPORT_STREAMING: bool = True
+    EXPORT_STREAM_CHUNK_SIZE: int = 256 * 1024
 
 
 @lru_cache()
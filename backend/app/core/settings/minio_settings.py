@@ -9,7 +9,21 @@ class MinioSettings(BaseAppSettings):
     MINIO_ROOT_USER: str = os.environ.get("MINIO_ROOT_USER", "")
     MINIO_ROOT_PASSWORD: str = os.environ.get("MINIO_ROOT_PASSWORD", "")
     MINIO_SECURE: bool = False
+    MINIO_REGION: str | None = None
     MINIO_BUCKET: str = "volseg-editor"
+    MINIO_POOL_MAXSIZE: int = 32
+    MINIO_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    MINIO_READ_TIMEOUT_SECONDS: float = 5 * 60.0
+    MINIO_MAX_RETRIES: int = 5
+    MINIO_TCP_KEEPALIVE: bool = True
+    MINIO_PUBLIC_ENDPOINT: str = os.environ.get("MINIO_PUBLIC_ENDPOINT", MINIO_ENDPOINT)
+    MINIO_PUBLIC_SECURE: bool = False
+    MINIO_PRESIGNED_URL_EXPIRY_SECONDS: int = 15 * 60
+    MINIO_EXECUTOR_WORKERS: int = 16
+    MINIO_TRANSFER_CONCURRENCY: int = 8
+    MINIO_TRANSFER_CHUNK_SIZE: int = 1024 * 1024
+    MINIO_MULTIPART_THRESHOLD: int = 64 * 1024 * 1024
+    MINIO_MULTIPART_PART_SIZE: int = 16 * 1024 * 1024
 
 
 @lru_cache()
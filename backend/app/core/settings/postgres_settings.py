@@ -13,6 +13,21 @@ class PostgresSettings(BaseAppSettings):
     POSTGRES_DB: str = os.environ.get("POSTGRES_DB", "")
     POSTGRES_URL: str = f"{POSTGRES_DIALECT}+{POSTGRES_DBAPI}://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}/{POSTGRES_DB}"
 
+    # ENGINE PROFILE
+    POSTGRES_ECHO: bool = False
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT_SECONDS: float = 30.0
+    POSTGRES_POOL_RECYCLE_SECONDS: int = 30 * 60
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_POOL_WARMUP: int = 2
+    POSTGRES_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    # behind PgBouncer in transaction pooling mode: no statement caches, and
+    # prepared statements get unique names since server connections are shared
+    POSTGRES_PGBOUNCER: bool = False
+    POSTGRES_STATEMENT_TIMEOUT_MS: int | None = None
+
 
 @lru_cache()
 def get_postgres_settings():
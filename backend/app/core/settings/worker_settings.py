@@ -0,0 +1,22 @@
+from functools import lru_cache
+
+from app.core.settings.base_settings import BaseAppSettings
+
+
+class WorkerSettings(BaseAppSettings):
+    # CONVERSION WORKER
+    WORKER_CONCURRENCY: int = 1
+    WORKER_POLL_INTERVAL_SECONDS: float = 2.0
+    WORKER_HEARTBEAT_INTERVAL_SECONDS: float = 30.0
+    WORKER_STALE_JOB_TIMEOUT_SECONDS: int = 5 * 60
+    WORKER_MAX_ATTEMPTS: int = 3
+    WORKER_STORAGE_RECONCILE_INTERVAL_SECONDS: float = 60 * 60
+
+    # ENTRY REAPER
+    WORKER_REAPER_INTERVAL_SECONDS: float = 30.0
+    WORKER_REAPER_BATCH_SIZE: int = 50
+
+
+@lru_cache()
+def get_worker_settings():
+    return WorkerSettings()
@@ -0,0 +1,59 @@
+"""Bounded in-process cache whose entries expire a fixed time after they are stored."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class TTLCache[K: Hashable, V]:
+    """LRU cache of at most `max_entries` values, each valid for `ttl` seconds.
+
+    Expiry bounds how long a change made elsewhere (another replica, a direct
+    database edit) can go unnoticed; changes made by this process should call
+    `invalidate` instead of waiting for it. A `ttl` of 0 disables the cache.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock() + self.ttl, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,41 @@
+"""cover entry deleted_at
+
+Revision ID: a4c8e1f7b250
+Revises: f1b6d2a8c493
+Create Date: 2026-10-17 21:04:51.227913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c8e1f7b250"
+down_revision: Union[str, Sequence[str], None] = "f1b6d2a8c493"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("ix_entries_owner_id_created_at_id", table_name="entries")
+    op.create_index(
+        "ix_entries_owner_id_created_at_id",
+        "entries",
+        ["owner_id", "created_at", "id"],
+        unique=False,
+        postgresql_include=["size_bytes", "deleted_at"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entries_owner_id_created_at_id", table_name="entries")
+    op.create_index(
+        "ix_entries_owner_id_created_at_id",
+        "entries",
+        ["owner_id", "created_at", "id"],
+        unique=False,
+        postgresql_include=["size_bytes"],
+    )
@@ -0,0 +1,43 @@
+"""user storage used
+
+Revision ID: c2d9e4a17b35
+Revises: 8b41f0d6e2a7
+Create Date: 2026-10-17 16:48:51.203176
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c2d9e4a17b35"
+down_revision: Union[str, Sequence[str], None] = "8b41f0d6e2a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("storage_used", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE users
+        SET storage_used = usage.total
+        FROM (
+            SELECT owner_id, SUM(size_bytes) AS total
+            FROM entries
+            GROUP BY owner_id
+        ) AS usage
+        WHERE usage.owner_id = users.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "storage_used")
@@ -0,0 +1,52 @@
+"""entry query indexes
+
+Revision ID: e7a3c5f90d14
+Revises: c2d9e4a17b35
+Create Date: 2026-10-17 17:35:12.664018
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a3c5f90d14"
+down_revision: Union[str, Sequence[str], None] = "c2d9e4a17b35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_entries_owner_id_created_at_id",
+        "entries",
+        ["owner_id", "created_at", "id"],
+        unique=False,
+        postgresql_include=["size_bytes"],
+    )
+    op.create_index(
+        "ix_entries_owner_id_name_id", "entries", ["owner_id", "name", "id"], unique=False
+    )
+    op.create_index(
+        "ix_entries_owner_id_size_bytes_id",
+        "entries",
+        ["owner_id", "size_bytes", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_entries_owner_id_status_id", "entries", ["owner_id", "status", "id"], unique=False
+    )
+    op.create_index(op.f("ix_entries_status"), "entries", ["status"], unique=False)
+    op.create_index(op.f("ix_share_links_entry_id"), "share_links", ["entry_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_share_links_entry_id"), table_name="share_links")
+    op.drop_index(op.f("ix_entries_status"), table_name="entries")
+    op.drop_index("ix_entries_owner_id_status_id", table_name="entries")
+    op.drop_index("ix_entries_owner_id_size_bytes_id", table_name="entries")
+    op.drop_index("ix_entries_owner_id_name_id", table_name="entries")
+    op.drop_index("ix_entries_owner_id_created_at_id", table_name="entries")
@@ -0,0 +1,38 @@
+"""entry deleted_at index
+
+Revision ID: f1b6d2a8c493
+Revises: e7a3c5f90d14
+Create Date: 2026-10-17 19:12:40.318275
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b6d2a8c493"
+down_revision: Union[str, Sequence[str], None] = "e7a3c5f90d14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_entries_deleted_at",
+        "entries",
+        ["deleted_at"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_entries_deleted_at",
+        table_name="entries",
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
@@ -1,7 +1,10 @@
 from .api_key_model import ApiKey
 from .base_model import Base
+from .conversion_job_model import ConversionJob
 from .entry_model import Entry
 from .mixins.timestamp_mixin import TimestampMixin
 from .mixins.uuid_mixin import UuidMixin
+from .model_revision_model import ModelRevision
 from .share_link_model import ShareLink
+from .upload_session_model import UploadSession
 from .user_model import User
@@ -0,0 +1,42 @@
+from datetime import datetime
+from enum import Enum as PyEnum
+from uuid import UUID
+
+from sqlalchemy import TIMESTAMP, Enum, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.database.models.base_model import Base
+from app.database.models.mixins import TimestampMixin, UuidMixin
+from app.database.models.mixins.timestamp_mixin import utcnow
+
+
+class ConversionJobStatus(str, PyEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ConversionJob(Base, UuidMixin, TimestampMixin):
+    __tablename__ = "conversion_jobs"
+    __table_args__ = (Index("ix_conversion_jobs_status_available_at", "status", "available_at"),)
+
+    cvsx_storage_key: Mapped[str] = mapped_column(String)
+    internal_storage_key_prefix: Mapped[str] = mapped_column(String)
+    lattice_to_mesh: Mapped[bool] = mapped_column(default=True)
+
+    status: Mapped[ConversionJobStatus] = mapped_column(
+        Enum(ConversionJobStatus),
+        default=ConversionJobStatus.QUEUED,
+    )
+    attempts: Mapped[int] = mapped_column(default=0)
+    available_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), default=utcnow)
+    locked_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    locked_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    error_message: Mapped[str | None] = mapped_column()
+
+    entry_id: Mapped[UUID] = mapped_column(
+        ForeignKey("entries.id", ondelete="CASCADE"),
+        index=True,
+    )
+    entry: Mapped["Entry"] = relationship("Entry")  # type: ignore
@@ -1,7 +1,7 @@
 from enum import Enum as PyEnum
 from uuid import UUID
 
-from sqlalchemy import BigInteger, Enum, ForeignKey, String
+from sqlalchemy import BigInteger, Enum, ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.models.base_model import Base
@@ -17,6 +17,26 @@ class EntryStatus(str, PyEnum):
 
 class Entry(Base, UuidMixin, TimestampMixin):
     __tablename__ = "entries"
+    __table_args__ = (
+        # one per listing sort order, ending in id for keyset pagination; the
+        # default order also covers counting and summing a user's live entries
+        Index(
+            "ix_entries_owner_id_created_at_id",
+            "owner_id",
+            "created_at",
+            "id",
+            postgresql_include=["size_bytes", "deleted_at"],
+        ),
+        Index("ix_entries_owner_id_name_id", "owner_id", "name", "id"),
+        Index("ix_entries_owner_id_size_bytes_id", "owner_id", "size_bytes", "id"),
+        Index("ix_entries_owner_id_status_id", "owner_id", "status", "id"),
+        # deleted entries waiting for the worker to remove their files
+        Index(
+            "ix_entries_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     name: Mapped[str] = mapped_column(String(255))
     title: Mapped[str | None] = mapped_column(String(255), default=None)
@@ -24,8 +44,13 @@ class Entry(Base, UuidMixin, TimestampMixin):
 
     storage_key: Mapped[str] = mapped_column(unique=True)
     size_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+    model_revision: Mapped[int] = mapped_column(default=0)
 
-    status: Mapped[EntryStatus] = mapped_column(Enum(EntryStatus), default=EntryStatus.PENDING)
+    status: Mapped[EntryStatus] = mapped_column(
+        Enum(EntryStatus),
+        default=EntryStatus.PENDING,
+        index=True,
+    )
     error_message: Mapped[str | None] = mapped_column()
 
     owner_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
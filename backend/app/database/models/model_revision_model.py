@@ -0,0 +1,31 @@
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.models.base_model import Base
+from app.database.models.mixins import TimestampMixin, UuidMixin
+
+
+class ModelRevision(Base, UuidMixin, TimestampMixin):
+    """One revision of an entry's internal model.
+
+    `patch` is the JSON Patch from the previous revision. Snapshot revisions also
+    have the full document stored in object storage, so any revision can be
+    rebuilt from the nearest snapshot without replaying the whole history.
+    """
+
+    __tablename__ = "model_revisions"
+    __table_args__ = (UniqueConstraint("entry_id", "revision"),)
+
+    revision: Mapped[int] = mapped_column()
+    patch: Mapped[list[dict[str, Any]] | None] = mapped_column(JSONB, nullable=True)
+    is_snapshot: Mapped[bool] = mapped_column(default=False)
+
+    entry_id: Mapped[UUID] = mapped_column(ForeignKey("entries.id", ondelete="CASCADE"))
+    author_id: Mapped[UUID | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
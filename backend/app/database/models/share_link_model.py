@@ -12,5 +12,8 @@ class ShareLink(Base, UuidMixin, TimestampMixin):
 
     is_active: Mapped[bool] = mapped_column(default=True)
 
-    entry_id: Mapped[UUID] = mapped_column(ForeignKey("entries.id", ondelete="CASCADE"))
+    entry_id: Mapped[UUID] = mapped_column(
+        ForeignKey("entries.id", ondelete="CASCADE"),
+        index=True,
+    )
     entry: Mapped["Entry"] = relationship(back_populates="link")  # type: ignore
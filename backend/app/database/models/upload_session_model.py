@@ -0,0 +1,47 @@
+from datetime import datetime
+from enum import Enum as PyEnum
+from uuid import UUID
+
+from sqlalchemy import TIMESTAMP, BigInteger, Enum, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.models.base_model import Base
+from app.database.models.mixins import TimestampMixin, UuidMixin
+
+
+class UploadSessionStatus(str, PyEnum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+    ABORTED = "aborted"
+
+
+class UploadSession(Base, UuidMixin, TimestampMixin):
+    __tablename__ = "upload_sessions"
+
+    filename: Mapped[str] = mapped_column(String(255))
+    size_bytes: Mapped[int] = mapped_column(BigInteger)
+    part_size: Mapped[int] = mapped_column(BigInteger)
+    lattice_to_mesh: Mapped[bool] = mapped_column(default=True)
+
+    storage_key: Mapped[str] = mapped_column(unique=True)
+    upload_id: Mapped[str] = mapped_column(String)
+
+    status: Mapped[UploadSessionStatus] = mapped_column(
+        Enum(UploadSessionStatus),
+        default=UploadSessionStatus.PENDING,
+    )
+    expires_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), index=True)
+
+    owner_id: Mapped[UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        index=True,
+    )
+
+    @property
+    def part_count(self) -> int:
+        return max(1, -(-self.size_bytes // self.part_size))
+
+    def expected_part_size(self, part_number: int) -> int:
+        if part_number < self.part_count:
+            return self.part_size
+        return self.size_bytes - (self.part_count - 1) * self.part_size
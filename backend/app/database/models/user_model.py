@@ -17,3 +17,5 @@ class User(Base, UuidMixin, TimestampMixin):
         BigInteger,
         default=get_api_settings().STORAGE_QUOTA,
     )
+    storage_used: Mapped[int] = mapped_column(BigInteger, default=0)
+    """Sum of `size_bytes` of the user's entries, kept up to date on every change."""
@@ -5,13 +5,13 @@ from uuid import UUID, uuid4
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.settings.minio_settings import get_minio_settings
 from app.database.models.entry_model import Entry, EntryStatus
 from app.database.models.share_link_model import ShareLink
 from app.database.models.user_model import User
 from app.database.session_manager import get_session_manager
+from app.repositories.user_repository import UserRepository
 from app.services.processing_service import ProcessingService
-from app.services.storage_service import get_minio_client
+from app.services.storage_service import get_minio_storage
 
 SEED_FILES_DIR = "/app/app/database/seed/files"
 
@@ -82,8 +82,7 @@ async def seed_entry(session: AsyncSession, example: dict, user_id: UUID):
 
     print(f"Seeding {example['name']}...")
 
-    minio = get_minio_client()
-    settings = get_minio_settings()
+    storage = get_minio_storage()
 
     storage_key_prefix = f"datasets/{entry_id}"
     raw_storage_key = f"temp/{entry_id}.cvsx"
@@ -92,8 +91,7 @@ async def seed_entry(session: AsyncSession, example: dict, user_id: UUID):
 
     try:
         with open(filepath, "rb") as f:
-            minio.put_object(
-                bucket_name=settings.MINIO_BUCKET,
+            await storage.put_object(
                 object_name=raw_storage_key,
                 data=f,
                 length=file_size,
@@ -161,6 +159,9 @@ async def seed_data():
         for example in EXAMPLES:
             await seed_entry(session, example, user.id)
 
+        await UserRepository(session).reconcile_storage_used()
+        await session.commit()
+
         print("Database seeding complete!")
 
 
@@ -1,8 +1,11 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 from functools import lru_cache
 from typing import Any, AsyncIterator
+from uuid import uuid4
 
-from sqlalchemy import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy import URL, AsyncAdaptedQueuePool, NullPool, make_url, text
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncEngine,
@@ -13,16 +16,27 @@ from sqlalchemy.ext.asyncio import (
 
 from app.core.settings import get_settings
 from app.core.settings.base_settings import ModeEnum
-from app.core.settings.postgres_settings import get_postgres_settings
+from app.core.settings.postgres_settings import PostgresSettings, get_postgres_settings
+
+logger = logging.getLogger(__name__)
 
 
 class DatabaseSessionManager:
-    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] = {},
+        pool_kwargs: dict[str, Any] = {},
+    ):
+        # tests run without a pool, which takes none of the pool options
+        if get_settings().MODE == ModeEnum.testing:
+            pool_options: dict[str, Any] = {"poolclass": NullPool}
+        else:
+            pool_options = {"poolclass": AsyncAdaptedQueuePool, **pool_kwargs}
+
         self.engine: AsyncEngine | None = create_async_engine(
             host,
-            poolclass=NullPool
-            if get_settings().MODE == ModeEnum.testing
-            else AsyncAdaptedQueuePool,
+            **pool_options,
             **engine_kwargs,
         )
         self._session_factory = async_sessionmaker(
@@ -38,6 +52,24 @@ class DatabaseSessionManager:
         await self.engine.dispose()
         self.engine = None
 
+    async def warm_up(self, connections: int) -> None:
+        """Opens `connections` pooled connections up front, so first requests skip the handshake.
+
+        Only an optimisation: if the database cannot be reached, the error is
+        logged and connections are opened on demand once it is back.
+        """
+        if self.engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        async def ping() -> None:
+            async with self.engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+
+        try:
+            await asyncio.gather(*(ping() for _ in range(connections)))
+        except Exception:
+            logger.warning("Could not warm up the database pool", exc_info=True)
+
     @asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
         if self.engine is None:
@@ -62,13 +94,58 @@ class DatabaseSessionManager:
             await session.close()
 
 
+def statement_cache_size(settings: PostgresSettings) -> int:
+    return 0 if settings.POSTGRES_PGBOUNCER else settings.POSTGRES_STATEMENT_CACHE_SIZE
+
+
+def unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_url(settings: PostgresSettings) -> URL:
+    # SQLAlchemy keeps its own cache of prepared statements on top of asyncpg's
+    return make_url(settings.POSTGRES_URL).update_query_dict(
+        {"prepared_statement_cache_size": str(statement_cache_size(settings))}
+    )
+
+
+def engine_profile(settings: PostgresSettings) -> dict[str, Any]:
+    connect_args: dict[str, Any] = {
+        "timeout": settings.POSTGRES_CONNECT_TIMEOUT_SECONDS,
+        "statement_cache_size": statement_cache_size(settings),
+    }
+    if settings.POSTGRES_PGBOUNCER:
+        # asyncpg still prepares every statement; names that may already exist on
+        # a server connection another client used would collide
+        connect_args["prepared_statement_name_func"] = unique_statement_name
+    if settings.POSTGRES_STATEMENT_TIMEOUT_MS is not None:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.POSTGRES_STATEMENT_TIMEOUT_MS),
+        }
+
+    return {
+        "echo": settings.POSTGRES_ECHO,
+        "connect_args": connect_args,
+    }
+
+
+def pool_profile(settings: PostgresSettings) -> dict[str, Any]:
+    return {
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+    }
+
+
 @lru_cache
 def get_session_manager():
+    settings = get_postgres_settings()
     return DatabaseSessionManager(
-        host=get_postgres_settings().POSTGRES_URL,
-        engine_kwargs={
-            "echo": True,
-        },
+        host=engine_url(settings).render_as_string(hide_password=False),
+        engine_kwargs=engine_profile(settings),
+        pool_kwargs=pool_profile(settings),
     )
 
 
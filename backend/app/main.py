@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -11,10 +12,11 @@ from app.api.v1.middleware.auth_middleware import AuthMiddleware
 from app.api.v1.tags import v1_api_tags_metadata
 from app.core.settings import get_settings
 from app.core.settings.api_settings import get_api_settings
-from app.core.settings.minio_settings import get_minio_settings
+from app.core.settings.postgres_settings import get_postgres_settings
 from app.database.session_manager import get_session_manager
+from app.services.api_key_service import get_api_key_usage
 from app.services.auth_service import AuthService
-from app.services.storage_service import get_minio_client
+from app.services.storage_service import get_minio_storage
 
 
 # unique function naming for client library
@@ -26,13 +28,18 @@ def generate_unique_function_id(route: APIRoute):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup
-    minio_client = get_minio_client()
-    if not minio_client.bucket_exists(get_minio_settings().MINIO_BUCKET):
-        minio_client.make_bucket(get_minio_settings().MINIO_BUCKET)
+    await get_minio_storage().ensure_bucket()
+    await get_session_manager().warm_up(get_postgres_settings().POSTGRES_POOL_WARMUP)
+    api_key_usage = get_api_key_usage()
+    api_key_usage_task = asyncio.create_task(api_key_usage.run())
     yield
     # shutdown
+    api_key_usage.stop()
+    await api_key_usage_task
     if get_session_manager().engine is not None:
         await get_session_manager().close()
+    await get_minio_storage().close()
+    get_minio_storage.cache_clear()
 
 
 app = FastAPI(
@@ -1,13 +1,19 @@
 from .api_key_repository import ApiKeyRepository
 from .base_repository import BaseRepository
+from .conversion_job_repository import ConversionJobRepository
 from .entry_repository import EntryRepository
+from .model_revision_repository import ModelRevisionRepository
 from .share_link_repository import ShareLinkRepository
+from .upload_session_repository import UploadSessionRepository
 from .user_repository import UserRepository
 
 __all__ = [
     "BaseRepository",
     "ApiKeyRepository",
+    "ConversionJobRepository",
     "EntryRepository",
+    "ModelRevisionRepository",
     "ShareLinkRepository",
+    "UploadSessionRepository",
     "UserRepository",
 ]
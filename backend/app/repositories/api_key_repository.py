@@ -1,7 +1,9 @@
+from datetime import datetime
 from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import contains_eager
 
 from app.database.models.api_key_model import ApiKey
 from app.database.models.user_model import User
@@ -13,7 +15,12 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
         super().__init__(session, ApiKey)
 
     async def get_by_hash_join_owner(self, hashed_key: str) -> ApiKey | None:
-        query = select(ApiKey).join(User).where(ApiKey.key_hash == hashed_key)
+        query = (
+            select(ApiKey)
+            .join(User)
+            .where(ApiKey.key_hash == hashed_key)
+            .options(contains_eager(ApiKey.owner))
+        )
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
@@ -26,3 +33,19 @@ class ApiKeyRepository(BaseRepository[ApiKey]):
         query = select(ApiKey).where(ApiKey.id == key_id, ApiKey.owner_id == owner_id)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
+
+    async def update_last_used(self, last_used: dict[UUID, datetime]) -> None:
+        """Sets `last_used_at` of many keys in one executemany UPDATE, never moving it back."""
+        table = ApiKey.__table__
+        await self.session.execute(
+            update(table)
+            .where(
+                table.c.id == bindparam("key_id"),
+                or_(
+                    table.c.last_used_at.is_(None),
+                    table.c.last_used_at < bindparam("used_at"),
+                ),
+            )
+            .values(last_used_at=bindparam("used_at")),
+            [{"key_id": key_id, "used_at": used_at} for key_id, used_at in last_used.items()],
+        )
@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import exists, select, update
+
+from app.database.models.conversion_job_model import ConversionJob, ConversionJobStatus
+from app.database.models.entry_model import Entry
+from app.database.models.mixins.timestamp_mixin import utcnow
+from app.repositories.base_repository import BaseRepository
+
+
+class ConversionJobRepository(BaseRepository[ConversionJob]):
+    def __init__(self, session):
+        super().__init__(session, ConversionJob)
+
+    async def claim_next(self, worker_id: str) -> ConversionJob | None:
+        now = utcnow()
+        entry_deleted = exists().where(
+            Entry.id == ConversionJob.entry_id,
+            Entry.deleted_at.is_not(None),
+        )
+        result = await self.session.execute(
+            select(ConversionJob)
+            .where(
+                ConversionJob.status == ConversionJobStatus.QUEUED,
+                ConversionJob.available_at <= now,
+                ~entry_deleted,
+            )
+            .order_by(ConversionJob.available_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = result.scalar_one_or_none()
+        if not job:
+            return None
+
+        job.status = ConversionJobStatus.RUNNING
+        job.attempts += 1
+        job.locked_at = now
+        job.locked_by = worker_id
+        return job
+
+    async def heartbeat(self, job_id: UUID, worker_id: str) -> None:
+        await self.session.execute(
+            update(ConversionJob)
+            .where(ConversionJob.id == job_id, ConversionJob.locked_by == worker_id)
+            .values(locked_at=utcnow())
+        )
+
+    async def list_stale(self, locked_before: datetime) -> Sequence[ConversionJob]:
+        result = await self.session.execute(
+            select(ConversionJob)
+            .where(
+                ConversionJob.status == ConversionJobStatus.RUNNING,
+                ConversionJob.locked_at < locked_before,
+            )
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalars().all()
@@ -1,25 +1,83 @@
-from typing import Sequence
+from datetime import datetime
+from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, exists, func, select, tuple_, update
 from sqlalchemy.orm import selectinload
 
+from app.database.models.conversion_job_model import ConversionJob, ConversionJobStatus
 from app.database.models.entry_model import Entry
 from app.repositories.base_repository import BaseRepository
 
 
 class EntryRepository(BaseRepository[Entry]):
+    """Entries marked deleted are left out of every lookup except `list_deleted`."""
+
     def __init__(self, session):
         super().__init__(session, Entry)
 
     async def get_with_links(self, entry_id: UUID) -> Entry | None:
         result = await self.session.execute(
-            select(Entry).where(Entry.id == entry_id).options(selectinload(Entry.link))  # type: ignore
+            select(Entry)
+            .where(Entry.id == entry_id, Entry.deleted_at.is_(None))
+            .options(selectinload(Entry.link))  # type: ignore
         )
         return result.scalar_one_or_none()
 
+    async def list_by_ids(self, entry_ids: Sequence[UUID]) -> Sequence[Entry]:
+        result = await self.session.execute(
+            select(Entry)
+            .where(Entry.id.in_(entry_ids), Entry.deleted_at.is_(None))
+            .options(selectinload(Entry.link))  # type: ignore
+        )
+        return result.scalars().all()
+
+    async def mark_deleted(self, entry_ids: Sequence[UUID], deleted_at: datetime) -> int:
+        """Marks the live entries among `entry_ids` deleted and returns their total size.
+
+        Entries already marked, by an earlier or a concurrent delete, are skipped,
+        so their size is only ever freed once.
+        """
+        result = await self.session.execute(
+            update(Entry)
+            .where(Entry.id.in_(entry_ids), Entry.deleted_at.is_(None))
+            .values(deleted_at=deleted_at)
+            .returning(Entry.size_bytes)
+        )
+        return sum(result.scalars().all())
+
+    async def list_deleted(self, limit: int) -> Sequence[Entry]:
+        """Locks up to `limit` deleted entries that no conversion is writing to, oldest first."""
+        converting = exists().where(
+            ConversionJob.entry_id == Entry.id,
+            ConversionJob.status == ConversionJobStatus.RUNNING,
+        )
+        result = await self.session.execute(
+            select(Entry)
+            .where(Entry.deleted_at.is_not(None), ~converting)
+            .order_by(Entry.deleted_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalars().all()
+
+    async def delete_by_ids(self, entry_ids: Sequence[UUID]) -> None:
+        """Deletes the entries in one statement; their rows in other tables cascade."""
+        await self.session.execute(delete(Entry).where(Entry.id.in_(entry_ids)))
+
+    async def lock(self, entry: Entry) -> None:
+        """Locks the entry row until commit and reloads it, to serialize model writes."""
+        await self.session.execute(
+            select(Entry)
+            .where(Entry.id == entry.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+
     async def count_by_owner(self, owner_id: UUID) -> int:
-        result = await self.session.execute(select(func.count()).where(Entry.owner_id == owner_id))
+        result = await self.session.execute(
+            select(func.count()).where(Entry.owner_id == owner_id, Entry.deleted_at.is_(None))
+        )
         return result.scalar_one()
 
     async def list_by_owner(
@@ -29,23 +87,29 @@ class EntryRepository(BaseRepository[Entry]):
         limit: int,
         sort_attr: str = "created_at",
         descending: bool = True,
+        after: tuple[Any, UUID] | None = None,
     ) -> Sequence[Entry]:
+        """Entries ordered by `sort_attr`, then id, starting after the `after` sort key.
+
+        With `after` the listing seeks straight to the next row through the
+        `(owner_id, sort_attr, id)` order instead of skipping `offset` rows.
+        """
         order_col = getattr(Entry, sort_attr)
-        order_clause = order_col.desc() if descending else order_col.asc()
+        if descending:
+            order_clauses = (order_col.desc(), Entry.id.desc())
+        else:
+            order_clauses = (order_col.asc(), Entry.id.asc())
+
+        query = select(Entry).where(Entry.owner_id == owner_id, Entry.deleted_at.is_(None))
+        if after is not None:
+            sort_key = tuple_(order_col, Entry.id)
+            after_key = tuple_(*after)
+            query = query.where(sort_key < after_key if descending else sort_key > after_key)
 
         result = await self.session.execute(
-            select(Entry)
-            .where(Entry.owner_id == owner_id)
-            .options(selectinload(Entry.link))  # type: ignore
-            .order_by(order_clause)
+            query.options(selectinload(Entry.link))  # type: ignore
+            .order_by(*order_clauses)
             .offset(offset)
             .limit(limit)
         )
         return result.scalars().all()
-
-    async def get_storage_usage(self, owner_id: UUID) -> int:
-        result = await self.session.execute(
-            select(func.sum(Entry.size_bytes)).where(Entry.owner_id == owner_id)
-        )
-        usage = result.scalar_one()
-        return usage if usage is not None else 0
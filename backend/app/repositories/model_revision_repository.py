@@ -0,0 +1,42 @@
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.database.models.model_revision_model import ModelRevision
+from app.repositories.base_repository import BaseRepository
+
+
+class ModelRevisionRepository(BaseRepository[ModelRevision]):
+    def __init__(self, session):
+        super().__init__(session, ModelRevision)
+
+    async def list_since(
+        self,
+        entry_id: UUID,
+        since: int,
+        until: int | None = None,
+    ) -> Sequence[ModelRevision]:
+        """Revisions after `since`, up to and including `until`, oldest first."""
+        query = select(ModelRevision).where(
+            ModelRevision.entry_id == entry_id,
+            ModelRevision.revision > since,
+        )
+        if until is not None:
+            query = query.where(ModelRevision.revision <= until)
+        result = await self.session.execute(query.order_by(ModelRevision.revision))
+        return result.scalars().all()
+
+    async def get_snapshot_before(self, entry_id: UUID, revision: int) -> ModelRevision | None:
+        """The latest snapshot revision not newer than `revision`."""
+        result = await self.session.execute(
+            select(ModelRevision)
+            .where(
+                ModelRevision.entry_id == entry_id,
+                ModelRevision.is_snapshot.is_(True),
+                ModelRevision.revision <= revision,
+            )
+            .order_by(ModelRevision.revision.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
@@ -1,8 +1,10 @@
+from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 
+from app.database.models.entry_model import Entry
 from app.database.models.share_link_model import ShareLink
 from app.repositories.base_repository import BaseRepository
 
@@ -15,10 +17,25 @@ class ShareLinkRepository(BaseRepository[ShareLink]):
         result = await self.session.execute(select(ShareLink).where(ShareLink.entry_id == entry_id))
         return result.scalar_one_or_none()
 
+    async def set_active_for_entries(
+        self,
+        entry_ids: Sequence[UUID],
+        is_active: bool,
+    ) -> Sequence[ShareLink]:
+        result = await self.session.execute(
+            update(ShareLink)
+            .where(ShareLink.entry_id.in_(entry_ids))
+            .values(is_active=is_active)
+            .returning(ShareLink)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalars().all()
+
     async def get_with_entry(self, share_link_id: UUID) -> ShareLink | None:
         result = await self.session.execute(
             select(ShareLink)
-            .where(ShareLink.id == share_link_id)
+            .join(ShareLink.entry)
+            .where(ShareLink.id == share_link_id, Entry.deleted_at.is_(None))
             .options(selectinload(ShareLink.entry))
         )
         return result.scalar_one_or_none()
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from app.database.models.upload_session_model import UploadSession, UploadSessionStatus
+from app.repositories.base_repository import BaseRepository
+
+
+class UploadSessionRepository(BaseRepository[UploadSession]):
+    def __init__(self, session):
+        super().__init__(session, UploadSession)
+
+    async def get_pending(
+        self,
+        upload_session_id: UUID,
+        for_update: bool = False,
+    ) -> UploadSession | None:
+        query = select(UploadSession).where(
+            UploadSession.id == upload_session_id,
+            UploadSession.status == UploadSessionStatus.PENDING,
+        )
+        if for_update:
+            query = query.with_for_update()
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_reserved_size(self, owner_id: UUID, now: datetime) -> int:
+        """Bytes announced by the owner's uploads that have not completed or expired yet."""
+        result = await self.session.execute(
+            select(func.sum(UploadSession.size_bytes)).where(
+                UploadSession.owner_id == owner_id,
+                UploadSession.status == UploadSessionStatus.PENDING,
+                UploadSession.expires_at > now,
+            )
+        )
+        reserved = result.scalar_one()
+        return reserved if reserved is not None else 0
+
+    async def list_expired(self, now: datetime, limit: int = 100) -> Sequence[UploadSession]:
+        result = await self.session.execute(
+            select(UploadSession)
+            .where(
+                UploadSession.status == UploadSessionStatus.PENDING,
+                UploadSession.expires_at <= now,
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalars().all()
@@ -1,5 +1,8 @@
-from sqlalchemy import select
+from uuid import UUID
 
+from sqlalchemy import func, select, update
+
+from app.database.models.entry_model import Entry
 from app.database.models.user_model import User
 from app.repositories.base_repository import BaseRepository
 
@@ -11,3 +14,29 @@ class UserRepository(BaseRepository[User]):
     async def get_by_sub(self, sub: str) -> User | None:
         result = await self.session.execute(select(User).where(User.sub == sub))
         return result.scalar_one_or_none()
+
+    async def get_storage_used(self, user_id: UUID) -> int:
+        result = await self.session.execute(select(User.storage_used).where(User.id == user_id))
+        used = result.scalar_one_or_none()
+        return used if used is not None else 0
+
+    async def add_storage_used(self, user_id: UUID, delta: int) -> None:
+        """Adjusts the usage counter in the current transaction, atomically in the database."""
+        await self.session.execute(
+            update(User).where(User.id == user_id).values(storage_used=User.storage_used + delta)
+        )
+
+    async def reconcile_storage_used(self) -> int:
+        """Resets every counter that drifted from its entries. Returns how many were fixed."""
+        actual = (
+            select(func.coalesce(func.sum(Entry.size_bytes), 0))
+            .where(Entry.owner_id == User.id, Entry.deleted_at.is_(None))
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(User)
+            .where(User.storage_used != actual)
+            .values(storage_used=actual)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -1,18 +1,34 @@
+import asyncio
 import hashlib
+import logging
 import secrets
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
 from uuid import UUID
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.contracts.requests import CreateApiKeyRequest
+from app.core.settings.api_settings import get_api_settings
+from app.core.ttl_cache import TTLCache
 from app.database.models.api_key_model import ApiKey
 from app.database.models.mixins.timestamp_mixin import utcnow
 from app.database.models.user_model import User
-from app.database.session_manager import get_async_session
+from app.database.session_manager import get_async_session, get_session_manager
 from app.repositories.api_key_repository import ApiKeyRepository
 from app.repositories.user_repository import UserRepository
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedApiKey:
+    key_id: UUID
+    user: User
+    expires_at: datetime | None
+
 
 class ApiKeyService:
     PREFIX = "cv_"
@@ -51,21 +67,25 @@ class ApiKeyService:
 
         hashed_key = self._hash_key(raw_key)
 
-        api_key_record = await self.api_key_repo.get_by_hash_join_owner(hashed_key)
-
-        if not api_key_record:
-            return None
-
-        if api_key_record.expires_at and api_key_record.expires_at < utcnow():
+        cache = get_api_key_cache()
+        cached = cache.get(hashed_key)
+        if cached is None:
+            api_key_record = await self.api_key_repo.get_by_hash_join_owner(hashed_key)
+            if not api_key_record:
+                return None
+            cached = CachedApiKey(
+                key_id=api_key_record.id,
+                user=api_key_record.owner,
+                expires_at=api_key_record.expires_at,
+            )
+            cache.put(hashed_key, cached)
+
+        now = utcnow()
+        if cached.expires_at and cached.expires_at < now:
             return None
 
-        api_key_record.last_used_at = utcnow()
-
-        user = api_key_record.owner
-
-        await self.api_key_repo.commit()
-
-        return user
+        get_api_key_usage().record(cached.key_id, now)
+        return cached.user
 
     async def list_keys(self, user: User) -> list[ApiKey]:
         keys = await self.api_key_repo.list_by_owner(user.id)
@@ -77,6 +97,73 @@ class ApiKeyService:
         if key:
             await self.api_key_repo.delete(key)
             await self.api_key_repo.commit()
+            get_api_key_cache().invalidate(key.key_hash)
+
+
+class ApiKeyUsageRecorder:
+    """Coalesces `last_used_at` updates of API keys and writes them in batches.
+
+    Authenticating with a key only records the time in memory; `flush` writes the
+    latest time of every key used since the previous flush in one statement.
+    `run` flushes every `interval` seconds until stopped, and once more on exit.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending: dict[UUID, datetime] = {}
+        self._stopping = asyncio.Event()
+
+    def record(self, key_id: UUID, used_at: datetime) -> None:
+        self._pending[key_id] = used_at
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        try:
+            async with get_session_manager().session() as session:
+                await ApiKeyRepository(session).update_last_used(pending)
+                await session.commit()
+        except Exception:
+            # retry with the next flush, unless the key has been used again meanwhile
+            for key_id, used_at in pending.items():
+                self._pending.setdefault(key_id, used_at)
+            raise
+        return len(pending)
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval)
+            except TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to write API key usage")
+
+
+@lru_cache
+def get_api_key_cache() -> TTLCache[str, CachedApiKey]:
+    """Valid API keys by key hash.
+
+    `revoke_key` drops a revoked key on this replica right away; other replicas
+    stop accepting it within `API_KEY_CACHE_TTL_SECONDS`.
+    """
+    settings = get_api_settings()
+    return TTLCache(
+        ttl=settings.API_KEY_CACHE_TTL_SECONDS,
+        max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    )
+
+
+@lru_cache
+def get_api_key_usage() -> ApiKeyUsageRecorder:
+    return ApiKeyUsageRecorder(interval=get_api_settings().API_KEY_USAGE_FLUSH_SECONDS)
 
 
 async def get_api_key_service(
@@ -1,23 +1,54 @@
-import io
 import json
-from typing import Protocol, Sequence, TypeVar
+import logging
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Protocol, Sequence, TypeVar
 from uuid import UUID, uuid4
 
+import httpx
 from cvsx2mvsx.models.internal.entry import InternalEntry
-from fastapi import BackgroundTasks, Depends, HTTPException, UploadFile, status
+from fastapi import Depends, HTTPException, UploadFile, status
+from fastapi.encoders import jsonable_encoder
 from minio import S3Error
+from minio.datatypes import Part
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cursor import InvalidCursor, decode_cursor, encode_cursor
+from app.core.json_patch import (
+    JsonPatchConflict,
+    JsonPatchError,
+    apply_json_patch,
+    apply_merge_patch,
+    diff_json,
+)
+from app.core.model_codec import ModelEncoding, decode_model, detect_encoding, encode_model
 from app.core.settings.api_settings import get_api_settings
-from app.core.settings.minio_settings import get_minio_settings
-from app.database.models.entry_model import Entry
+from app.database.models.conversion_job_model import ConversionJob
+from app.database.models.entry_model import Entry, EntryStatus
+from app.database.models.mixins.timestamp_mixin import utcnow
+from app.database.models.model_revision_model import ModelRevision
 from app.database.models.share_link_model import ShareLink
+from app.database.models.upload_session_model import UploadSession, UploadSessionStatus
 from app.database.models.user_model import User
 from app.database.session_manager import get_async_session
+from app.repositories.conversion_job_repository import ConversionJobRepository
 from app.repositories.entry_repository import EntryRepository
+from app.repositories.model_revision_repository import ModelRevisionRepository
 from app.repositories.share_link_repository import ShareLinkRepository
-from app.services.processing_service import ProcessingService
-from app.services.storage_service import get_minio_client
+from app.repositories.upload_session_repository import UploadSessionRepository
+from app.repositories.user_repository import UserRepository
+from app.services.export_cache_service import ExportCache, get_export_cache
+from app.services.model_cache_service import (
+    StoredDocument,
+    StoredModel,
+    etag_matches,
+    get_model_cache,
+    stored_model_size,
+)
+from app.services.storage_service import get_minio_storage, multipart_part_size
+from app.services.user_service import invalidate_cached_user
+
+logger = logging.getLogger(__name__)
 
 
 class HasSourcePath(Protocol):
@@ -32,40 +63,28 @@ class EntryService:
         self.session = session
         self.entry_repo = EntryRepository(session)
         self.share_link_repo = ShareLinkRepository(session)
-        self.minio = get_minio_client()
+        self.conversion_job_repo = ConversionJobRepository(session)
+        self.upload_session_repo = UploadSessionRepository(session)
+        self.model_revision_repo = ModelRevisionRepository(session)
+        self.user_repo = UserRepository(session)
+        self.storage = get_minio_storage()
 
     async def create_entry(
         self,
         *,
         user: User,
         dataset_file: UploadFile,
-        background_tasks: BackgroundTasks,
         lattice_to_mesh: bool = True,
     ) -> Entry:
         dataset_id = uuid4()
-        storage_key_prefix = f"datasets/{dataset_id}"
         raw_storage_key = f"temp/{dataset_id}.cvsx"
-
-        # Check storage quota
-        current_usage = await self.entry_repo.get_storage_usage(user.id)
         upload_size = dataset_file.size if dataset_file.size else 0
-        max_size = get_api_settings().STORAGE_MAX_UPLOAD_SIZE
 
-        if upload_size > max_size:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File exceeds maximum size of {max_size / (1024**3):.2f} GB",
-            )
-        if current_usage + upload_size > user.storage_quota:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail="Storage quota exceeded.",
-            )
+        await self._check_upload_size(user, upload_size)
 
         # Upload CVSX input data
         try:
-            self.minio.put_object(
-                bucket_name=get_minio_settings().MINIO_BUCKET,
+            await self.storage.put_object(
                 object_name=raw_storage_key,
                 data=dataset_file.file,
                 length=dataset_file.size if dataset_file.size else -1,
@@ -78,12 +97,292 @@ class EntryService:
                 detail=f"Storage error: {e}",
             )
 
+        return await self._register_entry(
+            entry_id=dataset_id,
+            user=user,
+            name=dataset_file.filename or "data.cvsx",
+            size_bytes=upload_size,
+            raw_storage_key=raw_storage_key,
+            lattice_to_mesh=lattice_to_mesh,
+        )
+
+    async def initiate_upload(
+        self,
+        *,
+        user: User,
+        filename: str,
+        size_bytes: int,
+        lattice_to_mesh: bool = True,
+    ) -> tuple[UploadSession, list[str]]:
+        """Starts a multipart upload the client sends straight to object storage.
+
+        Returns the session and presigned URLs for its parts, in part number order.
+        """
+        await self._check_upload_size(user, size_bytes)
+
+        settings = get_api_settings()
+        upload_session = UploadSession(
+            id=uuid4(),
+            filename=filename,
+            size_bytes=size_bytes,
+            part_size=multipart_part_size(size_bytes),
+            lattice_to_mesh=lattice_to_mesh,
+            expires_at=utcnow() + timedelta(seconds=settings.UPLOAD_SESSION_EXPIRY_SECONDS),
+            owner_id=user.id,
+        )
+        upload_session.storage_key = f"temp/{upload_session.id}.cvsx"
+
+        try:
+            upload_session.upload_id = await self.storage.create_multipart_upload(
+                object_name=upload_session.storage_key,
+                content_type="application/octet-stream",
+            )
+        except S3Error as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Storage error: {e}",
+            )
+
+        self.upload_session_repo.add(upload_session)
+        await self.upload_session_repo.commit()
+
+        expires = upload_session.expires_at - utcnow()
+        part_urls = [
+            self.storage.presigned_upload_part_url(
+                object_name=upload_session.storage_key,
+                upload_id=upload_session.upload_id,
+                part_number=part_number,
+                expires=expires,
+            )
+            for part_number in range(1, upload_session.part_count + 1)
+        ]
+
+        return upload_session, part_urls
+
+    async def complete_upload(
+        self,
+        *,
+        upload_session_id: UUID,
+        user: User,
+    ) -> Entry:
+        upload_session = await self._get_pending_upload(upload_session_id, user)
+
+        try:
+            parts = await self.storage.list_parts(
+                object_name=upload_session.storage_key,
+                upload_id=upload_session.upload_id,
+            )
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload no longer exists",
+            )
+
+        part_numbers = sorted(part.part_number for part in parts)
+        uploaded_size = sum(part.size or 0 for part in parts)
+        expected_numbers = list(range(1, upload_session.part_count + 1))
+        if part_numbers != expected_numbers or uploaded_size != upload_session.size_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Upload incomplete: received {uploaded_size} of "
+                    f"{upload_session.size_bytes} bytes in {len(parts)} part(s)"
+                ),
+            )
+
+        try:
+            await self.storage.complete_multipart_upload(
+                object_name=upload_session.storage_key,
+                upload_id=upload_session.upload_id,
+                parts=parts,
+            )
+        except S3Error as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Storage error: {e}",
+            )
+
+        upload_session.status = UploadSessionStatus.COMPLETED
+
+        return await self._register_entry(
+            entry_id=upload_session.id,
+            user=user,
+            name=upload_session.filename,
+            size_bytes=upload_session.size_bytes,
+            raw_storage_key=upload_session.storage_key,
+            lattice_to_mesh=upload_session.lattice_to_mesh,
+        )
+
+    async def abort_upload(
+        self,
+        *,
+        upload_session_id: UUID,
+        user: User,
+    ) -> None:
+        upload_session = await self._get_pending_upload(upload_session_id, user)
+
+        try:
+            await self.storage.abort_multipart_upload(
+                object_name=upload_session.storage_key,
+                upload_id=upload_session.upload_id,
+            )
+        except S3Error as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Storage error: {e}",
+            )
+
+        upload_session.status = UploadSessionStatus.ABORTED
+        await self.upload_session_repo.commit()
+
+    async def upload_part(
+        self,
+        *,
+        upload_session_id: UUID,
+        user: User,
+        part_number: int,
+        chunks: AsyncIterator[bytes],
+    ) -> Part:
+        """Streams one numbered chunk of a resumable upload into its multipart object.
+
+        Re-sending a part number replaces the part, so clients resume by asking
+        for the upload status and sending the parts still missing.
+        """
+        upload_session = await self._get_pending_upload(upload_session_id, user, for_update=False)
+
+        if part_number > upload_session.part_count:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Upload has only {upload_session.part_count} part(s)",
+            )
+
+        expected_size = upload_session.expected_part_size(part_number)
+        # nothing below touches the database, so hand the connection back to
+        # the pool instead of holding it for as long as the client takes to send
+        await self.upload_session_repo.commit()
+
+        async def checked_chunks() -> AsyncIterator[bytes]:
+            received = 0
+            async for chunk in chunks:
+                received += len(chunk)
+                if received > expected_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Part {part_number} must be {expected_size} bytes",
+                    )
+                yield chunk
+            if received != expected_size:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Part {part_number} must be {expected_size} bytes, got {received}",
+                )
+
+        try:
+            etag = await self.storage.upload_part(
+                object_name=upload_session.storage_key,
+                upload_id=upload_session.upload_id,
+                part_number=part_number,
+                chunks=checked_chunks(),
+                length=expected_size,
+            )
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload no longer exists",
+            )
+        except (S3Error, httpx.HTTPError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Storage error: {e}",
+            )
+
+        return Part(part_number=part_number, etag=etag, size=expected_size)
+
+    async def get_upload_status(
+        self,
+        *,
+        upload_session_id: UUID,
+        user: User,
+    ) -> tuple[UploadSession, list[Part]]:
+        upload_session = await self._get_pending_upload(upload_session_id, user, for_update=False)
+
+        try:
+            parts = await self.storage.list_parts(
+                object_name=upload_session.storage_key,
+                upload_id=upload_session.upload_id,
+            )
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload no longer exists",
+            )
+
+        return upload_session, sorted(parts, key=lambda part: part.part_number)
+
+    async def _get_pending_upload(
+        self,
+        upload_session_id: UUID,
+        user: User,
+        for_update: bool = True,
+    ) -> UploadSession:
+        upload_session = await self.upload_session_repo.get_pending(
+            upload_session_id,
+            for_update=for_update,
+        )
+
+        if not upload_session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload not found",
+            )
+        if upload_session.owner_id != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this upload",
+            )
+        if upload_session.expires_at <= utcnow():
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload expired",
+            )
+
+        return upload_session
+
+    async def _check_upload_size(self, user: User, upload_size: int) -> None:
+        max_size = get_api_settings().STORAGE_MAX_UPLOAD_SIZE
+        if upload_size > max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds maximum size of {max_size / (1024**3):.2f} GB",
+            )
+
+        # Uploads still in progress count against the quota as well
+        current_usage = await self.user_repo.get_storage_used(user.id)
+        current_usage += await self.upload_session_repo.get_reserved_size(user.id, utcnow())
+        if current_usage + upload_size > user.storage_quota:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Storage quota exceeded.",
+            )
+
+    async def _register_entry(
+        self,
+        *,
+        entry_id: UUID,
+        user: User,
+        name: str,
+        size_bytes: int,
+        raw_storage_key: str,
+        lattice_to_mesh: bool,
+    ) -> Entry:
+        storage_key_prefix = f"datasets/{entry_id}"
+
         # Create DB Entry
         entry = Entry(
-            id=dataset_id,
-            name=dataset_file.filename or "data.cvsx",
+            id=entry_id,
+            name=name,
             storage_key=storage_key_prefix,
-            size_bytes=upload_size,
+            size_bytes=size_bytes,
             owner_id=user.id,
         )
         self.entry_repo.add(entry)
@@ -91,17 +390,19 @@ class EntryService:
         share_link = ShareLink(entry_id=entry.id)
         self.share_link_repo.add(share_link)
 
-        await self.entry_repo.commit()
-        await self.entry_repo.refresh(entry, attribute_names=["link"])
-
-        # Schedule processing
-        background_tasks.add_task(
-            ProcessingService.process_entry_conversion,
+        # Enqueue processing, picked up by the conversion worker
+        conversion_job = ConversionJob(
             entry_id=entry.id,
             cvsx_storage_key=raw_storage_key,
             internal_storage_key_prefix=storage_key_prefix,
             lattice_to_mesh=lattice_to_mesh,
         )
+        self.conversion_job_repo.add(conversion_job)
+        await self.user_repo.add_storage_used(user.id, size_bytes)
+
+        await self.entry_repo.commit()
+        invalidate_cached_user(user.id)
+        await self.entry_repo.refresh(entry, attribute_names=["link"])
 
         return entry
 
@@ -155,47 +456,227 @@ class EntryService:
         per_page: int,
         sort_by: str,
         sort_order: str,
-    ) -> tuple[Sequence[Entry], int]:
-        total_items = await self.entry_repo.count_by_owner(user_id)
+        cursor: str | None = None,
+        include_total: bool = True,
+    ) -> tuple[Sequence[Entry], int | None, str | None]:
+        """Returns a page of entries, the total count if requested and the next page cursor.
+
+        Pages are addressed by `cursor` when given, otherwise by `page` number.
+        """
+        total_items = await self.entry_repo.count_by_owner(user_id) if include_total else None
 
         descending = sort_order == "desc"
-        offset = (page - 1) * per_page
+        offset = 0 if cursor else (page - 1) * per_page
+        after = self._decode_entry_cursor(cursor, sort_by, sort_order) if cursor else None
 
         items = await self.entry_repo.list_by_owner(
             owner_id=user_id,
             offset=offset,
-            limit=per_page,
+            limit=per_page + 1,
             sort_attr=sort_by,
             descending=descending,
+            after=after,
         )
 
-        return items, total_items
+        next_cursor = None
+        if len(items) > per_page:
+            items = items[:per_page]
+            last = items[-1]
+            next_cursor = encode_cursor([sort_by, sort_order, getattr(last, sort_by), str(last.id)])
+
+        return items, total_items, next_cursor
+
+    @staticmethod
+    def _decode_entry_cursor(cursor: str, sort_by: str, sort_order: str) -> tuple[Any, UUID]:
+        try:
+            cursor_sort_by, cursor_sort_order, value, entry_id = decode_cursor(cursor)
+            if (cursor_sort_by, cursor_sort_order) != (sort_by, sort_order):
+                raise InvalidCursor("Cursor belongs to a different sort order")
+            match sort_by:
+                case "created_at":
+                    value = datetime.fromisoformat(value)
+                case "status":
+                    value = EntryStatus(value)
+                case "size_bytes":
+                    value = int(value)
+            return value, UUID(entry_id)
+        except (InvalidCursor, TypeError, ValueError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid cursor: {e}",
+            )
 
-    async def get_internal_model(
+    async def get_internal_model_document(
         self,
         *,
         entry_id: UUID,
         user: User | None,
-    ) -> InternalEntry:
+        if_none_match: str | None = None,
+    ) -> StoredDocument:
+        """Returns the stored model document without parsing or validating it.
+
+        Every stored model was validated when it was written, either by
+        `update_internal_model` or by the conversion pipeline, so reads that only
+        pass the document on can skip validation. Raises a 304 response when
+        `if_none_match` matches the stored model's ETag.
+        """
         entry = await self.get_entry_by_id(entry_id=entry_id, user=user)
+        object_path = f"{entry.storage_key}/internal.json"
+        etag = self._check_not_modified(entry, if_none_match)
+
+        cache = get_model_cache()
+
+        stored = cache.get(object_path, etag)
+        if stored:
+            return stored
+
+        try:
+            data = await self._read_model_document(entry)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Internal model not found: {str(e)}",
+            )
+
+        stored = StoredDocument(etag=etag, data=data, encoding=detect_encoding(data))
+        cache.put(object_path, stored)
+        return stored
 
+    async def _load_internal_model(
+        self,
+        entry: Entry,
+        if_none_match: str | None = None,
+    ) -> StoredModel:
         object_path = f"{entry.storage_key}/internal.json"
+        etag = self._check_not_modified(entry, if_none_match)
+        cache = get_model_cache()
+
+        stored = cache.get(object_path, etag)
+        if isinstance(stored, StoredModel):
+            return stored
 
         try:
-            response = self.minio.get_object(
-                bucket_name=get_minio_settings().MINIO_BUCKET,
-                object_name=object_path,
-            )
-            data = json.load(response)
-            response.close()
-            response.release_conn()
-            return InternalEntry.model_validate(data)
+            # a document cached by a plain read only needs validating
+            data = stored.data if stored else await self._read_model_document(entry)
+            document = decode_model(data)
+            stored = StoredModel(
+                model=InternalEntry.model_validate_json(document),
+                etag=etag,
+                data=data,
+                encoding=detect_encoding(data),
+                size=stored_model_size(data, document),
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Internal model not found: {str(e)}",
             )
 
+        cache.put(object_path, stored)
+        return stored
+
+    async def _read_model_document(self, entry: Entry) -> bytes:
+        """Reads the model as committed, from its revision's own key once edited."""
+        if entry.model_revision:
+            try:
+                return await self.storage.get(model_snapshot_path(entry, entry.model_revision))
+            except FileNotFoundError:
+                # revisions stored before each one was written under its own key
+                pass
+        return await self.storage.get(f"{entry.storage_key}/internal.json")
+
+    @staticmethod
+    def _check_not_modified(entry: Entry, if_none_match: str | None) -> str:
+        """Returns the model ETag, its revision number, or raises a 304 response."""
+        etag = str(entry.model_revision)
+        if etag_matches(if_none_match, etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": f'"{etag}"'},
+            )
+        return etag
+
+    async def get_model_changes(
+        self,
+        *,
+        entry_id: UUID,
+        user: User,
+        since: int,
+    ) -> tuple[int, Sequence[ModelRevision]]:
+        """Returns the current revision and the revisions made after `since`, oldest first."""
+        entry = await self.get_entry_by_id(entry_id=entry_id, user=user)
+        if since > entry.model_revision:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Revision {since} does not exist",
+            )
+
+        revisions = await self.model_revision_repo.list_since(entry.id, since)
+        return entry.model_revision, revisions
+
+    async def get_model_revision(
+        self,
+        *,
+        entry_id: UUID,
+        user: User,
+        revision: int,
+    ) -> InternalEntry:
+        """Rebuilds a past revision from the nearest snapshot and the patches after it."""
+        entry = await self.get_entry_by_id(entry_id=entry_id, user=user)
+        if revision > entry.model_revision:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Revision {revision} does not exist",
+            )
+        if revision == entry.model_revision:
+            return (await self._load_internal_model(entry)).model
+
+        snapshot = await self.model_revision_repo.get_snapshot_before(entry.id, revision)
+        if not snapshot:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Revision {revision} does not exist",
+            )
+
+        try:
+            data = await self.storage.get(model_snapshot_path(entry, snapshot.revision))
+            document = json.loads(decode_model(data))
+            for change in await self.model_revision_repo.list_since(
+                entry.id, snapshot.revision, revision
+            ):
+                document = apply_json_patch(document, change.patch or [])
+            return InternalEntry.model_validate(document)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to rebuild revision {revision}: {str(e)}",
+            )
+
+    async def get_asset_object_name(
+        self,
+        *,
+        entry_id: UUID,
+        user: User | None,
+        asset_path: str,
+    ) -> str:
+        entry = await self.get_entry_by_id(entry_id=entry_id, user=user)
+
+        parts = asset_path.split("/")
+        if asset_path.startswith("/") or any(part in ("", ".", "..") for part in parts):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid asset path",
+            )
+
+        object_name = f"{entry.storage_key}/{asset_path}"
+        if not await self.storage.exists(object_name):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Asset not found",
+            )
+
+        return object_name
+
     async def update_entry(
         self,
         *,
@@ -227,29 +708,177 @@ class EntryService:
         entry_id: UUID,
         user: User,
         model: InternalEntry,
-    ) -> InternalEntry:
+        if_match: str | None = None,
+    ) -> StoredModel:
         entry = await self.get_entry_by_id(entry_id=entry_id, user=user)
+        await self._lock_internal_model(entry, if_match)
+        previous = await self._load_internal_model(entry)
+        return await self._store_internal_model(entry, previous, model, user)
 
-        object_path = f"{entry.storage_key}/internal.json"
+    async def patch_internal_model(
+        self,
+        *,
+        entry_id: UUID,
+        user: User,
+        patch: list[dict[str, Any]] | dict[str, Any],
+        if_match: str | None = None,
+    ) -> StoredModel:
+        """Applies a JSON Patch (a list of operations) or a JSON Merge Patch (an object).
+
+        The patch is applied to the cached model, so only the edit travels over the
+        network; the result is validated in full before it is stored.
+        """
+        entry = await self.get_entry_by_id(entry_id=entry_id, user=user)
+        await self._lock_internal_model(entry, if_match)
+        stored = await self._load_internal_model(entry)
+        document = stored.model.model_dump(mode="json")
+
+        try:
+            if isinstance(patch, list):
+                document = apply_json_patch(document, patch)
+            else:
+                document = apply_merge_patch(document, patch)
+        except JsonPatchConflict as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Patch cannot be applied: {e}",
+            )
+        except JsonPatchError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid patch: {e}",
+            )
 
         try:
-            model_bytes = model.model_dump_json(indent=2).encode("utf-8")
-            data_stream = io.BytesIO(model_bytes)
+            model = InternalEntry.model_validate(document)
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=jsonable_encoder(e.errors(include_url=False)),
+            )
+
+        return await self._store_internal_model(entry, stored, model, user)
+
+    async def _lock_internal_model(self, entry: Entry, if_match: str | None) -> None:
+        """Serializes writers of the model and checks the `If-Match` precondition."""
+        await self.entry_repo.lock(entry)
+        if if_match and not etag_matches(if_match, str(entry.model_revision)):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=f"Internal model has changed, current revision is {entry.model_revision}",
+                headers={"ETag": f'"{entry.model_revision}"'},
+            )
+
+    async def _store_internal_model(
+        self,
+        entry: Entry,
+        previous: StoredModel,
+        model: InternalEntry,
+        user: User,
+    ) -> StoredModel:
+        """Writes `model` as the next revision of the entry's model.
+
+        The entry row must be locked by `_lock_internal_model`. The patch from the
+        previous revision is kept in the database; every `MODEL_SNAPSHOT_INTERVAL`
+        revisions the full document is kept as well.
+
+        The document is written under its revision's own key before the commit,
+        so a failed commit leaves the current model untouched, and `internal.json`
+        is only repointed once the revision is committed.
+        """
+        patch = diff_json(previous.model.model_dump(mode="json"), model.model_dump(mode="json"))
+        if not patch:
+            return previous
+
+        object_path = f"{entry.storage_key}/internal.json"
+        revision = entry.model_revision + 1
+
+        settings = get_api_settings()
+        encoding = settings.MODEL_STORAGE_ENCODING
+        is_snapshot = revision % settings.MODEL_SNAPSHOT_INTERVAL == 0
 
-            self.minio.put_object(
-                bucket_name=get_minio_settings().MINIO_BUCKET,
-                object_name=object_path,
-                data=data_stream,
-                length=len(model_bytes),
-                content_type="application/json",
+        try:
+            document = model.model_dump_json().encode("utf-8")
+            data = encode_model(document, encoding)
+
+            if entry.model_revision == 0:
+                # the converted model becomes the base snapshot of the history
+                await self._store_model_snapshot(entry, 0, previous.data, previous.encoding)
+                self.model_revision_repo.add(
+                    ModelRevision(entry_id=entry.id, revision=0, is_snapshot=True)
+                )
+            await self._store_model_snapshot(entry, revision, data, encoding)
+
+            self.model_revision_repo.add(
+                ModelRevision(
+                    entry_id=entry.id,
+                    revision=revision,
+                    patch=patch,
+                    is_snapshot=is_snapshot,
+                    author_id=user.id,
+                )
             )
-            return model
+            entry.model_revision = revision
+            await self.entry_repo.commit()
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to update internal model: {str(e)}",
             )
 
+        stored = StoredModel(
+            model=model,
+            etag=str(revision),
+            data=data,
+            encoding=encoding,
+            size=stored_model_size(data, document),
+        )
+        get_model_cache().put(object_path, stored)
+
+        try:
+            await self._publish_internal_model(entry, data, encoding)
+        except Exception:
+            # the revision is committed and served from its own key; exports
+            # keep the previous internal.json until the next successful write
+            logger.exception("Failed to publish revision %d of entry %s", revision, entry.id)
+
+        return stored
+
+    async def _publish_internal_model(
+        self,
+        entry: Entry,
+        data: bytes,
+        encoding: ModelEncoding,
+    ) -> None:
+        """Repoints `internal.json` at the committed revision and drops superseded copies."""
+        await self.storage.put_bytes(
+            object_name=f"{entry.storage_key}/internal.json",
+            data=data,
+            content_type="application/json",
+            content_encoding=None if encoding == "identity" else encoding,
+        )
+        await self.storage.run(get_export_cache().invalidate, entry.id)
+
+        # the copy before the previous one is dropped unless it is a snapshot; the
+        # previous one stays for readers that loaded the entry before the commit
+        stale = entry.model_revision - 2
+        if stale > 0 and stale % get_api_settings().MODEL_SNAPSHOT_INTERVAL != 0:
+            await self.storage.delete(model_snapshot_path(entry, stale))
+
+    async def _store_model_snapshot(
+        self,
+        entry: Entry,
+        revision: int,
+        data: bytes,
+        encoding: ModelEncoding,
+    ) -> None:
+        await self.storage.put_bytes(
+            object_name=model_snapshot_path(entry, revision),
+            data=data,
+            content_type="application/json",
+            content_encoding=None if encoding == "identity" else encoding,
+        )
+
     async def delete_entry(
         self,
         *,
@@ -260,20 +889,103 @@ class EntryService:
             entry_id=entry_id,
             user=user,
         )
+        await self._mark_deleted([entry], user)
 
-        try:
-            self.minio.remove_object(
-                bucket_name=get_minio_settings().MINIO_BUCKET,
-                object_name=entry.storage_key,
+    async def get_entries_by_ids(
+        self,
+        *,
+        entry_ids: list[UUID],
+        user: User,
+    ) -> list[Entry]:
+        return await self._get_owned_entries(entry_ids, user)
+
+    async def update_share_links(
+        self,
+        *,
+        entry_ids: list[UUID],
+        user: User,
+        is_active: bool,
+    ) -> list[ShareLink]:
+        entries = await self._get_owned_entries(entry_ids, user)
+
+        share_links = await self.share_link_repo.set_active_for_entries(
+            [entry.id for entry in entries],
+            is_active,
+        )
+        await self.share_link_repo.commit()
+
+        by_entry_id = {share_link.entry_id: share_link for share_link in share_links}
+        return [by_entry_id[entry.id] for entry in entries if entry.id in by_entry_id]
+
+    async def delete_entries(
+        self,
+        *,
+        entry_ids: list[UUID],
+        user: User,
+    ) -> None:
+        """Deletes several entries in one transaction. Nothing is deleted unless all can be."""
+        entries = await self._get_owned_entries(entry_ids, user)
+        await self._mark_deleted(entries, user)
+
+    async def _mark_deleted(self, entries: list[Entry], user: User) -> None:
+        """Hides the entries and frees their quota straight away.
+
+        Their files and rows are removed later by the worker's reaper, see
+        `ConversionWorker.reap_deleted_entries`.
+        """
+        entries = list({entry.id: entry for entry in entries}.values())
+        freed = await self.entry_repo.mark_deleted([entry.id for entry in entries], utcnow())
+        if freed:
+            await self.user_repo.add_storage_used(user.id, -freed)
+        await self.entry_repo.commit()
+        if freed:
+            invalidate_cached_user(user.id)
+
+        def invalidate_caches() -> None:
+            model_cache = get_model_cache()
+            export_cache = get_export_cache()
+            for entry in entries:
+                model_cache.invalidate(f"{entry.storage_key}/internal.json")
+                # the reaper removes the shared copies along with the entry's files
+                export_cache.invalidate(entry.id, shared=False)
+
+        await self.storage.run(invalidate_caches)
+
+    async def _get_owned_entries(self, entry_ids: list[UUID], user: User) -> list[Entry]:
+        """Loads the entries in one query, in request order, all of which `user` must own."""
+        entry_ids = list(dict.fromkeys(entry_ids))
+        entries = {entry.id: entry for entry in await self.entry_repo.list_by_ids(entry_ids)}
+
+        missing = [str(entry_id) for entry_id in entry_ids if entry_id not in entries]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Entries not found: {', '.join(missing)}",
             )
-        except S3Error as e:
+        forbidden = [str(entry.id) for entry in entries.values() if entry.owner_id != user.id]
+        if forbidden:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error deleting file from MinIO: {e}",
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Not authorized to access entries: {', '.join(forbidden)}",
             )
 
-        await self.entry_repo.delete(entry)
-        await self.entry_repo.commit()
+        return [entries[entry_id] for entry_id in entry_ids]
+
+
+def model_snapshot_path(entry: Entry, revision: int) -> str:
+    # kept outside the entry prefix, which exports download as a whole
+    return f"revisions/{entry.id}/{revision}.json"
+
+
+def entry_storage_prefixes(entry: Entry) -> list[str]:
+    """Every storage prefix holding objects of the entry."""
+    return [
+        f"{entry.storage_key}/",
+        f"revisions/{entry.id}/",
+        f"{ExportCache.SHARED_PREFIX}/{entry.id}/",
+        # the uploaded CVSX, left behind when the entry is deleted before conversion
+        f"temp/{entry.id}.cvsx",
+    ]
 
 
 async def get_entry_service(
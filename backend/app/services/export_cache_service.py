@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from typing import Literal
+from uuid import UUID, uuid4
+from weakref import WeakValueDictionary
+
+from minio.error import S3Error
+
+from app.core.settings.api_settings import get_api_settings
+from app.services.storage_service import get_minio_storage
+
+ExportFormat = Literal["mvsx", "mvstory"]
+
+EXPORT_EXTENSIONS: dict[str, str] = {
+    "mvsx": ".mvsx",
+    "mvstory": ".mvstory",
+}
+
+
+@lru_cache
+def get_converter_version() -> str:
+    try:
+        return version("cvsx2mvsx")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class ExportCache:
+    """Two-tier cache of generated MVSX/MVStory exports.
+
+    Keys are `{entry_id}/{digest}{extension}`, where the digest covers the stored
+    `internal.json`, the export format and the converter version, so any edit of
+    the model or converter upgrade yields a new key. The local tier lives on disk
+    and is evicted least-recently-used by total bytes; the shared tier lives in
+    object storage under `exports/` and is shared by all API replicas.
+    """
+
+    SHARED_PREFIX = "exports"
+    TEMP_SUFFIX = ".tmp"
+    STALE_TEMP_SECONDS = 60 * 60
+
+    def __init__(self, cache_dir: str, max_bytes: int, shared: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._key_locks: WeakValueDictionary[str, asyncio.Lock] = WeakValueDictionary()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_existing()
+
+    @staticmethod
+    def make_key(entry_id: UUID, internal_model: bytes, target: ExportFormat) -> str:
+        digest = hashlib.sha256(internal_model)
+        digest.update(f"\0{target}\0{get_converter_version()}".encode())
+        return f"{entry_id}/{digest.hexdigest()}{EXPORT_EXTENSIONS[target]}"
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def key_lock(self, key: str) -> asyncio.Lock:
+        """Per-key lock, so concurrent misses for one export generate it only once."""
+        lock = self._key_locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._key_locks[key] = lock
+        return lock
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def shared_key(self, key: str) -> str:
+        return f"{self.SHARED_PREFIX}/{key}"
+
+    def get_local(self, key: str) -> str | None:
+        path = self.local_path(key)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            if not os.path.exists(path):
+                # evicted by another process sharing the cache directory
+                self._size -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+        return path
+
+    def put_local(self, key: str, src_path: str) -> str:
+        path = self.local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        temp_path = f"{path}.{uuid4().hex}{self.TEMP_SUFFIX}"
+        shutil.move(src_path, temp_path)
+        os.replace(temp_path, path)
+        size = os.path.getsize(path)
+
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._size += size
+            self._evict(keep=key)
+        return path
+
+    def fetch_shared(self, key: str) -> str | None:
+        if not self.shared:
+            return None
+
+        temp_path = f"{self.local_path(key)}.{uuid4().hex}{self.TEMP_SUFFIX}"
+        os.makedirs(os.path.dirname(temp_path), exist_ok=True)
+        storage = get_minio_storage()
+        try:
+            storage.client.fget_object(
+                bucket_name=storage.bucket,
+                object_name=self.shared_key(key),
+                file_path=temp_path,
+            )
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                return None
+            raise
+        return self.put_local(key, temp_path)
+
+    def store_shared(self, key: str, path: str) -> None:
+        if not self.shared:
+            return
+
+        storage = get_minio_storage()
+        storage.client.fput_object(
+            bucket_name=storage.bucket,
+            object_name=self.shared_key(key),
+            file_path=path,
+            content_type="application/zip",
+        )
+
+    def invalidate(self, entry_id: UUID, shared: bool = True) -> None:
+        """Drops every cached export of an entry from the local tier and, if `shared`, storage."""
+        entry_prefix = f"{entry_id}/"
+
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(entry_prefix)]:
+                self._size -= self._entries.pop(key)
+        shutil.rmtree(self.local_path(str(entry_id)), ignore_errors=True)
+
+        if not (self.shared and shared):
+            return
+
+        storage = get_minio_storage()
+        for obj in storage.client.list_objects(
+            bucket_name=storage.bucket,
+            prefix=self.shared_key(entry_prefix),
+            recursive=True,
+        ):
+            storage.client.remove_object(bucket_name=storage.bucket, object_name=obj.object_name)
+
+    def _evict(self, keep: str) -> None:
+        for key in list(self._entries):
+            if self._size <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._size -= self._entries.pop(key)
+            try:
+                os.remove(self.local_path(key))
+            except FileNotFoundError:
+                pass
+
+    def _load_existing(self) -> None:
+        found: list[tuple[float, str, int]] = []
+        for root, dirs, files in os.walk(self.cache_dir):
+            for file in files:
+                path = os.path.join(root, file)
+                stat = os.stat(path)
+                if not file.endswith(tuple(EXPORT_EXTENSIONS.values())):
+                    # leftovers of interrupted writes, younger ones may still be in progress
+                    if stat.st_mtime < time.time() - self.STALE_TEMP_SECONDS:
+                        os.remove(path)
+                    continue
+                key = os.path.relpath(path, self.cache_dir).replace(os.sep, "/")
+                found.append((stat.st_mtime, key, stat.st_size))
+
+        with self._lock:
+            for _, key, size in sorted(found):
+                self._entries[key] = size
+                self._size += size
+            self._evict(keep="")
+
+
+@lru_cache
+def get_export_cache() -> ExportCache:
+    settings = get_api_settings()
+    return ExportCache(
+        cache_dir=settings.EXPORT_CACHE_DIR,
+        max_bytes=settings.EXPORT_CACHE_MAX_BYTES,
+        shared=settings.EXPORT_CACHE_SHARED,
+    )
@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from cvsx2mvsx.models.internal.entry import InternalEntry
+
+from app.core.model_codec import ModelEncoding
+from app.core.settings.api_settings import get_api_settings
+
+# memory a validated `InternalEntry` takes per byte of its JSON; about 4.5 as
+# measured with tracemalloc on converted entries, rounded up
+MODEL_BYTES_PER_DOCUMENT_BYTE = 5
+
+
+@dataclass(frozen=True)
+class StoredDocument:
+    etag: str
+    data: bytes
+    """The document exactly as stored, in `encoding`."""
+    encoding: ModelEncoding
+
+
+@dataclass(frozen=True)
+class StoredModel(StoredDocument):
+    model: InternalEntry
+    size: int
+    """Cache cost in bytes, see `stored_model_size`."""
+
+
+class ModelCache:
+    """In-process LRU of stored internal models, bounded by their size in bytes.
+
+    Reads that pass the document on cache it as a `StoredDocument`; the first
+    read that needs the model validates those bytes and replaces the entry
+    with a `StoredModel`.
+
+    Entries are keyed by object name and only returned for the ETag they were
+    read with, so a model rewritten by another replica is never served stale:
+    its new ETag simply misses and replaces the cached version.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, StoredDocument] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, object_name: str, etag: str) -> StoredDocument | None:
+        with self._lock:
+            stored = self._entries.get(object_name)
+            if stored is None or stored.etag != etag:
+                return None
+            self._entries.move_to_end(object_name)
+            return stored
+
+    def put(self, object_name: str, stored: StoredDocument) -> None:
+        if cache_size(stored) > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(object_name)
+            self._entries[object_name] = stored
+            self._size += cache_size(stored)
+            while self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def invalidate(self, object_name: str) -> None:
+        with self._lock:
+            self._pop(object_name)
+
+    def _pop(self, object_name: str) -> None:
+        stored = self._entries.pop(object_name, None)
+        if stored is not None:
+            self._size -= cache_size(stored)
+
+
+def cache_size(stored: StoredDocument) -> int:
+    return stored.size if isinstance(stored, StoredModel) else len(stored.data)
+
+
+def stored_model_size(data: bytes, document: bytes) -> int:
+    """Cache cost of a model stored as `data` that decodes to the JSON `document`.
+
+    Only `data` and the validated model are kept, and the model is estimated
+    from the size of the JSON it was validated from.
+    """
+    return len(data) + MODEL_BYTES_PER_DOCUMENT_BYTE * len(document)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an `If-None-Match` header against an ETag, as in RFC 9110."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.removeprefix("W/").strip('"') == etag:
+            return True
+    return False
+
+
+@lru_cache
+def get_model_cache() -> ModelCache:
+    return ModelCache(max_bytes=get_api_settings().MODEL_CACHE_MAX_BYTES)
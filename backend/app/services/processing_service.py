@@ -1,9 +1,16 @@
+import asyncio
+import io
+import logging
 import os
+import threading
 from tempfile import TemporaryDirectory
-from typing import Literal
+from typing import AsyncIterator, Callable
 from uuid import UUID
+from zipfile import ZIP_DEFLATED, ZipFile
 
+from cvsx2mvsx.etl.load.mvsx import MVSXLoader
 from cvsx2mvsx.etl.pipelines.config import PipelineConfig
+from cvsx2mvsx.etl.pipelines.context import PipelineContext
 from cvsx2mvsx.etl.pipelines.pipeline import Pipeline
 from cvsx2mvsx.etl.pipelines.pipeline_steps import (
     ExtractCVSX,
@@ -15,13 +22,112 @@ from cvsx2mvsx.etl.pipelines.pipeline_steps import (
     TransformToMVStory,
     TransformToMVSX,
 )
+from cvsx2mvsx.models.mvsx.states import MVSXEntry
+from fastapi import HTTPException, status
 from fastapi.concurrency import run_in_threadpool
 
-from app.core.settings.minio_settings import get_minio_settings
+from app.core.model_codec import decode_model_file, encode_model_file
+from app.core.settings.api_settings import get_api_settings
 from app.database.models.entry_model import EntryStatus
 from app.database.session_manager import get_session_manager
 from app.repositories.entry_repository import EntryRepository
-from app.services.storage_service import get_minio_client
+from app.services.export_cache_service import ExportFormat, get_export_cache
+from app.services.storage_service import get_minio_storage
+
+logger = logging.getLogger(__name__)
+
+
+class ZipStreamWriter(io.RawIOBase):
+    """Unseekable file object passing everything written to `emit` in chunks.
+
+    `ZipFile` falls back to data descriptors on unseekable outputs, which lets
+    an archive be sent while it is being written.
+    """
+
+    def __init__(self, emit: Callable[[bytes], None], chunk_size: int):
+        super().__init__()
+        self._emit = emit
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) >= self._chunk_size:
+            self._emit(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._buffer:
+                chunk = bytes(self._buffer)
+                self._buffer.clear()
+                self._emit(chunk)
+        finally:
+            super().close()
+
+
+def write_mvsx_archive(mvsx_entry: MVSXEntry, fp, compression_level: int) -> None:
+    """Same archive layout as `MVSXLoader`, written to an arbitrary file object."""
+    with ZipFile(fp, mode="w", compression=ZIP_DEFLATED, compresslevel=compression_level) as z:
+        data = mvsx_entry.states.model_dump_json(exclude_none=True, indent=2)
+        z.writestr(MVSXLoader.INDEX_PATH, data)
+        for root, dirs, files in os.walk(mvsx_entry.asset_dir):
+            for file in files:
+                full_path = os.path.join(root, file)
+                relative_path = os.path.relpath(full_path, mvsx_entry.asset_dir)
+                z.write(full_path, arcname=relative_path)
+
+
+class _StreamCancelled(Exception): ...
+
+
+async def stream_mvsx_archive(
+    mvsx_entry: MVSXEntry,
+    compression_level: int,
+    chunk_size: int,
+) -> AsyncIterator[bytes]:
+    """Yields the MVSX archive while a worker thread compresses it.
+
+    The queue between the thread and the event loop is bounded, so a slow
+    client throttles compression instead of buffering the archive in memory.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=8)
+    cancelled = threading.Event()
+
+    def emit(chunk: bytes | None) -> None:
+        if cancelled.is_set():
+            raise _StreamCancelled()
+        asyncio.run_coroutine_threadsafe(queue.put(chunk), loop).result()
+
+    def produce() -> None:
+        try:
+            with ZipStreamWriter(emit, chunk_size) as writer:
+                write_mvsx_archive(mvsx_entry, writer, compression_level)
+        finally:
+            if not cancelled.is_set():
+                emit(None)
+
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while (chunk := await queue.get()) is not None:
+            yield chunk
+        await producer
+    finally:
+        if not producer.done():
+            cancelled.set()
+            while not queue.empty():
+                queue.get_nowait()
+            try:
+                await producer
+            except _StreamCancelled:
+                pass
 
 
 class ProcessingService:
@@ -34,16 +140,15 @@ class ProcessingService:
         cvsx_storage_key: str,
         internal_storage_key_prefix: str,
         lattice_to_mesh: bool = True,
-    ):
-        minio = get_minio_client()
-        settings = get_minio_settings()
+    ) -> bool:
+        storage = get_minio_storage()
 
         async with get_session_manager().session() as session:
             entry_repo = EntryRepository(session)
             try:
                 entry = await entry_repo.get_by_id(entry_id)
                 if not entry:
-                    return
+                    return False
 
                 entry.status = EntryStatus.PROCESSING
                 await entry_repo.commit()
@@ -57,16 +162,15 @@ class ProcessingService:
                 entry.status = EntryStatus.COMPLETED
                 await entry_repo.commit()
 
-                minio.remove_object(
-                    bucket_name=settings.MINIO_BUCKET,
-                    object_name=cvsx_storage_key,
-                )
+                await storage.delete(cvsx_storage_key)
+                return True
             except Exception as e:
                 entry = await entry_repo.get_by_id(entry_id)
                 if entry:
                     entry.status = EntryStatus.FAILED
                     entry.error_message = str(e)
                     await entry_repo.commit()
+                return False
 
     @staticmethod
     async def _conversion_helper(
@@ -74,22 +178,13 @@ class ProcessingService:
         internal_storage_key_prefix: str,
         lattice_to_mesh: bool = True,
     ):
-        minio = get_minio_client()
-        settings = get_minio_settings()
+        storage = get_minio_storage()
 
         with TemporaryDirectory() as tempdir:
             cvsx_path = os.path.join(tempdir, "input.cvsx")
 
             try:
-                response = minio.get_object(
-                    bucket_name=settings.MINIO_BUCKET,
-                    object_name=cvsx_storage_key,
-                )
-                with open(cvsx_path, "wb") as f:
-                    for d in response.stream(32 * 1024):
-                        f.write(d)
-                response.close()
-                response.release_conn()
+                await storage.download_object(cvsx_storage_key, cvsx_path)
             except Exception as e:
                 raise Exception(f"Failed to download input CVSX file: {e}")
 
@@ -111,64 +206,182 @@ class ProcessingService:
                 raise Exception(f"Conversion failed: {e}")
 
             try:
-                for root, dirs, files in os.walk(tempdir):
-                    for file in files:
-                        if file == "input.cvsx":
-                            continue
-                        filepath = os.path.join(root, file)
-                        relative_path = os.path.relpath(filepath, tempdir)
-                        storage_key = f"{internal_storage_key_prefix}/{relative_path}"
-                        file_size = os.path.getsize(filepath)
-                        with open(filepath, "rb") as f:
-                            minio.put_object(
-                                bucket_name=settings.MINIO_BUCKET,
-                                object_name=storage_key,
-                                data=f,
-                                length=file_size,
-                                content_type="application/zip",
-                            )
+                await storage.upload_directory(
+                    tempdir,
+                    internal_storage_key_prefix,
+                    exclude={"input.cvsx", "internal.json"},
+                )
+                await ProcessingService._upload_internal_model(
+                    os.path.join(tempdir, "internal.json"),
+                    f"{internal_storage_key_prefix}/internal.json",
+                )
             except Exception as e:
                 raise Exception(f"Failed to upload result: {e}")
 
-    async def generate_export(
+    async def get_export(
         self,
-        target: Literal["mvsx", "mvstory"],
+        *,
+        entry_id: UUID,
+        target: ExportFormat,
+        internal_storage_key_prefix: str,
+    ) -> str | AsyncIterator[bytes]:
+        """Returns the path of a cached export, or a byte stream of a freshly generated one.
+
+        MVSX exports missing from the cache are streamed while the archive is
+        written (when `EXPORT_STREAMING` is enabled) and stored in the cache once
+        the stream completes.
+        """
+        storage = get_minio_storage()
+        cache = get_export_cache()
+        internal_model = await storage.get(f"{internal_storage_key_prefix}/internal.json")
+        key = cache.make_key(entry_id, internal_model, target)
+
+        async with cache.key_lock(key):
+            path = cache.get_local(key) or await storage.run(cache.fetch_shared, key)
+            if path:
+                return path
+
+            if target == "mvsx" and get_api_settings().EXPORT_STREAMING:
+                return await self._stream_mvsx_export(
+                    key=key,
+                    internal_storage_key_prefix=internal_storage_key_prefix,
+                )
+
+            with TemporaryDirectory() as tempdir:
+                export_path = await self.generate_export(
+                    target=target,
+                    internal_storage_key_prefix=internal_storage_key_prefix,
+                    tempdir=tempdir,
+                )
+                path = await run_in_threadpool(cache.put_local, key, export_path)
+
+        await self._store_shared_export(key, path)
+        return path
+
+    async def get_shared_export(
+        self,
+        *,
+        entry_id: UUID,
+        target: ExportFormat,
         internal_storage_key_prefix: str,
-        tempdir: str,
     ) -> str:
-        minio = get_minio_client()
-        settings = get_minio_settings()
+        """Returns the object name of an export in the shared cache, generating it if needed.
 
-        try:
-            objects = minio.list_objects(
-                bucket_name=settings.MINIO_BUCKET,
-                prefix=internal_storage_key_prefix,
-                recursive=True,
+        Used for presigned downloads, which are served by object storage directly.
+        """
+        cache = get_export_cache()
+        if not cache.shared:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Presigned downloads require the shared export cache",
             )
 
-            for obj in objects:
-                if not obj.object_name.startswith(internal_storage_key_prefix):
-                    continue
+        storage = get_minio_storage()
+        internal_model = await storage.get(f"{internal_storage_key_prefix}/internal.json")
+        key = cache.make_key(entry_id, internal_model, target)
+        object_name = cache.shared_key(key)
+
+        if await storage.exists(object_name):
+            return object_name
 
-                relative_name = obj.object_name[len(internal_storage_key_prefix) :]
-                if relative_name.startswith("/"):
-                    relative_name = relative_name[1:]
+        async with cache.key_lock(key):
+            if await storage.exists(object_name):
+                return object_name
 
-                if not relative_name:
-                    continue
+            path = cache.get_local(key)
+            if not path:
+                with TemporaryDirectory() as tempdir:
+                    export_path = await self.generate_export(
+                        target=target,
+                        internal_storage_key_prefix=internal_storage_key_prefix,
+                        tempdir=tempdir,
+                    )
+                    path = await run_in_threadpool(cache.put_local, key, export_path)
 
-                local_path = os.path.join(tempdir, relative_name)
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            await storage.run(cache.store_shared, key, path)
 
-                response = minio.get_object(
-                    bucket_name=settings.MINIO_BUCKET,
-                    object_name=obj.object_name,
+        return object_name
+
+    @staticmethod
+    async def _upload_internal_model(path: str, object_name: str) -> None:
+        encoding = get_api_settings().MODEL_STORAGE_ENCODING
+        await run_in_threadpool(encode_model_file, path, encoding)
+        with open(path, "rb") as f:
+            data = f.read()
+        await get_minio_storage().put_bytes(
+            object_name=object_name,
+            data=data,
+            content_type="application/json",
+            content_encoding=None if encoding == "identity" else encoding,
+        )
+
+    async def _store_shared_export(self, key: str, path: str) -> None:
+        try:
+            await get_minio_storage().run(get_export_cache().store_shared, key, path)
+        except Exception:
+            logger.exception("Failed to store export %s in shared cache", key)
+
+    async def _stream_mvsx_export(
+        self,
+        *,
+        key: str,
+        internal_storage_key_prefix: str,
+    ) -> AsyncIterator[bytes]:
+        # Inputs are fetched and transformed before the stream is returned, so
+        # failures still surface as error responses instead of truncated downloads.
+        tempdir = TemporaryDirectory()
+        internal_dir = os.path.join(tempdir.name, "internal")
+        context = PipelineContext(
+            PipelineConfig(
+                input_path=internal_dir,
+                output_path=os.path.join(tempdir.name, "output.mvsx"),
+                lattice_to_mesh=True,
+            )
+        )
+
+        try:
+            await get_minio_storage().download_prefix(internal_storage_key_prefix, internal_dir)
+            await run_in_threadpool(decode_model_file, os.path.join(internal_dir, "internal.json"))
+            mvsx_entry = await run_in_threadpool(
+                lambda: TransformToMVSX().execute(
+                    ExtractInternal().execute(internal_dir, context),
+                    context,
                 )
-                with open(local_path, "wb") as f:
-                    for d in response.stream(32 * 1024):
-                        f.write(d)
-                response.close()
-                response.release_conn()
+            )
+        except Exception as e:
+            context.cleanup()
+            tempdir.cleanup()
+            raise Exception(f"MVSX conversion failed: {e}")
+
+        async def stream() -> AsyncIterator[bytes]:
+            spool_path = context.config.output_path
+            try:
+                with open(spool_path, "wb") as spool:
+                    async for chunk in stream_mvsx_archive(
+                        mvsx_entry,
+                        compression_level=context.config.compression_level,
+                        chunk_size=get_api_settings().EXPORT_STREAM_CHUNK_SIZE,
+                    ):
+                        spool.write(chunk)
+                        yield chunk
+
+                path = await run_in_threadpool(get_export_cache().put_local, key, spool_path)
+                await self._store_shared_export(key, path)
+            finally:
+                context.cleanup()
+                tempdir.cleanup()
+
+        return stream()
+
+    async def generate_export(
+        self,
+        target: ExportFormat,
+        internal_storage_key_prefix: str,
+        tempdir: str,
+    ) -> str:
+        try:
+            await get_minio_storage().download_prefix(internal_storage_key_prefix, tempdir)
+            await run_in_threadpool(decode_model_file, os.path.join(tempdir, "internal.json"))
         except Exception as e:
             raise Exception(f"Failed to download internal model files: {e}")
 
@@ -1,36 +1,151 @@
-from functools import lru_cache
-from typing import BinaryIO
+import asyncio
+import io
+import logging
+import math
+import mimetypes
+import os
+import socket
+import ssl
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import lru_cache, partial
+from typing import Any, AsyncIterable, BinaryIO, Callable
 
+import certifi
+import httpx
+import urllib3
 from minio import Minio
+from minio.datatypes import Part
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
+from urllib3.connection import HTTPConnection
+from urllib3.util import Retry, Timeout
 
 from app.core.settings.minio_settings import get_minio_settings
+from app.services.minio_multipart import MinioMultipart
+
+logger = logging.getLogger(__name__)
+
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10_000
+# most keys a single multi-object delete request may carry
+MAX_DELETE_BATCH = 1000
+
+CONTENT_TYPES: dict[str, str] = {
+    ".json": "application/json",
+    ".mvsj": "application/json",
+    ".bcif": "application/octet-stream",
+    ".cvsx": "application/zip",
+    ".mvsx": "application/zip",
+    ".mvstory": "application/octet-stream",
+}
+
+
+@dataclass
+class TransferStats:
+    objects: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Transferred bytes per second."""
+        return self.bytes / self.seconds if self.seconds else 0.0
 
 
 class StorageService:
+    """Async facade over the synchronous MinIO client.
+
+    Every blocking client call runs on a dedicated, bounded thread pool, so
+    uploads and downloads never stall the event loop, and storage traffic
+    cannot exhaust the threads FastAPI uses for other blocking work.
+
+    Objects are read exactly as stored. The `Content-Encoding` that `put_bytes`
+    records is meant for presigned downloads, so it is never decoded here.
+    """
+
     def __init__(
         self,
-        endpoint: str,
-        access_key: str,
-        secret_key: str,
+        client: Minio,
         bucket: str,
-        secure: bool = False,
+        max_workers: int,
+        presign_client: Minio | None = None,
+        http_client: httpx.AsyncClient | None = None,
     ):
-        self.client = Minio(endpoint, access_key=access_key, secret_key=secret_key, secure=secure)
+        self.client = client
+        self.presign_client = presign_client or client
+        self.http_client = http_client or httpx.AsyncClient()
+        self.multipart = MinioMultipart(client)
         self.bucket = bucket
-        if not self.client.bucket_exists(bucket):
-            self.client.make_bucket(bucket)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="storage",
+        )
+
+    async def run[T](self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def close(self) -> None:
+        """Closes the part upload client and waits for running storage calls to finish."""
+        await self.http_client.aclose()
+        await asyncio.to_thread(self._executor.shutdown)
+
+    async def ensure_bucket(self) -> None:
+        if not await self.run(self.client.bucket_exists, self.bucket):
+            await self.run(self.client.make_bucket, self.bucket)
+
+    async def ping(self) -> None:
+        await self.run(self.client.list_buckets)
+
+    async def put_object(
+        self,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        content_type: str,
+        part_size: int = 0,
+        metadata: dict[str, str] | None = None,
+    ) -> str:
+        """Uploads an object and returns the ETag of the stored version."""
+        result = await self.run(
+            self.client.put_object,
+            bucket_name=self.bucket,
+            object_name=object_name,
+            data=data,
+            length=length,
+            part_size=part_size,
+            content_type=content_type,
+            metadata=metadata,
+        )
+        return result.etag
+
+    async def put_bytes(
+        self,
+        object_name: str,
+        data: bytes,
+        content_type: str,
+        content_encoding: str | None = None,
+    ) -> str:
+        return await self.put_object(
+            object_name=object_name,
+            data=io.BytesIO(data),
+            length=len(data),
+            content_type=content_type,
+            metadata={"Content-Encoding": content_encoding} if content_encoding else None,
+        )
 
     async def save(self, file_path: str, file_data: BinaryIO) -> str:
         try:
             file_data.seek(0, 2)
             file_size = file_data.tell()
             file_data.seek(0)
-            self.client.put_object(
-                self.bucket,
-                file_path,
-                file_data,
-                file_size,
+            await self.put_object(
+                object_name=file_path,
+                data=file_data,
+                length=file_size,
                 content_type="application/octet-stream",
             )
             return file_path
@@ -39,71 +154,466 @@ class StorageService:
 
     async def get(self, file_path: str) -> bytes:
         try:
-            response = self.client.get_object(self.bucket, file_path)
-            data = response.read()
-            response.close()
-            response.release_conn()
-            return data
+            return await self.run(self._read, file_path)
         except S3Error as e:
-            if "NoSuchKey" in str(e):
+            if e.code == "NoSuchKey":
                 raise FileNotFoundError(f"File not found: {file_path}")
             raise Exception(f"Error getting file from MinIO: {str(e)}")
 
     async def delete(self, file_path: str) -> bool:
         try:
-            self.client.remove_object(self.bucket, file_path)
+            await self.run(self.client.remove_object, self.bucket, file_path)
             return True
         except S3Error as e:
-            if "NoSuchKey" in str(e):
+            if e.code == "NoSuchKey":
                 return False
             raise Exception(f"Error deleting file from MinIO: {str(e)}")
 
     async def delete_directory(self, prefix: str) -> int:
+        return await self.delete_directories([prefix])
+
+    async def delete_directories(self, prefixes: list[str]) -> int:
+        """Deletes everything under `prefixes`, up to `MAX_DELETE_BATCH` objects per request.
+
+        Objects are removed while the listing is still being read, so prefixes of
+        any size are deleted without holding every key in memory.
+        """
+
+        def remove_all() -> int:
+            removed = 0
+            batch: list[DeleteObject] = []
+            for prefix in prefixes:
+                for obj in self.client.list_objects(self.bucket, prefix=prefix, recursive=True):
+                    batch.append(DeleteObject(obj.object_name))
+                    if len(batch) == MAX_DELETE_BATCH:
+                        removed += self._remove_objects(batch)
+                        batch = []
+            if batch:
+                removed += self._remove_objects(batch)
+            return removed
+
         try:
-            objects_to_delete = self.client.list_objects(self.bucket, prefix=prefix, recursive=True)
-            deleted_count = 0
-            for obj in objects_to_delete:
-                self.client.remove_object(self.bucket, obj.object_name)
-                deleted_count += 1
-            return deleted_count
+            return await self.run(remove_all)
         except S3Error as e:
-            raise Exception(f"Error deleting directory from MinIO: {str(e)}")
+            raise Exception(f"Error deleting directories from MinIO: {str(e)}")
 
     async def list_directory(self, prefix: str) -> list[str]:
-        return [
-            obj.object_name
-            for obj in self.client.list_objects(self.bucket, prefix=prefix, recursive=True)
-        ]
+        return await self.run(
+            lambda: [
+                obj.object_name
+                for obj in self.client.list_objects(self.bucket, prefix=prefix, recursive=True)
+            ]
+        )
 
     async def exists(self, file_path: str) -> bool:
         try:
-            self.client.stat_object(self.bucket, file_path)
+            await self.run(self.client.stat_object, self.bucket, file_path)
             return True
         except S3Error as e:
-            if "NoSuchKey" in str(e):
+            if e.code == "NoSuchKey":
                 return False
             raise Exception(f"Error checking file existence on MinIO: {str(e)}")
 
+    def presigned_get_url(
+        self,
+        object_name: str,
+        expires: timedelta,
+        response_headers: dict[str, str] | None = None,
+    ) -> str:
+        # signing is local: the presign client has its region set and never calls out
+        return self.presign_client.presigned_get_object(
+            bucket_name=self.bucket,
+            object_name=object_name,
+            expires=expires,
+            response_headers=response_headers,
+        )
+
+    async def create_multipart_upload(self, object_name: str, content_type: str) -> str:
+        """Starts a multipart upload and returns its upload ID."""
+        return await self.run(self.multipart.create, self.bucket, object_name, content_type)
+
+    def presigned_upload_part_url(
+        self,
+        object_name: str,
+        upload_id: str,
+        part_number: int,
+        expires: timedelta,
+    ) -> str:
+        return self.presign_client.get_presigned_url(
+            "PUT",
+            bucket_name=self.bucket,
+            object_name=object_name,
+            expires=expires,
+            extra_query_params={"uploadId": upload_id, "partNumber": str(part_number)},
+        )
+
+    async def upload_part(
+        self,
+        object_name: str,
+        upload_id: str,
+        part_number: int,
+        chunks: AsyncIterable[bytes],
+        length: int,
+    ) -> str:
+        """Streams one part of a multipart upload and returns its ETag.
+
+        `chunks` must yield exactly `length` bytes. The part is sent to a
+        presigned URL as the chunks arrive, so only one chunk is held in memory
+        at a time; the MinIO client would need the whole part up front.
+        """
+        url = await self.run(
+            self.client.get_presigned_url,
+            "PUT",
+            bucket_name=self.bucket,
+            object_name=object_name,
+            expires=timedelta(hours=1),
+            extra_query_params={"uploadId": upload_id, "partNumber": str(part_number)},
+        )
+        response = await self.http_client.put(
+            url,
+            content=chunks,
+            headers={"Content-Length": str(length)},
+        )
+        if response.status_code == 404 and "<Code>NoSuchUpload</Code>" in response.text:
+            raise FileNotFoundError(f"Upload not found: {upload_id}")
+        response.raise_for_status()
+        return response.headers["ETag"].strip('"')
+
+    async def list_parts(self, object_name: str, upload_id: str) -> list[Part]:
+        """Lists the parts uploaded so far, as recorded by object storage."""
+
+        def list_all() -> list[Part]:
+            parts: list[Part] = []
+            marker = None
+            while True:
+                result = self.multipart.list_parts(
+                    self.bucket,
+                    object_name,
+                    upload_id,
+                    part_number_marker=marker,
+                )
+                parts.extend(result.parts)
+                if not result.is_truncated:
+                    return parts
+                marker = result.next_part_number_marker
+
+        try:
+            return await self.run(list_all)
+        except S3Error as e:
+            if e.code == "NoSuchUpload":
+                raise FileNotFoundError(f"Upload not found: {upload_id}")
+            raise
+
+    async def complete_multipart_upload(
+        self,
+        object_name: str,
+        upload_id: str,
+        parts: list[Part],
+    ) -> None:
+        await self.run(
+            self.multipart.complete,
+            self.bucket,
+            object_name,
+            upload_id,
+            sorted(parts, key=lambda part: part.part_number),
+        )
+
+    async def abort_multipart_upload(self, object_name: str, upload_id: str) -> None:
+        try:
+            await self.run(self.multipart.abort, self.bucket, object_name, upload_id)
+        except S3Error as e:
+            if e.code != "NoSuchUpload":
+                raise
+
+    async def download_object(self, object_name: str, file_path: str) -> int:
+        return await self.run(download_object, self.client, object_name, file_path)
+
+    async def download_prefix(self, prefix: str, dest_dir: str) -> TransferStats:
+        return await self.run(download_prefix, self.client, prefix, dest_dir)
+
+    async def upload_directory(
+        self,
+        source_dir: str,
+        prefix: str,
+        exclude: set[str] | None = None,
+    ) -> TransferStats:
+        return await self.run(upload_directory, self.client, source_dir, prefix, exclude)
+
+    def _remove_objects(self, batch: list[DeleteObject]) -> int:
+        # the client sends the request only once its result is iterated
+        errors = list(self.client.remove_objects(self.bucket, batch))
+        if errors:
+            raise Exception(f"Error deleting {errors[0].name} from MinIO: {errors[0].message}")
+        return len(batch)
+
+    def _read(self, object_name: str) -> bytes:
+        response = self.client.get_object(self.bucket, object_name)
+        try:
+            return response.read(decode_content=False)
+        finally:
+            response.close()
+            response.release_conn()
+
 
 @lru_cache
 def get_minio_storage():
     settings = get_minio_settings()
     storage = StorageService(
-        endpoint=settings.MINIO_ENDPOINT,
+        client=get_minio_client(),
         bucket=settings.MINIO_BUCKET,
-        access_key=settings.MINIO_ROOT_USER,
-        secret_key=settings.MINIO_ROOT_PASSWORD,
-        secure=settings.MINIO_SECURE,
+        max_workers=settings.MINIO_EXECUTOR_WORKERS,
+        presign_client=get_minio_presign_client(),
+        http_client=httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.MINIO_READ_TIMEOUT_SECONDS,
+                connect=settings.MINIO_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(max_connections=settings.MINIO_POOL_MAXSIZE),
+            verify=ssl.create_default_context(
+                cafile=os.environ.get("SSL_CERT_FILE") or certifi.where()
+            ),
+        ),
     )
     return storage
 
 
+@lru_cache
 def get_minio_client():
+    """Process-wide MinIO client; its connection pool is shared by all callers."""
     settings = get_minio_settings()
+
+    socket_options = list(HTTPConnection.default_socket_options)
+    if settings.MINIO_TCP_KEEPALIVE:
+        socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+    http_client = urllib3.PoolManager(
+        num_pools=4,
+        maxsize=settings.MINIO_POOL_MAXSIZE,
+        block=False,
+        timeout=Timeout(
+            connect=settings.MINIO_CONNECT_TIMEOUT_SECONDS,
+            read=settings.MINIO_READ_TIMEOUT_SECONDS,
+        ),
+        retries=Retry(
+            total=settings.MINIO_MAX_RETRIES,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+        socket_options=socket_options,
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+    )
     client = Minio(
         endpoint=settings.MINIO_ENDPOINT,
         access_key=settings.MINIO_ROOT_USER,
         secret_key=settings.MINIO_ROOT_PASSWORD,
         secure=settings.MINIO_SECURE,
+        region=settings.MINIO_REGION,
+        http_client=http_client,
     )
     return client
+
+
+@lru_cache
+def get_minio_presign_client():
+    """Client for signing URLs handed out to browsers, using the public endpoint.
+
+    The region must be known up front, otherwise signing would look up the
+    bucket location through an endpoint the API may not be able to reach.
+    """
+    settings = get_minio_settings()
+    return Minio(
+        endpoint=settings.MINIO_PUBLIC_ENDPOINT,
+        access_key=settings.MINIO_ROOT_USER,
+        secret_key=settings.MINIO_ROOT_PASSWORD,
+        secure=settings.MINIO_PUBLIC_SECURE,
+        region=settings.MINIO_REGION or "us-east-1",
+    )
+
+
+def download_object(
+    client: Minio,
+    object_name: str,
+    file_path: str,
+    chunk_size: int | None = None,
+) -> int:
+    settings = get_minio_settings()
+    chunk_size = chunk_size or settings.MINIO_TRANSFER_CHUNK_SIZE
+
+    dirpath = os.path.dirname(file_path)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+
+    size = 0
+    response = client.get_object(
+        bucket_name=settings.MINIO_BUCKET,
+        object_name=object_name,
+    )
+    try:
+        with open(file_path, "wb") as f:
+            for data in response.stream(chunk_size, decode_content=False):
+                f.write(data)
+                size += len(data)
+    finally:
+        response.close()
+        response.release_conn()
+    return size
+
+
+def download_prefix(
+    client: Minio,
+    prefix: str,
+    dest_dir: str,
+    concurrency: int | None = None,
+    chunk_size: int | None = None,
+) -> TransferStats:
+    """Materializes every object under `prefix` into `dest_dir`, keeping relative paths.
+
+    Objects are fetched by at most `concurrency` threads at once, so prefixes with
+    many small files are not bound by serial round trips.
+    """
+    settings = get_minio_settings()
+    concurrency = concurrency or settings.MINIO_TRANSFER_CONCURRENCY
+    prefix = prefix.rstrip("/") + "/"
+
+    stats = TransferStats()
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="minio-fetch") as pool:
+        futures: list[Future[int]] = []
+        for obj in client.list_objects(
+            bucket_name=settings.MINIO_BUCKET,
+            prefix=prefix,
+            recursive=True,
+        ):
+            relative_name = obj.object_name[len(prefix) :]
+            if not relative_name or relative_name.endswith("/"):
+                continue
+            futures.append(
+                pool.submit(
+                    download_object,
+                    client,
+                    obj.object_name,
+                    os.path.join(dest_dir, relative_name),
+                    chunk_size,
+                )
+            )
+
+        done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in pending:
+            future.cancel()
+        for future in done:
+            stats.bytes += future.result()
+            stats.objects += 1
+
+    stats.seconds = time.perf_counter() - started
+    logger.info(
+        "Fetched %d objects (%d bytes) from %s in %.2fs (%.1f MiB/s)",
+        stats.objects,
+        stats.bytes,
+        prefix,
+        stats.seconds,
+        stats.throughput / (1024 * 1024),
+    )
+    return stats
+
+
+def guess_content_type(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in CONTENT_TYPES:
+        return CONTENT_TYPES[extension]
+    content_type, _ = mimetypes.guess_type(path)
+    return content_type or "application/octet-stream"
+
+
+def part_size_for(size: int) -> int:
+    """Part size for uploading an object of `size` bytes.
+
+    Objects up to `MINIO_MULTIPART_THRESHOLD` get a part size covering the whole
+    object, so they go out as a single PUT. Larger objects use
+    `MINIO_MULTIPART_PART_SIZE`, grown when needed to stay within the S3 part limit.
+    """
+    if size > get_minio_settings().MINIO_MULTIPART_THRESHOLD:
+        return multipart_part_size(size)
+    return _round_part_size(size)
+
+
+def multipart_part_size(size: int) -> int:
+    """Part size for a multipart upload of `size` bytes, within the S3 part limit."""
+    part_size = max(get_minio_settings().MINIO_MULTIPART_PART_SIZE, math.ceil(size / MAX_PARTS))
+    return _round_part_size(part_size)
+
+
+def _round_part_size(part_size: int) -> int:
+    mebibyte = 1024 * 1024
+    return max(MIN_PART_SIZE, math.ceil(part_size / mebibyte) * mebibyte)
+
+
+def upload_file(
+    client: Minio,
+    file_path: str,
+    object_name: str,
+    content_type: str | None = None,
+) -> int:
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        client.put_object(
+            bucket_name=get_minio_settings().MINIO_BUCKET,
+            object_name=object_name,
+            data=f,
+            length=size,
+            part_size=part_size_for(size),
+            content_type=content_type or guess_content_type(file_path),
+        )
+    return size
+
+
+def upload_directory(
+    client: Minio,
+    source_dir: str,
+    prefix: str,
+    exclude: set[str] | None = None,
+    concurrency: int | None = None,
+) -> TransferStats:
+    """Uploads every file under `source_dir` to `prefix`, keeping relative paths.
+
+    Files are uploaded by at most `concurrency` threads at once, each with a
+    content type guessed from its extension.
+    """
+    settings = get_minio_settings()
+    concurrency = concurrency or settings.MINIO_TRANSFER_CONCURRENCY
+    exclude = exclude or set()
+    prefix = prefix.rstrip("/")
+
+    stats = TransferStats()
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="minio-upload") as pool:
+        futures: list[Future[int]] = []
+        for root, dirs, files in os.walk(source_dir):
+            for file in files:
+                file_path = os.path.join(root, file)
+                relative_path = os.path.relpath(file_path, source_dir).replace(os.sep, "/")
+                if relative_path in exclude:
+                    continue
+                futures.append(
+                    pool.submit(upload_file, client, file_path, f"{prefix}/{relative_path}")
+                )
+
+        done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in pending:
+            future.cancel()
+        for future in done:
+            stats.bytes += future.result()
+            stats.objects += 1
+
+    stats.seconds = time.perf_counter() - started
+    logger.info(
+        "Uploaded %d objects (%d bytes) to %s in %.2fs (%.1f MiB/s)",
+        stats.objects,
+        stats.bytes,
+        prefix,
+        stats.seconds,
+        stats.throughput / (1024 * 1024),
+    )
+    return stats
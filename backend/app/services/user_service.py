@@ -1,11 +1,13 @@
+from functools import lru_cache
 from uuid import UUID
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.settings.api_settings import get_api_settings
+from app.core.ttl_cache import TTLCache
 from app.database.models.user_model import User
 from app.database.session_manager import get_async_session
-from app.repositories.entry_repository import EntryRepository
 from app.repositories.user_repository import UserRepository
 
 
@@ -13,7 +15,6 @@ class UserService:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.user_repo = UserRepository(session)
-        self.entry_repo = EntryRepository(session)
 
     async def create_user(
         self,
@@ -41,7 +42,27 @@ class UserService:
         return await self.user_repo.get_by_sub(sub)
 
     async def get_storage_usage(self, user_id: UUID) -> int:
-        return await self.entry_repo.get_storage_usage(user_id)
+        return await self.user_repo.get_storage_used(user_id)
+
+
+@lru_cache
+def get_user_cache() -> TTLCache[str, User]:
+    """Detached user records keyed by user id, read by `AuthMiddleware` on every request.
+
+    Code in this process that changes or deletes a user row calls
+    `invalidate_cached_user` once the change is committed; changes made
+    elsewhere, such as by the worker, are picked up when the TTL expires. The
+    records are detached snapshots, so they must never be added to a session.
+    """
+    settings = get_api_settings()
+    return TTLCache(
+        ttl=settings.USER_CACHE_TTL_SECONDS,
+        max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    )
+
+
+def invalidate_cached_user(user_id: UUID | str) -> None:
+    get_user_cache().invalidate(str(user_id))
 
 
 async def get_user_service(
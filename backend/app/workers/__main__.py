@@ -0,0 +1,29 @@
+import asyncio
+import logging
+import signal
+
+from app.database.session_manager import get_session_manager
+from app.services.storage_service import get_minio_storage
+from app.workers.conversion_worker import ConversionWorker
+
+
+async def main():
+    worker = ConversionWorker()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await get_session_manager().close()
+        await get_minio_storage().close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    asyncio.run(main())
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import timedelta
+from uuid import UUID
+
+from app.core.settings.worker_settings import get_worker_settings
+from app.database.models.conversion_job_model import ConversionJobStatus
+from app.database.models.entry_model import EntryStatus
+from app.database.models.mixins.timestamp_mixin import utcnow
+from app.database.models.upload_session_model import UploadSessionStatus
+from app.database.session_manager import get_session_manager
+from app.repositories.conversion_job_repository import ConversionJobRepository
+from app.repositories.entry_repository import EntryRepository
+from app.repositories.upload_session_repository import UploadSessionRepository
+from app.repositories.user_repository import UserRepository
+from app.services.entry_service import entry_storage_prefixes
+from app.services.processing_service import ProcessingService
+from app.services.storage_service import get_minio_storage
+
+logger = logging.getLogger(__name__)
+
+
+class ConversionWorker:
+    """Claims queued conversion jobs from Postgres and runs them to completion.
+
+    Jobs are claimed with `SELECT ... FOR UPDATE SKIP LOCKED`, so any number of
+    worker processes can poll the same table without handing out a job twice.
+    Running jobs send heartbeats; jobs whose worker died are re-queued until
+    `WORKER_MAX_ATTEMPTS` is reached.
+    """
+
+    def __init__(self, worker_id: str | None = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.settings = get_worker_settings()
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        logger.info(
+            "Conversion worker %s started with %d slot(s)",
+            self.worker_id,
+            self.settings.WORKER_CONCURRENCY,
+        )
+        await asyncio.gather(
+            self._stale_jobs_loop(),
+            self._storage_reconcile_loop(),
+            self._reaper_loop(),
+            *(self._slot_loop() for _ in range(self.settings.WORKER_CONCURRENCY)),
+        )
+        logger.info("Conversion worker %s stopped", self.worker_id)
+
+    async def run_once(self) -> bool:
+        async with get_session_manager().session() as session:
+            job_repo = ConversionJobRepository(session)
+            job = await job_repo.claim_next(self.worker_id)
+            if not job:
+                return False
+            await job_repo.commit()
+
+        logger.info("Claimed conversion job %s (entry %s)", job.id, job.entry_id)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            succeeded = await ProcessingService.process_entry_conversion(
+                entry_id=job.entry_id,
+                cvsx_storage_key=job.cvsx_storage_key,
+                internal_storage_key_prefix=job.internal_storage_key_prefix,
+                lattice_to_mesh=job.lattice_to_mesh,
+            )
+        finally:
+            heartbeat.cancel()
+
+        async with get_session_manager().session() as session:
+            job_repo = ConversionJobRepository(session)
+            finished_job = await job_repo.get_by_id(job.id)
+            if finished_job:
+                finished_job.status = (
+                    ConversionJobStatus.COMPLETED if succeeded else ConversionJobStatus.FAILED
+                )
+                finished_job.locked_at = None
+                finished_job.locked_by = None
+                await job_repo.commit()
+
+        logger.info("Conversion job %s finished (succeeded=%s)", job.id, succeeded)
+        return True
+
+    async def requeue_stale_jobs(self) -> None:
+        timeout = timedelta(seconds=self.settings.WORKER_STALE_JOB_TIMEOUT_SECONDS)
+
+        async with get_session_manager().session() as session:
+            job_repo = ConversionJobRepository(session)
+            entry_repo = EntryRepository(session)
+
+            for job in await job_repo.list_stale(utcnow() - timeout):
+                logger.warning("Conversion job %s lost its worker %s", job.id, job.locked_by)
+                job.locked_at = None
+                job.locked_by = None
+                entry = await entry_repo.get_by_id(job.entry_id)
+
+                if job.attempts >= self.settings.WORKER_MAX_ATTEMPTS:
+                    job.status = ConversionJobStatus.FAILED
+                    job.error_message = "Conversion worker stopped responding"
+                    if entry:
+                        entry.status = EntryStatus.FAILED
+                        entry.error_message = job.error_message
+                else:
+                    job.status = ConversionJobStatus.QUEUED
+                    job.available_at = utcnow()
+                    if entry:
+                        entry.status = EntryStatus.PENDING
+
+            await job_repo.commit()
+
+    async def abort_expired_uploads(self) -> None:
+        """Aborts direct uploads that were never completed, freeing their parts in storage."""
+        storage = get_minio_storage()
+
+        async with get_session_manager().session() as session:
+            upload_session_repo = UploadSessionRepository(session)
+
+            for upload_session in await upload_session_repo.list_expired(utcnow()):
+                try:
+                    await storage.abort_multipart_upload(
+                        object_name=upload_session.storage_key,
+                        upload_id=upload_session.upload_id,
+                    )
+                except Exception:
+                    logger.exception("Failed to abort expired upload %s", upload_session.id)
+                    continue
+                upload_session.status = UploadSessionStatus.ABORTED
+                logger.info("Aborted expired upload %s", upload_session.id)
+
+            await upload_session_repo.commit()
+
+    async def reconcile_storage_usage(self) -> None:
+        """Repairs per-user storage counters that drifted from the sum of their entries."""
+        async with get_session_manager().session() as session:
+            user_repo = UserRepository(session)
+            fixed = await user_repo.reconcile_storage_used()
+            await user_repo.commit()
+
+        if fixed:
+            logger.warning("Reconciled storage usage of %d user(s)", fixed)
+
+    async def reap_deleted_entries(self) -> int:
+        """Removes the files and rows of entries marked deleted. Returns how many were removed.
+
+        The entries stay locked while their files are deleted, so concurrent
+        workers reap disjoint batches. If storage fails, the rows are kept and
+        retried on the next run.
+        """
+        storage = get_minio_storage()
+
+        async with get_session_manager().session() as session:
+            entry_repo = EntryRepository(session)
+            entries = await entry_repo.list_deleted(self.settings.WORKER_REAPER_BATCH_SIZE)
+            if not entries:
+                return 0
+
+            removed = await storage.delete_directories(
+                [prefix for entry in entries for prefix in entry_storage_prefixes(entry)]
+            )
+            await entry_repo.delete_by_ids([entry.id for entry in entries])
+            await entry_repo.commit()
+
+        logger.info("Reaped %d deleted entries (%d objects)", len(entries), removed)
+        return len(entries)
+
+    async def _slot_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Conversion worker %s failed to process a job", self.worker_id)
+                processed = False
+            if not processed:
+                await self._sleep(self.settings.WORKER_POLL_INTERVAL_SECONDS)
+
+    async def _stale_jobs_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.requeue_stale_jobs()
+            except Exception:
+                logger.exception("Failed to requeue stale conversion jobs")
+            try:
+                await self.abort_expired_uploads()
+            except Exception:
+                logger.exception("Failed to abort expired uploads")
+            await self._sleep(self.settings.WORKER_HEARTBEAT_INTERVAL_SECONDS)
+
+    async def _storage_reconcile_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.reconcile_storage_usage()
+            except Exception:
+                logger.exception("Failed to reconcile storage usage")
+            await self._sleep(self.settings.WORKER_STORAGE_RECONCILE_INTERVAL_SECONDS)
+
+    async def _reaper_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                reaped = await self.reap_deleted_entries()
+            except Exception:
+                logger.exception("Failed to reap deleted entries")
+                reaped = 0
+            # a full batch means more entries are likely waiting
+            if reaped < self.settings.WORKER_REAPER_BATCH_SIZE:
+                await self._sleep(self.settings.WORKER_REAPER_INTERVAL_SECONDS)
+
+    async def _heartbeat(self, job_id: UUID) -> None:
+        while True:
+            await asyncio.sleep(self.settings.WORKER_HEARTBEAT_INTERVAL_SECONDS)
+            try:
+                async with get_session_manager().session() as session:
+                    job_repo = ConversionJobRepository(session)
+                    await job_repo.heartbeat(job_id, self.worker_id)
+                    await job_repo.commit()
+            except Exception:
+                logger.exception("Failed to send heartbeat for conversion job %s", job_id)
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except TimeoutError:
+            pass
@@ -0,0 +1,103 @@
+"""Measures the per-request overhead of the authentication middleware.
+
+Compares `AuthMiddleware` with the `BaseHTTPMiddleware` implementation it
+replaced, both wrapping a trivial endpoint and called without a token, so the
+numbers isolate the middleware machinery from database lookups.
+
+Usage, from the backend directory:
+
+    python -m benchmarks.auth_middleware --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.types import ASGIApp
+
+from app.api.v1.middleware.auth_middleware import AuthMiddleware
+from app.core.settings.api_settings import get_api_settings
+from app.services.auth_service import AuthService
+
+
+class BaseHTTPAuthMiddleware(BaseHTTPMiddleware):
+    """The anonymous path of the previous `AuthMiddleware`."""
+
+    async def dispatch(self, request, call_next):
+        request.state.user = None
+        token = request.cookies.get(get_api_settings().JWT_ACCESS_TOKEN_COOKIE)
+        if not token:
+            auth_header = request.headers.get("Authorization")
+            if auth_header and auth_header.startswith("Bearer "):
+                token = auth_header.split(" ")[1]
+        return await call_next(request)
+
+
+async def endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+def build_app(middleware: type | None) -> ASGIApp:
+    app = Starlette(routes=[Route("/", endpoint)])
+    if middleware is BaseHTTPAuthMiddleware:
+        return BaseHTTPAuthMiddleware(app)
+    if middleware is AuthMiddleware:
+        return AuthMiddleware(app, auth_service=AuthService())
+    return app
+
+
+async def call(app: ASGIApp) -> None:
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app: ASGIApp, requests: int) -> float:
+    for _ in range(100):
+        await call(app)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    baseline = await measure(build_app(None), args.requests)
+    print(f"{'no middleware':<20} {baseline:8.1f} us/request")
+    for name, middleware in [
+        ("BaseHTTPMiddleware", BaseHTTPAuthMiddleware),
+        ("pure ASGI", AuthMiddleware),
+    ]:
+        elapsed = await measure(build_app(middleware), args.requests)
+        print(f"{name:<20} {elapsed:8.1f} us/request ({elapsed - baseline:+.1f} us overhead)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,184 @@
+"""Records `EXPLAIN ANALYZE` of the hot entry queries against a large dataset.
+
+Seeds users with many entries each, runs every repository method below while
+capturing the SQL it sends, and explains each captured statement with the same
+parameters. Everything happens in one transaction that is rolled back, so the
+database is left as it was. Point it at a migrated database (the API's
+Postgres settings) and compare the output before and after schema changes:
+
+    python -m benchmarks.entry_queries --users 50 --entries-per-user 20000 --output plans.json
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.session_manager import get_session_manager
+from app.repositories.entry_repository import EntryRepository
+from app.repositories.share_link_repository import ShareLinkRepository
+from app.repositories.user_repository import UserRepository
+
+SEED_USERS = """
+INSERT INTO users (id, sub, storage_quota, storage_used, created_at, updated_at)
+SELECT gen_random_uuid(), 'benchmark-' || u, 0, 0, now(), now()
+FROM generate_series(1, :users) AS u
+RETURNING id
+"""
+
+SEED_ENTRIES = """
+INSERT INTO entries (
+    id, name, storage_key, size_bytes, status, model_revision, owner_id, created_at, updated_at
+)
+SELECT
+    gen_random_uuid(),
+    'entry ' || md5(random()::text),
+    'benchmark/' || gen_random_uuid(),
+    (random() * 1e9)::bigint,
+    (ARRAY['PENDING', 'PROCESSING', 'COMPLETED', 'FAILED'])[1 + n % 4]::entrystatus,
+    0,
+    u.id,
+    now() - n * interval '1 minute',
+    now()
+FROM users AS u
+CROSS JOIN generate_series(1, :entries) AS n
+WHERE u.sub LIKE 'benchmark-%'
+"""
+
+SEED_SHARE_LINKS = """
+INSERT INTO share_links (id, is_active, entry_id, created_at, updated_at)
+SELECT gen_random_uuid(), true, id, now(), now()
+FROM entries
+WHERE storage_key LIKE 'benchmark/%'
+"""
+
+
+class StatementRecorder:
+    """Captures the statements and parameters a block of code sends to the database."""
+
+    def __init__(self, session: AsyncSession):
+        self.engine = session.bind.sync_engine
+        self.statements: list[tuple[str, Any]] = []
+
+    def __enter__(self) -> "StatementRecorder":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append((statement, parameters))
+
+
+async def seed(session: AsyncSession, users: int, entries: int) -> list:
+    result = await session.execute(text(SEED_USERS), {"users": users})
+    user_ids = list(result.scalars())
+    await session.execute(text(SEED_ENTRIES), {"entries": entries})
+    await session.execute(text(SEED_SHARE_LINKS))
+    for table in ("users", "entries", "share_links"):
+        await session.execute(text(f"ANALYZE {table}"))
+    return user_ids
+
+
+async def explain(session: AsyncSession, statement: str, parameters: Any) -> dict[str, Any]:
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}",
+        parameters,
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+def scans(node: dict[str, Any]) -> list[str]:
+    found = []
+    if "Scan" in node["Node Type"]:
+        name = node["Node Type"]
+        if "Index Name" in node:
+            name += f" using {node['Index Name']}"
+        found.append(name)
+    for child in node.get("Plans", []):
+        found.extend(scans(child))
+    return found
+
+
+async def run(users: int, entries: int) -> dict[str, list[dict[str, Any]]]:
+    async with get_session_manager().session() as session:
+        user_ids = await seed(session, users, entries)
+        owner_id = user_ids[0]
+
+        entry_repo = EntryRepository(session)
+        share_link_repo = ShareLinkRepository(session)
+        user_repo = UserRepository(session)
+        deep_page = await entry_repo.list_by_owner(owner_id, offset=entries - 21, limit=1)
+        last = deep_page[0]
+
+        cases: dict[str, Callable[[], Awaitable[Any]]] = {
+            "count_by_owner": lambda: entry_repo.count_by_owner(owner_id),
+            "share_links.get_by_entry_id": lambda: share_link_repo.get_by_entry_id(last.id),
+            "list_by_owner, deep offset": lambda: entry_repo.list_by_owner(
+                owner_id, offset=entries - 20, limit=11
+            ),
+            "list_by_owner, keyset": lambda: entry_repo.list_by_owner(
+                owner_id, offset=0, limit=11, after=(last.created_at, last.id)
+            ),
+            "users.reconcile_storage_used": lambda: user_repo.reconcile_storage_used(),
+        }
+        for sort_attr in ("created_at", "name", "size_bytes", "status"):
+            cases[f"list_by_owner, first page by {sort_attr}"] = (
+                lambda sort_attr=sort_attr: entry_repo.list_by_owner(
+                    owner_id, offset=0, limit=11, sort_attr=sort_attr
+                )
+            )
+
+        report: dict[str, list[dict[str, Any]]] = {}
+        for name, case in cases.items():
+            with StatementRecorder(session) as recorder:
+                await case()
+            report[name] = []
+            for statement, parameters in recorder.statements:
+                plan = await explain(session, statement, parameters)
+                report[name].append(
+                    {
+                        "statement": statement,
+                        "planning_ms": plan["Planning Time"],
+                        "execution_ms": plan["Execution Time"],
+                        "scans": scans(plan["Plan"]),
+                    }
+                )
+
+        await session.rollback()
+
+    await get_session_manager().close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--entries-per-user", type=int, default=10000, help="at least 21")
+    parser.add_argument("--output", help="write the full report as JSON to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.users, args.entries_per_user))
+
+    for name, statements in report.items():
+        for result in statements:
+            print(
+                f"{name:<42} {result['execution_ms']:9.3f} ms"
+                f"  (planning {result['planning_ms']:.3f} ms)  {', '.join(result['scans'])}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compares serving a stored internal model with and without validation.
+
+The validated path is what `GET .../model` used to do: parse and validate the
+stored JSON into `InternalEntry`, then validate and serialize it again for
+`response_model`. The trusted path hands the stored bytes to `model_response`
+unchanged. Both read the document through `StorageService` from a response
+carrying `Content-Encoding: gzip`, as MinIO serves stored models, so the
+numbers include whatever the read path does to the stored bytes.
+
+Usage, from the backend directory, with any converted `internal.json`:
+
+    python -m benchmarks.model_read path/to/internal.json --scale 50
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import statistics
+import time
+
+import urllib3
+from cvsx2mvsx.models.internal.entry import InternalEntry
+
+from app.api.v1.endpoints.common import model_response
+from app.core.model_codec import decode_model, detect_encoding, encode_model
+from app.services.model_cache_service import StoredDocument
+from app.services.storage_service import StorageService
+
+
+class StoredModelClient:
+    """Stands in for MinIO, serving one model stored with `Content-Encoding: gzip`."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def get_object(self, bucket_name: str, object_name: str) -> urllib3.HTTPResponse:
+        return urllib3.HTTPResponse(
+            body=io.BytesIO(self.data),
+            headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+            status=200,
+            preload_content=False,
+        )
+
+
+def load_document(path: str, scale: int) -> bytes:
+    """Reads a model and repeats its timeframes `scale` times to emulate a larger entry."""
+    with open(path, "rb") as f:
+        document = json.loads(decode_model(f.read()))
+    document["timeframes"] = document["timeframes"] * scale
+    return json.dumps(document, separators=(",", ":")).encode("utf-8")
+
+
+async def serve_validated(storage: StorageService) -> bytes:
+    data = await storage.get("internal.json")
+    model = InternalEntry.model_validate_json(decode_model(data))
+    return InternalEntry.model_validate(model.model_dump()).model_dump_json().encode("utf-8")
+
+
+async def serve_trusted(storage: StorageService, accept_encoding: str | None) -> bytes:
+    data = await storage.get("internal.json")
+    stored = StoredDocument(etag="bench", data=data, encoding=detect_encoding(data))
+    return model_response(stored, accept_encoding).body
+
+
+async def measure(fn, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="internal.json of a converted entry")
+    parser.add_argument("--scale", type=int, default=1, help="timeframe multiplier")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    document = load_document(args.path, args.scale)
+    data = encode_model(document, "gzip")
+    print(f"document: {len(document) / 1e6:.1f} MB, stored: {len(data) / 1e6:.1f} MB gzip")
+
+    storage = StorageService(client=StoredModelClient(data), bucket="bench", max_workers=1)
+
+    cases = {
+        "validated": lambda: serve_validated(storage),
+        "trusted, gzip client": lambda: serve_trusted(storage, "gzip"),
+        "trusted, identity client": lambda: serve_trusted(storage, None),
+    }
+    for name, fn in cases.items():
+        timings = await measure(fn, args.repeat)
+        body = await fn()
+        print(
+            f"{name:<26} median {statistics.median(timings):8.2f} ms"
+            f"  min {min(timings):8.2f} ms  body {len(body) / 1e6:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
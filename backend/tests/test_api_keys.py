@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
@@ -9,7 +9,12 @@ from app.api.v1.deps import get_required_user_from_state
 from app.database.models.api_key_model import ApiKey
 from app.database.models.user_model import User
 from app.main import app
-from app.services.api_key_service import ApiKeyService, get_api_key_service
+from app.services.api_key_service import (
+    ApiKeyService,
+    ApiKeyUsageRecorder,
+    get_api_key_cache,
+    get_api_key_service,
+)
 
 # Mock User
 mock_user = User(
@@ -75,3 +80,30 @@ async def test_revoke_api_key(client, override_deps):
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
     mock_service.revoke_key.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_key_is_cached_until_revoked(monkeypatch):
+    get_api_key_cache.cache_clear()
+    usage = ApiKeyUsageRecorder(interval=60)
+    monkeypatch.setattr("app.services.api_key_service.get_api_key_usage", lambda: usage)
+
+    raw_key = "cv_cachedkey"
+    record = ApiKey(id=uuid4(), key_hash="", owner=mock_user, expires_at=None)
+    service = ApiKeyService(session=Mock())
+    service.api_key_repo = AsyncMock()
+    service.api_key_repo.get_by_hash_join_owner.return_value = record
+    service.api_key_repo.get_by_id_and_owner.return_value = ApiKey(
+        id=record.id, key_hash=service._hash_key(raw_key)
+    )
+
+    assert await service.get_user_by_key(raw_key) is mock_user
+    assert await service.get_user_by_key(raw_key) is mock_user
+    assert service.api_key_repo.get_by_hash_join_owner.await_count == 1
+    assert list(usage._pending) == [record.id]
+    service.api_key_repo.commit.assert_not_awaited()
+
+    await service.revoke_key(mock_user, record.id)
+    service.api_key_repo.get_by_hash_join_owner.return_value = None
+
+    assert await service.get_user_by_key(raw_key) is None
@@ -1,7 +1,16 @@
+from contextlib import asynccontextmanager
+from unittest.mock import Mock
+from uuid import uuid4
+
 import pytest
 from fastapi import status
 from httpx import AsyncClient
 
+from app.api.v1.middleware import auth_middleware
+from app.api.v1.middleware.auth_middleware import Credentials
+from app.database.models.user_model import User
+from app.services.user_service import UserService, invalidate_cached_user
+
 
 @pytest.mark.asyncio
 async def test_login_redirect(client: AsyncClient):
@@ -18,3 +27,63 @@ async def test_verify_auth_unauthorized(client: AsyncClient):
     response = await client.get("/api/v1/auth/verify")
     assert response.status_code == status.HTTP_200_OK
     assert response.json() is False
+
+
+@pytest.mark.asyncio
+async def test_verify_auth_with_bearer_api_key(client: AsyncClient, monkeypatch):
+    tokens = []
+
+    async def authenticate(token):
+        tokens.append(token)
+        return User(sub="api-key-user")
+
+    monkeypatch.setattr(Credentials, "_resolve_api_key", staticmethod(authenticate))
+
+    response = await client.get(
+        "/api/v1/auth/verify", headers={"Authorization": "Bearer cv_testkey"}
+    )
+
+    assert response.json() is True
+    assert tokens == ["cv_testkey"]
+
+
+@pytest.mark.asyncio
+async def test_user_is_not_resolved_for_routes_without_user(client: AsyncClient, monkeypatch):
+    async def authenticate(token):
+        raise AssertionError("user must not be resolved")
+
+    monkeypatch.setattr(Credentials, "_resolve_api_key", staticmethod(authenticate))
+
+    response = await client.get(
+        "/api/v1/auth/login",
+        headers={"Authorization": "Bearer cv_testkey"},
+        follow_redirects=False,
+    )
+
+    assert response.status_code == status.HTTP_307_TEMPORARY_REDIRECT
+
+
+@pytest.mark.asyncio
+async def test_changed_user_is_not_served_from_cache(monkeypatch):
+    user_id = uuid4()
+    rows = [User(id=user_id, name="Before"), User(id=user_id, name="After")]
+
+    @asynccontextmanager
+    async def session():
+        yield Mock()
+
+    async def get_user_by_id(self, id):
+        return rows[0]
+
+    monkeypatch.setattr(auth_middleware, "get_session_manager", lambda: Mock(session=session))
+    monkeypatch.setattr(UserService, "get_user_by_id", get_user_by_id)
+    credentials = Credentials(claims={"sub": str(user_id)})
+
+    assert (await credentials.resolve()).name == "Before"
+    rows.pop(0)
+    assert (await credentials.resolve()).name == "Before"
+
+    invalidate_cached_user(user_id)
+
+    assert (await credentials.resolve()).name == "After"
+    invalidate_cached_user(user_id)
@@ -0,0 +1,206 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.database.models.conversion_job_model import ConversionJob, ConversionJobStatus
+from app.database.models.entry_model import Entry, EntryStatus
+from app.database.models.mixins.timestamp_mixin import utcnow
+from app.database.models.upload_session_model import UploadSession, UploadSessionStatus
+from app.repositories.conversion_job_repository import ConversionJobRepository
+from app.services.entry_service import entry_storage_prefixes
+from app.workers import conversion_worker
+from app.workers.conversion_worker import ConversionWorker
+
+
+class FakeSessionManager:
+    @asynccontextmanager
+    async def session(self):
+        yield Mock()
+
+
+@pytest.fixture
+def repos(monkeypatch):
+    repos = SimpleNamespace(
+        jobs=AsyncMock(),
+        entries=AsyncMock(),
+        uploads=AsyncMock(),
+        users=AsyncMock(),
+    )
+    monkeypatch.setattr(conversion_worker, "get_session_manager", FakeSessionManager)
+    monkeypatch.setattr(conversion_worker, "ConversionJobRepository", lambda _: repos.jobs)
+    monkeypatch.setattr(conversion_worker, "EntryRepository", lambda _: repos.entries)
+    monkeypatch.setattr(conversion_worker, "UploadSessionRepository", lambda _: repos.uploads)
+    monkeypatch.setattr(conversion_worker, "UserRepository", lambda _: repos.users)
+    return repos
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = AsyncMock()
+    monkeypatch.setattr(conversion_worker, "get_minio_storage", lambda: storage)
+    return storage
+
+
+@pytest.fixture
+def conversion(monkeypatch):
+    process = AsyncMock(return_value=True)
+    monkeypatch.setattr(
+        conversion_worker,
+        "ProcessingService",
+        Mock(process_entry_conversion=process),
+    )
+    return process
+
+
+def queued_job(**kwargs) -> ConversionJob:
+    kwargs.setdefault("status", ConversionJobStatus.QUEUED)
+    kwargs.setdefault("attempts", 0)
+    return ConversionJob(
+        id=uuid4(),
+        entry_id=uuid4(),
+        cvsx_storage_key="uploads/a.cvsx",
+        internal_storage_key_prefix="datasets/a",
+        lattice_to_mesh=True,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_claim_next_skips_locked_jobs_and_marks_the_job_running():
+    job = queued_job()
+    session = AsyncMock()
+    session.execute.return_value.scalar_one_or_none = Mock(return_value=job)
+
+    claimed = await ConversionJobRepository(session).claim_next("worker-1")
+
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "deleted_at IS NOT NULL" in sql
+    assert claimed is job
+    assert job.status == ConversionJobStatus.RUNNING
+    assert job.attempts == 1
+    assert job.locked_by == "worker-1"
+    assert job.locked_at is not None
+
+
+@pytest.mark.asyncio
+async def test_claim_next_returns_none_when_nothing_is_queued():
+    session = AsyncMock()
+    session.execute.return_value.scalar_one_or_none = Mock(return_value=None)
+
+    assert await ConversionJobRepository(session).claim_next("worker-1") is None
+
+
+@pytest.mark.asyncio
+async def test_run_once_without_jobs_does_nothing(repos, conversion):
+    repos.jobs.claim_next.return_value = None
+
+    assert await ConversionWorker("worker-1").run_once() is False
+    conversion.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("succeeded", "status"),
+    [(True, ConversionJobStatus.COMPLETED), (False, ConversionJobStatus.FAILED)],
+)
+async def test_run_once_records_the_conversion_outcome(repos, conversion, succeeded, status):
+    job = queued_job(locked_by="worker-1", locked_at=utcnow())
+    repos.jobs.claim_next.return_value = job
+    repos.jobs.get_by_id.return_value = job
+    conversion.return_value = succeeded
+
+    assert await ConversionWorker("worker-1").run_once() is True
+
+    conversion.assert_awaited_once_with(
+        entry_id=job.entry_id,
+        cvsx_storage_key="uploads/a.cvsx",
+        internal_storage_key_prefix="datasets/a",
+        lattice_to_mesh=True,
+    )
+    assert job.status == status
+    assert job.locked_by is None
+    assert job.locked_at is None
+    assert repos.jobs.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_requeue_stale_jobs_retries_until_attempts_run_out(repos):
+    retried = queued_job(status=ConversionJobStatus.RUNNING, attempts=1, locked_by="gone")
+    exhausted = queued_job(status=ConversionJobStatus.RUNNING, attempts=3, locked_by="gone")
+    entries = {
+        retried.entry_id: Entry(id=retried.entry_id, status=EntryStatus.PROCESSING),
+        exhausted.entry_id: Entry(id=exhausted.entry_id, status=EntryStatus.PROCESSING),
+    }
+    repos.jobs.list_stale.return_value = [retried, exhausted]
+    repos.entries.get_by_id.side_effect = lambda entry_id: entries[entry_id]
+
+    await ConversionWorker("worker-1").requeue_stale_jobs()
+
+    assert retried.status == ConversionJobStatus.QUEUED
+    assert retried.locked_by is None
+    assert entries[retried.entry_id].status == EntryStatus.PENDING
+    assert exhausted.status == ConversionJobStatus.FAILED
+    assert entries[exhausted.entry_id].status == EntryStatus.FAILED
+    assert entries[exhausted.entry_id].error_message == exhausted.error_message
+    repos.jobs.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_abort_expired_uploads_keeps_uploads_storage_failed_to_abort(repos, storage):
+    aborted = UploadSession(id=uuid4(), storage_key="temp/a", upload_id="a")
+    failed = UploadSession(id=uuid4(), storage_key="temp/b", upload_id="b")
+    repos.uploads.list_expired.return_value = [aborted, failed]
+    storage.abort_multipart_upload.side_effect = [None, RuntimeError("storage down")]
+
+    await ConversionWorker("worker-1").abort_expired_uploads()
+
+    assert aborted.status == UploadSessionStatus.ABORTED
+    assert failed.status != UploadSessionStatus.ABORTED
+    repos.uploads.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_storage_usage_commits_the_repair(repos):
+    repos.users.reconcile_storage_used.return_value = 2
+
+    await ConversionWorker("worker-1").reconcile_storage_usage()
+
+    repos.users.reconcile_storage_used.assert_awaited_once()
+    repos.users.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_reap_deleted_entries_removes_files_then_rows(repos, storage):
+    entry = Entry(id=uuid4(), storage_key="datasets/a", deleted_at=utcnow())
+    repos.entries.list_deleted.return_value = [entry]
+
+    assert await ConversionWorker("worker-1").reap_deleted_entries() == 1
+
+    storage.delete_directories.assert_awaited_once_with(entry_storage_prefixes(entry))
+    repos.entries.delete_by_ids.assert_awaited_once_with([entry.id])
+    repos.entries.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_reap_deleted_entries_keeps_rows_when_storage_fails(repos, storage):
+    repos.entries.list_deleted.return_value = [Entry(id=uuid4(), storage_key="datasets/a")]
+    storage.delete_directories.side_effect = RuntimeError("storage down")
+
+    with pytest.raises(RuntimeError):
+        await ConversionWorker("worker-1").reap_deleted_entries()
+
+    repos.entries.delete_by_ids.assert_not_called()
+    repos.entries.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reap_deleted_entries_with_nothing_to_reap(repos, storage):
+    repos.entries.list_deleted.return_value = []
+
+    assert await ConversionWorker("worker-1").reap_deleted_entries() == 0
+    storage.delete_directories.assert_not_called()
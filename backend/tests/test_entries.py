@@ -1,17 +1,31 @@
+import gzip
 import os
 import sys
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
-from fastapi import status
+from cvsx2mvsx.models.internal.entry import InternalEntry
+from fastapi import HTTPException, status
+from sqlalchemy.dialects import postgresql
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app.api.v1.deps import get_required_user_from_state
+from app.api.v1.endpoints import common
+from app.core.cursor import encode_cursor
+from app.database.models.entry_model import Entry
+from app.database.models.mixins.timestamp_mixin import utcnow
+from app.database.models.model_revision_model import ModelRevision
 from app.database.models.user_model import User
 from app.main import app
+from app.repositories.entry_repository import EntryRepository
+from app.services import entry_service
 from app.services.entry_service import EntryService, get_entry_service
+from app.services.model_cache_service import ModelCache, StoredDocument, StoredModel
+from app.services.processing_service import ProcessingService, get_processing_service
+from app.services.storage_service import StorageService
+from app.services.user_service import get_user_cache
 
 # Mock User
 mock_user = User(
@@ -39,7 +53,7 @@ async def test_list_user_entries_mocked(client, override_deps):
     """
     Test listing entries with a mocked service.
     """
-    mock_entry_service.list_user_entries.return_value = ([], 0)
+    mock_entry_service.list_user_entries.return_value = ([], 0, None)
 
     response = await client.get("/api/v1/entries")
 
@@ -51,3 +65,435 @@ async def test_list_user_entries_mocked(client, override_deps):
     mock_entry_service.list_user_entries.assert_called_once()
     call_args = mock_entry_service.list_user_entries.call_args
     assert call_args.kwargs["user_id"] == mock_user.id
+
+
+@pytest.mark.asyncio
+async def test_download_presigned_returns_url(client, override_deps, monkeypatch):
+    entry = Entry(id=uuid4(), name="Entry", storage_key="user/entry")
+    mock_entry_service.get_entry_by_id.return_value = entry
+    mock_processing_service = AsyncMock(spec=ProcessingService)
+    mock_processing_service.get_shared_export.return_value = "exports/key.mvsx"
+    app.dependency_overrides[get_processing_service] = lambda: mock_processing_service
+
+    mock_storage = Mock(spec=StorageService)
+    mock_storage.presigned_get_url.return_value = "http://storage/exports/key.mvsx?sig"
+    monkeypatch.setattr(common, "get_minio_storage", lambda: mock_storage)
+
+    response = await client.get(f"/api/v1/entries/{entry.id}/download?presigned=true")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["url"] == "http://storage/exports/key.mvsx?sig"
+    mock_processing_service.get_export.assert_not_called()
+    kwargs = mock_storage.presigned_get_url.call_args.kwargs
+    assert kwargs["object_name"] == "exports/key.mvsx"
+    assert kwargs["response_headers"]["response-content-disposition"] == (
+        'attachment; filename="Entry.mvsx"'
+    )
+
+
+@pytest.mark.asyncio
+async def test_patch_model_accepts_json_patch(client, override_deps):
+    entry_id = uuid4()
+    model = InternalEntry(name="x", assets_directory="assets", timeframes=[])
+    mock_entry_service.patch_internal_model.return_value = StoredModel(
+        model=model, etag="abc", data=b"", encoding="identity", size=0
+    )
+
+    response = await client.patch(
+        f"/api/v1/entries/{entry_id}/model",
+        json=[
+            {"op": "replace", "path": "/name", "value": "x"},
+            {"op": "add", "path": "/description", "value": None},
+            {"op": "move", "from": "/a", "path": "/b"},
+        ],
+        headers={"Content-Type": "application/json-patch+json"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "x"
+    assert response.headers["ETag"] == '"abc"'
+    assert mock_entry_service.patch_internal_model.call_args.kwargs["patch"] == [
+        {"op": "replace", "path": "/name", "value": "x"},
+        {"op": "add", "path": "/description", "value": None},
+        {"op": "move", "from": "/a", "path": "/b"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_model_serves_stored_encoding(client, override_deps):
+    document = b'{"name":"x","assets_directory":"assets","timeframes":[]}'
+    mock_entry_service.get_internal_model_document.return_value = StoredDocument(
+        etag="abc",
+        data=gzip.compress(document),
+        encoding="gzip",
+    )
+
+    compressed = await client.get(
+        f"/api/v1/entries/{uuid4()}/model", headers={"Accept-Encoding": "gzip"}
+    )
+    plain = await client.get(
+        f"/api/v1/entries/{uuid4()}/model", headers={"Accept-Encoding": "identity"}
+    )
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.content == document
+    assert "Content-Encoding" not in plain.headers
+    assert plain.content == document
+    assert plain.headers["ETag"] == '"abc"'
+
+
+@pytest.mark.asyncio
+async def test_document_reads_fill_the_model_cache(monkeypatch):
+    document = b'{"name":"x","assets_directory":"assets","timeframes":[]}'
+    entry = Entry(id=uuid4(), name="Entry", storage_key="datasets/entry", model_revision=2)
+    cache = ModelCache(max_bytes=10**6)
+    monkeypatch.setattr(entry_service, "get_model_cache", lambda: cache)
+    service = EntryService(session=Mock())
+    service.get_entry_by_id = AsyncMock(return_value=entry)
+    service.storage = AsyncMock(spec=StorageService)
+    service.storage.get.return_value = gzip.compress(document)
+
+    first = await service.get_internal_model_document(entry_id=entry.id, user=mock_user)
+    second = await service.get_internal_model_document(entry_id=entry.id, user=mock_user)
+    stored = await service._load_internal_model(entry)
+
+    assert second is first
+    assert stored.model.name == "x"
+    assert cache.get("datasets/entry/internal.json", "2") is stored
+    service.storage.get.assert_awaited_once_with(f"revisions/{entry.id}/2.json")
+
+
+def model_writing_service(monkeypatch, entry: Entry, events: list[str]) -> EntryService:
+    cache = ModelCache(max_bytes=10**6)
+    monkeypatch.setattr(entry_service, "get_model_cache", lambda: cache)
+    service = EntryService(session=Mock())
+    service.get_entry_by_id = AsyncMock(return_value=entry)
+    service.entry_repo = AsyncMock()
+    service.entry_repo.commit.side_effect = lambda: events.append("commit")
+    service.model_revision_repo = Mock()
+    service.storage = AsyncMock(spec=StorageService)
+    service.storage.put_bytes.side_effect = lambda object_name, **kwargs: events.append(object_name)
+    service.storage.run = AsyncMock(side_effect=lambda func, *args: events.append("exports"))
+    service._load_internal_model = AsyncMock(
+        return_value=StoredModel(
+            model=InternalEntry(name="x", assets_directory="assets", timeframes=[]),
+            etag=str(entry.model_revision),
+            data=b"{}",
+            encoding="identity",
+            size=0,
+        )
+    )
+    return service
+
+
+@pytest.mark.asyncio
+async def test_model_update_repoints_internal_json_after_commit(monkeypatch):
+    events: list[str] = []
+    entry = Entry(id=uuid4(), storage_key="datasets/entry", model_revision=3)
+    service = model_writing_service(monkeypatch, entry, events)
+    model = InternalEntry(name="y", assets_directory="assets", timeframes=[])
+
+    stored = await service.update_internal_model(
+        entry_id=entry.id, user=mock_user, model=model, if_match='"3"'
+    )
+
+    assert stored.etag == "4"
+    assert entry_service.get_model_cache().get("datasets/entry/internal.json", "4") is stored
+    assert events == [
+        f"revisions/{entry.id}/4.json",
+        "commit",
+        "datasets/entry/internal.json",
+        "exports",
+    ]
+    service.storage.delete.assert_awaited_once_with(f"revisions/{entry.id}/2.json")
+
+
+@pytest.mark.asyncio
+async def test_failed_model_commit_leaves_current_model_in_place(monkeypatch):
+    events: list[str] = []
+    entry = Entry(id=uuid4(), storage_key="datasets/entry", model_revision=3)
+    service = model_writing_service(monkeypatch, entry, events)
+    service.entry_repo.commit.side_effect = RuntimeError("connection lost")
+    model = InternalEntry(name="y", assets_directory="assets", timeframes=[])
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.update_internal_model(entry_id=entry.id, user=mock_user, model=model)
+
+    assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert events == [f"revisions/{entry.id}/4.json"]
+    assert entry_service.get_model_cache().get("datasets/entry/internal.json", "4") is None
+
+
+@pytest.mark.asyncio
+async def test_model_update_rejects_stale_if_match(monkeypatch):
+    events: list[str] = []
+    entry = Entry(id=uuid4(), storage_key="datasets/entry", model_revision=3)
+    service = model_writing_service(monkeypatch, entry, events)
+    model = InternalEntry(name="y", assets_directory="assets", timeframes=[])
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.update_internal_model(
+            entry_id=entry.id, user=mock_user, model=model, if_match='"2"'
+        )
+
+    assert exc_info.value.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert exc_info.value.headers["ETag"] == '"3"'
+    service.entry_repo.lock.assert_awaited_once_with(entry)
+    assert events == []
+
+
+@pytest.mark.asyncio
+async def test_model_changes_since_revision(client, override_deps):
+    patch = [{"op": "replace", "path": "/name", "value": "y"}]
+    mock_entry_service.get_model_changes.return_value = (
+        3,
+        [ModelRevision(revision=3, patch=patch, author_id=mock_user.id, created_at=utcnow())],
+    )
+
+    response = await client.get(f"/api/v1/entries/{uuid4()}/model/changes?since=2")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] == '"3"'
+    data = response.json()
+    assert data["revision"] == 3
+    assert [change["patch"] for change in data["changes"]] == [patch]
+    assert mock_entry_service.get_model_changes.call_args.kwargs["since"] == 2
+
+
+@pytest.mark.asyncio
+async def test_list_user_entries_with_cursor(client, override_deps):
+    mock_entry_service.list_user_entries.return_value = ([], None, "next")
+
+    response = await client.get("/api/v1/entries?cursor=abc&include_total=false")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["next_cursor"] == "next"
+    assert data["total_items"] is None
+    assert data["total_pages"] is None
+    call_args = mock_entry_service.list_user_entries.call_args
+    assert call_args.kwargs["cursor"] == "abc"
+    assert call_args.kwargs["include_total"] is False
+
+
+def test_entry_cursor_round_trip():
+    entry_id = uuid4()
+    created_at = utcnow()
+    cursor = encode_cursor(["created_at", "desc", created_at, str(entry_id)])
+
+    assert EntryService._decode_entry_cursor(cursor, "created_at", "desc") == (
+        created_at,
+        entry_id,
+    )
+    with pytest.raises(HTTPException):
+        EntryService._decode_entry_cursor(cursor, "name", "desc")
+    with pytest.raises(HTTPException):
+        EntryService._decode_entry_cursor("not a cursor", "created_at", "desc")
+
+
+@pytest.mark.asyncio
+async def test_quota_check_reads_maintained_usage_counter():
+    service = EntryService(session=Mock())
+    service.user_repo = AsyncMock()
+    service.user_repo.get_storage_used.return_value = 900
+    service.upload_session_repo = AsyncMock()
+    service.upload_session_repo.get_reserved_size.return_value = 50
+
+    await service._check_upload_size(mock_user, 50)
+    with pytest.raises(HTTPException) as exc_info:
+        await service._check_upload_size(mock_user, 51)
+
+    assert exc_info.value.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    service.user_repo.get_storage_used.assert_awaited_with(mock_user.id)
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_entries(client, override_deps):
+    entry_ids = [uuid4(), uuid4()]
+    mock_entry_service.delete_entries.reset_mock()
+
+    response = await client.post(
+        "/api/v1/entries/bulk/delete",
+        json={"ids": [str(entry_id) for entry_id in entry_ids]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    mock_entry_service.delete_entries.assert_awaited_once_with(entry_ids=entry_ids, user=mock_user)
+
+
+@pytest.mark.asyncio
+async def test_bulk_request_rejects_too_many_ids(client, override_deps):
+    response = await client.post(
+        "/api/v1/entries/bulk/fetch",
+        json={"ids": [str(uuid4()) for _ in range(101)]},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_bulk_entries_must_all_exist_and_be_owned():
+    owned = Entry(id=uuid4(), name="Owned", storage_key="datasets/owned", owner_id=mock_user.id)
+    foreign = Entry(id=uuid4(), name="Foreign", storage_key="datasets/foreign", owner_id=uuid4())
+    service = EntryService(session=Mock())
+    service.entry_repo = AsyncMock()
+
+    service.entry_repo.list_by_ids.return_value = [owned]
+    entries = await service.get_entries_by_ids(entry_ids=[owned.id, owned.id], user=mock_user)
+    assert entries == [owned]
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.get_entries_by_ids(entry_ids=[owned.id, uuid4()], user=mock_user)
+    assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+
+    service.entry_repo.list_by_ids.return_value = [owned, foreign]
+    with pytest.raises(HTTPException) as exc_info:
+        await service.get_entries_by_ids(entry_ids=[owned.id, foreign.id], user=mock_user)
+    assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_delete_entry_marks_it_deleted_and_frees_quota():
+    entry = Entry(id=uuid4(), name="Entry", storage_key="datasets/entry", size_bytes=300)
+    service = EntryService(session=Mock())
+    service.get_entry_by_id = AsyncMock(return_value=entry)
+    service.entry_repo = AsyncMock()
+    service.entry_repo.mark_deleted.return_value = 300
+    service.user_repo = AsyncMock()
+    service.storage = Mock(spec=StorageService)
+    service.storage.run = AsyncMock()
+
+    await service.delete_entry(entry_id=entry.id, user=mock_user)
+
+    service.entry_repo.mark_deleted.assert_awaited_once()
+    assert service.entry_repo.mark_deleted.call_args.args[0] == [entry.id]
+    service.user_repo.add_storage_used.assert_awaited_once_with(mock_user.id, -300)
+    service.entry_repo.commit.assert_awaited_once()
+    service.storage.delete_directories.assert_not_called()
+
+
+class DeletingEntryRepo:
+    """Marks entries deleted the way the guarded UPDATE in `mark_deleted` does."""
+
+    def __init__(self, *entries: Entry):
+        self.entries = {entry.id: entry for entry in entries}
+        self.marked: list[list] = []
+
+    async def list_by_ids(self, entry_ids) -> list[Entry]:
+        return [self.entries[entry_id] for entry_id in entry_ids]
+
+    async def mark_deleted(self, entry_ids, deleted_at) -> int:
+        self.marked.append(list(entry_ids))
+        freed = 0
+        for entry_id in set(entry_ids):
+            entry = self.entries[entry_id]
+            if entry.deleted_at is None:
+                entry.deleted_at = deleted_at
+                freed += entry.size_bytes
+        return freed
+
+    async def commit(self) -> None:
+        pass
+
+
+class UsageUserRepo:
+    def __init__(self, storage_used: int):
+        self.storage_used = storage_used
+
+    async def add_storage_used(self, user_id, delta: int) -> None:
+        self.storage_used += delta
+
+
+def deleting_service(*entries: Entry, storage_used: int) -> EntryService:
+    service = EntryService(session=Mock())
+    service.entry_repo = DeletingEntryRepo(*entries)
+    service.user_repo = UsageUserRepo(storage_used)
+    service.storage = Mock(spec=StorageService)
+    service.storage.run = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_mark_deleted_only_frees_live_entries():
+    session = AsyncMock()
+    session.execute.return_value.scalars = Mock(return_value=Mock(all=Mock(return_value=[1, 2])))
+
+    freed = await EntryRepository(session).mark_deleted([uuid4()], utcnow())
+
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert freed == 3
+    assert "entries.deleted_at IS NULL" in sql
+    assert "RETURNING entries.size_bytes" in sql
+
+
+@pytest.mark.asyncio
+async def test_deleting_an_entry_twice_frees_its_size_once():
+    entry = Entry(id=uuid4(), name="Entry", storage_key="datasets/entry", size_bytes=300)
+    service = deleting_service(entry, storage_used=500)
+    # both requests load the entry before either marks it deleted
+    service.get_entry_by_id = AsyncMock(return_value=entry)
+
+    await service.delete_entry(entry_id=entry.id, user=mock_user)
+    await service.delete_entry(entry_id=entry.id, user=mock_user)
+
+    assert entry.deleted_at is not None
+    assert service.user_repo.storage_used == 200
+
+
+@pytest.mark.asyncio
+async def test_delete_entry_drops_the_cached_user():
+    entry = Entry(id=uuid4(), name="Entry", storage_key="datasets/entry", size_bytes=300)
+    service = deleting_service(entry, storage_used=500)
+    service.get_entry_by_id = AsyncMock(return_value=entry)
+    get_user_cache().put(str(mock_user.id), mock_user)
+
+    await service.delete_entry(entry_id=entry.id, user=mock_user)
+
+    assert get_user_cache().get(str(mock_user.id)) is None
+
+
+@pytest.mark.asyncio
+async def test_overlapping_bulk_and_single_deletes_free_each_entry_once():
+    first = Entry(id=uuid4(), name="First", storage_key="datasets/a", size_bytes=300)
+    second = Entry(id=uuid4(), name="Second", storage_key="datasets/b", size_bytes=100)
+    for entry in (first, second):
+        entry.owner_id = mock_user.id
+    service = deleting_service(first, second, storage_used=1000)
+    service.get_entry_by_id = AsyncMock(return_value=first)
+
+    load_entries = service.entry_repo.list_by_ids
+
+    async def load_then_delete_first(entry_ids):
+        # the single delete commits after the bulk delete loaded its entries
+        entries = await load_entries(entry_ids)
+        await service.delete_entry(entry_id=first.id, user=mock_user)
+        return entries
+
+    service.entry_repo.list_by_ids = load_then_delete_first
+
+    await service.delete_entries(entry_ids=[first.id, first.id, second.id], user=mock_user)
+
+    assert service.entry_repo.marked[-1] == [first.id, second.id]
+    assert service.user_repo.storage_used == 600
+
+
+@pytest.mark.asyncio
+async def test_get_asset_url_presigns_entry_object(client, override_deps, monkeypatch):
+    entry = Entry(id=uuid4(), name="Entry", storage_key="datasets/entry", owner_id=mock_user.id)
+    service = EntryService(session=Mock())
+    service.get_entry_by_id = AsyncMock(return_value=entry)
+    service.storage = AsyncMock(spec=StorageService)
+    service.storage.exists.return_value = True
+    app.dependency_overrides[get_entry_service] = lambda: service
+
+    mock_storage = Mock(spec=StorageService)
+    mock_storage.presigned_get_url.return_value = "http://storage/datasets/entry/internal.json"
+    monkeypatch.setattr(common, "get_minio_storage", lambda: mock_storage)
+
+    response = await client.get(f"/api/v1/entries/{entry.id}/assets/internal.json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["url"] == "http://storage/datasets/entry/internal.json"
+    service.storage.exists.assert_awaited_once_with("datasets/entry/internal.json")
+    kwargs = mock_storage.presigned_get_url.call_args.kwargs
+    assert kwargs["object_name"] == "datasets/entry/internal.json"
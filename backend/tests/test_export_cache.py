@@ -0,0 +1,67 @@
+from uuid import uuid4
+
+from app.services.export_cache_service import ExportCache
+
+
+def write_export(directory, name: str, size: int) -> str:
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_make_key_depends_on_model_and_format():
+    entry_id = uuid4()
+
+    key = ExportCache.make_key(entry_id, b'{"timeframes": []}', "mvsx")
+
+    assert key.startswith(f"{entry_id}/")
+    assert key.endswith(".mvsx")
+    assert key == ExportCache.make_key(entry_id, b'{"timeframes": []}', "mvsx")
+    assert key != ExportCache.make_key(entry_id, b'{"timeframes": [1]}', "mvsx")
+
+    story_key = ExportCache.make_key(entry_id, b'{"timeframes": []}', "mvstory")
+    assert story_key.endswith(".mvstory")
+    assert story_key.split(".")[0] != key.split(".")[0]
+
+
+def test_local_tier_evicts_least_recently_used(tmp_path):
+    cache = ExportCache(cache_dir=str(tmp_path / "cache"), max_bytes=250, shared=False)
+    entry_id = uuid4()
+    keys = [f"{entry_id}/{name}.mvsx" for name in ("a", "b", "c")]
+
+    cache.put_local(keys[0], write_export(tmp_path, "a", 100))
+    cache.put_local(keys[1], write_export(tmp_path, "b", 100))
+    assert cache.get_local(keys[0]) is not None
+
+    cache.put_local(keys[2], write_export(tmp_path, "c", 100))
+
+    assert cache.get_local(keys[0]) is not None
+    assert cache.get_local(keys[1]) is None
+    assert cache.get_local(keys[2]) is not None
+    assert cache.size == 200
+
+
+def test_invalidate_drops_entry_exports(tmp_path):
+    cache = ExportCache(cache_dir=str(tmp_path / "cache"), max_bytes=1000, shared=False)
+    entry_id, other_id = uuid4(), uuid4()
+
+    cache.put_local(f"{entry_id}/a.mvsx", write_export(tmp_path, "a", 10))
+    cache.put_local(f"{other_id}/b.mvsx", write_export(tmp_path, "b", 10))
+
+    cache.invalidate(entry_id)
+
+    assert cache.get_local(f"{entry_id}/a.mvsx") is None
+    assert cache.get_local(f"{other_id}/b.mvsx") is not None
+
+
+def test_existing_files_are_indexed_on_startup(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    key = f"{uuid4()}/a.mvstory"
+    ExportCache(cache_dir=cache_dir, max_bytes=1000, shared=False).put_local(
+        key, write_export(tmp_path, "a", 10)
+    )
+
+    cache = ExportCache(cache_dir=cache_dir, max_bytes=1000, shared=False)
+
+    assert cache.get_local(key) is not None
+    assert cache.size == 10
@@ -0,0 +1,46 @@
+import io
+import os
+from types import SimpleNamespace
+from zipfile import ZipFile
+
+import pytest
+
+from app.services.processing_service import stream_mvsx_archive
+
+
+def make_mvsx_entry(asset_dir) -> SimpleNamespace:
+    (asset_dir / "volumes").mkdir()
+    (asset_dir / "volumes" / "0_0.bcif").write_bytes(os.urandom(64 * 1024))
+    (asset_dir / "mesh.json").write_text('{"vertices": []}')
+    return SimpleNamespace(
+        states=SimpleNamespace(model_dump_json=lambda **kwargs: '{"kind": "multiple"}'),
+        asset_dir=str(asset_dir),
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_mvsx_archive_produces_valid_zip(tmp_path):
+    mvsx_entry = make_mvsx_entry(tmp_path)
+
+    chunks = [
+        chunk
+        async for chunk in stream_mvsx_archive(mvsx_entry, compression_level=6, chunk_size=4096)
+    ]
+
+    assert len(chunks) > 1
+    with ZipFile(io.BytesIO(b"".join(chunks))) as z:
+        assert z.namelist()[0] == "index.mvsj"
+        assert z.read("index.mvsj") == b'{"kind": "multiple"}'
+        assert z.read("volumes/0_0.bcif") == (tmp_path / "volumes" / "0_0.bcif").read_bytes()
+        assert z.read("mesh.json") == b'{"vertices": []}'
+
+
+@pytest.mark.asyncio
+async def test_stream_mvsx_archive_stops_producer_when_closed_early(tmp_path):
+    mvsx_entry = make_mvsx_entry(tmp_path)
+    stream = stream_mvsx_archive(mvsx_entry, compression_level=0, chunk_size=1024)
+
+    first = await anext(stream)
+    await stream.aclose()
+
+    assert first.startswith(b"PK")
@@ -0,0 +1,108 @@
+import copy
+
+import pytest
+
+from app.core.json_patch import (
+    JsonPatchConflict,
+    JsonPatchError,
+    apply_json_patch,
+    apply_merge_patch,
+    diff_json,
+)
+
+
+def test_json_patch_operations():
+    document = {"name": "entry", "timeframes": [{"id": 0}, {"id": 2}], "details": None}
+
+    result = apply_json_patch(
+        document,
+        [
+            {"op": "test", "path": "/name", "value": "entry"},
+            {"op": "add", "path": "/timeframes/1", "value": {"id": 1}},
+            {"op": "add", "path": "/timeframes/-", "value": {"id": 3}},
+            {"op": "replace", "path": "/name", "value": "renamed"},
+            {"op": "copy", "from": "/timeframes/0", "path": "/first"},
+            {"op": "move", "from": "/first", "path": "/details"},
+            {"op": "remove", "path": "/timeframes/3"},
+        ],
+    )
+
+    assert result == {
+        "name": "renamed",
+        "timeframes": [{"id": 0}, {"id": 1}, {"id": 2}],
+        "details": {"id": 0},
+    }
+
+
+def test_json_patch_escaped_pointer():
+    result = apply_json_patch(
+        {"a/b": {"m~n": 1}},
+        [{"op": "replace", "path": "/a~1b/m~0n", "value": 2}],
+    )
+
+    assert result == {"a/b": {"m~n": 2}}
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "test", "path": "/count", "value": True},
+        {"op": "remove", "path": "/missing"},
+        {"op": "replace", "path": "/items/5", "value": 0},
+        {"op": "add", "path": "/items/01", "value": 0},
+        {"op": "move", "from": "/items", "path": "/items/0"},
+    ],
+)
+def test_json_patch_conflicts(operation):
+    with pytest.raises(JsonPatchConflict):
+        apply_json_patch({"count": 1, "items": [1]}, [operation])
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "add", "path": "/a"},
+        {"op": "move", "path": "/a"},
+        {"op": "rename", "path": "/a"},
+        {"op": "remove", "path": "a"},
+    ],
+)
+def test_json_patch_malformed_operations(operation):
+    with pytest.raises(JsonPatchError):
+        apply_json_patch({"a": 1}, [operation])
+
+
+def test_merge_patch():
+    document = {"title": "Goodbye!", "author": {"givenName": "John", "familyName": "Doe"}}
+
+    result = apply_merge_patch(
+        document,
+        {"title": "Hello!", "author": {"familyName": None}, "tags": ["example"]},
+    )
+
+    assert result == {"title": "Hello!", "author": {"givenName": "John"}, "tags": ["example"]}
+
+
+@pytest.mark.parametrize(
+    "target",
+    [
+        {"name": "entry", "items": [1, 2, 3], "a/b": {"m~n": 1}},
+        {"name": "renamed", "items": [1, 2, 3, 4], "a/b": {"m~n": 2}, "added": None},
+        {"name": "entry", "items": [1], "a/b": {}},
+        {"items": [3, 2]},
+        [],
+    ],
+)
+def test_diff_round_trip(target):
+    source = {"name": "entry", "items": [1, 2, 3], "a/b": {"m~n": 1}}
+
+    patch = diff_json(source, target)
+
+    assert apply_json_patch(copy.deepcopy(source), patch) == target
+    assert (patch == []) == (source == target)
+
+
+def test_diff_is_minimal_for_appends():
+    patch = diff_json({"items": [{"id": 0}]}, {"items": [{"id": 0}, {"id": 1}]})
+
+    assert patch == [{"op": "add", "path": "/items/-", "value": {"id": 1}}]
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+from minio import Minio
+from minio.datatypes import Part
+
+from app.services.minio_multipart import MinioMultipart
+
+S3_NS = 'xmlns="http://s3.amazonaws.com/doc/2006-03-01/"'
+
+
+class RecordingMinio(Minio):
+    """The pinned minio client, with requests recorded and answered in place of S3."""
+
+    def __init__(self, responses: dict[str, bytes]):
+        super().__init__("storage:9000", "access", "secret", secure=False, region="us-east-1")
+        self.responses = responses
+        self.requests: list[tuple[str, str, dict]] = []
+
+    def _execute(self, method, bucket_name, object_name=None, query_params=None, **kwargs):
+        self.requests.append((method, object_name, dict(query_params or {})))
+        return SimpleNamespace(
+            data=self.responses.get(method, b""),
+            headers={"etag": '"part-etag"', "x-amz-version-id": None},
+        )
+
+
+@pytest.fixture
+def client():
+    return RecordingMinio(
+        {
+            "POST": (
+                f"<InitiateMultipartUploadResult {S3_NS}><UploadId>upload-1</UploadId>"
+                "</InitiateMultipartUploadResult>"
+            ).encode(),
+            "GET": (
+                f"<ListPartsResult {S3_NS}><IsTruncated>false</IsTruncated>"
+                '<Part><PartNumber>1</PartNumber><ETag>"part-etag"</ETag><Size>5</Size>'
+                "<LastModified>2025-01-01T00:00:00.000Z</LastModified></Part>"
+                "</ListPartsResult>"
+            ).encode(),
+        }
+    )
+
+
+def test_create_returns_upload_id(client):
+    upload_id = MinioMultipart(client).create("bucket", "temp/a.cvsx", "application/zip")
+
+    assert upload_id == "upload-1"
+    assert client.requests == [("POST", "temp/a.cvsx", {"uploads": ""})]
+
+
+def test_list_parts_parses_parts(client):
+    result = MinioMultipart(client).list_parts("bucket", "temp/a.cvsx", "upload-1")
+
+    assert not result.is_truncated
+    assert [(part.part_number, part.etag, part.size) for part in result.parts] == [
+        (1, "part-etag", 5)
+    ]
+    assert client.requests[-1][2]["uploadId"] == "upload-1"
+
+
+def test_complete_and_abort(client):
+    client.responses["POST"] = (
+        f"<CompleteMultipartUploadResult {S3_NS}><Bucket>bucket</Bucket>"
+        '<Key>temp/a.cvsx</Key><ETag>"object-etag"</ETag></CompleteMultipartUploadResult>'
+    ).encode()
+    multipart = MinioMultipart(client)
+
+    multipart.complete("bucket", "temp/a.cvsx", "upload-1", [Part(1, "part-etag")])
+    multipart.abort("bucket", "temp/a.cvsx", "upload-1")
+
+    assert client.requests == [
+        ("POST", "temp/a.cvsx", {"uploadId": "upload-1"}),
+        ("DELETE", "temp/a.cvsx", {"uploadId": "upload-1"}),
+    ]
@@ -0,0 +1,74 @@
+from app.core.model_codec import decode_model, encode_model
+from app.services.model_cache_service import (
+    MODEL_BYTES_PER_DOCUMENT_BYTE,
+    ModelCache,
+    StoredDocument,
+    StoredModel,
+    etag_matches,
+    stored_model_size,
+)
+
+
+def stored(etag: str, size: int) -> StoredModel:
+    return StoredModel(model=object(), etag=etag, data=b"", encoding="identity", size=size)
+
+
+def test_get_requires_matching_etag():
+    cache = ModelCache(max_bytes=100)
+    cache.put("datasets/a/internal.json", stored("v1", 10))
+
+    assert cache.get("datasets/a/internal.json", "v1") is not None
+    assert cache.get("datasets/a/internal.json", "v2") is None
+
+
+def test_put_replaces_version_and_evicts_least_recently_used():
+    cache = ModelCache(max_bytes=100)
+    cache.put("a", stored("v1", 40))
+    cache.put("b", stored("v1", 40))
+    cache.put("a", stored("v2", 50))
+    assert cache.size == 90
+
+    cache.get("b", "v1")
+    cache.put("c", stored("v1", 30))
+
+    assert cache.get("a", "v2") is None
+    assert cache.get("b", "v1") is not None
+    assert cache.get("c", "v1") is not None
+    assert cache.size == 70
+
+
+def test_models_larger_than_cache_are_not_stored():
+    cache = ModelCache(max_bytes=10)
+    cache.put("a", stored("v1", 11))
+
+    assert cache.get("a", "v1") is None
+    assert cache.size == 0
+
+
+def test_documents_cost_their_stored_bytes():
+    cache = ModelCache(max_bytes=100)
+    cache.put("a", StoredDocument(etag="v1", data=b"x" * 30, encoding="identity"))
+    cache.put("a", stored("v1", 60))
+
+    assert isinstance(cache.get("a", "v1"), StoredModel)
+    assert cache.size == 60
+
+
+def test_etag_matches_if_none_match_header():
+    assert etag_matches('"abc"', "abc")
+    assert etag_matches('W/"abc"', "abc")
+    assert etag_matches('"xyz", "abc"', "abc")
+    assert etag_matches("*", "abc")
+    assert not etag_matches('"xyz"', "abc")
+    assert not etag_matches(None, "abc")
+
+
+def test_stored_model_size_counts_the_validated_model():
+    document = b'{"name":"model"}'
+    model_size = MODEL_BYTES_PER_DOCUMENT_BYTE * len(document)
+
+    identity = encode_model(document, "identity")
+    assert stored_model_size(identity, decode_model(identity)) == len(document) + model_size
+
+    compressed = encode_model(document, "gzip")
+    assert stored_model_size(compressed, decode_model(compressed)) == (len(compressed) + model_size)
@@ -0,0 +1,58 @@
+import gzip
+import json
+
+import pytest
+
+from app.core.model_codec import (
+    accepts_encoding,
+    decode_model,
+    decode_model_file,
+    detect_encoding,
+    encode_model,
+    encode_model_file,
+)
+
+DOCUMENT = b'{"name":"entry","timeframes":[]}'
+
+
+def test_gzip_round_trip_is_deterministic():
+    encoded = encode_model(DOCUMENT, "gzip")
+
+    assert detect_encoding(encoded) == "gzip"
+    assert decode_model(encoded) == DOCUMENT
+    assert encode_model(DOCUMENT, "gzip") == encoded
+
+
+def test_legacy_plain_json_is_read_as_is():
+    legacy = b'{\n  "name": "entry"\n}'
+
+    assert detect_encoding(legacy) == "identity"
+    assert decode_model(legacy) == legacy
+
+
+def test_model_files_are_compacted_and_restored(tmp_path):
+    path = tmp_path / "internal.json"
+    path.write_text(json.dumps(json.loads(DOCUMENT), indent=2))
+
+    encode_model_file(str(path), "gzip")
+    assert gzip.decompress(path.read_bytes()) == DOCUMENT
+
+    decode_model_file(str(path))
+    assert path.read_bytes() == DOCUMENT
+
+
+@pytest.mark.parametrize(
+    "header, accepted",
+    [
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.8", True),
+        ("gzip;q=0", False),
+        ("*", True),
+        ("*, gzip;q=0", False),
+        ("identity", False),
+        (None, False),
+    ],
+)
+def test_accepts_encoding(header, accepted):
+    assert accepts_encoding(header, "gzip") is accepted
+    assert accepts_encoding(header, "identity") is True
@@ -1,14 +1,17 @@
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
 from fastapi import status
 
+from app.api.v1.endpoints import common
 from app.database.models.entry_model import Entry, EntryStatus
 from app.database.models.share_link_model import ShareLink
 from app.main import app
+from app.services.entry_service import EntryService, get_entry_service
 from app.services.share_link_service import ShareLinkService, get_share_link_service
+from app.services.storage_service import StorageService
 
 mock_share_service = AsyncMock(spec=ShareLinkService)
 
@@ -54,3 +57,28 @@ async def test_get_entry_by_share_link(client, override_share_deps):
     assert data["name"] == "Shared Entry"
     assert data["share_link"]["id"] == str(share_link_id)
     assert data["share_link"]["is_active"] is True
+
+
+@pytest.mark.asyncio
+async def test_get_asset_url_by_share_link(client, override_share_deps, monkeypatch):
+    share_link_id = uuid4()
+    entry = Entry(id=uuid4(), name="Shared Entry", storage_key="datasets/shared")
+    mock_share_service.get_entry_from_share_link.return_value = entry
+
+    entry_service = EntryService(session=Mock())
+    entry_service.entry_repo = AsyncMock()
+    entry_service.entry_repo.get_with_links.return_value = entry
+    entry_service.storage = AsyncMock(spec=StorageService)
+    entry_service.storage.exists.return_value = True
+    app.dependency_overrides[get_entry_service] = lambda: entry_service
+
+    mock_storage = Mock(spec=StorageService)
+    mock_storage.presigned_get_url.return_value = "http://storage/datasets/shared/meshes/0.bcif"
+    monkeypatch.setattr(common, "get_minio_storage", lambda: mock_storage)
+
+    response = await client.get(f"/api/v1/share_links/{share_link_id}/assets/meshes/0.bcif")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["url"] == "http://storage/datasets/shared/meshes/0.bcif"
+    kwargs = mock_storage.presigned_get_url.call_args.kwargs
+    assert kwargs["object_name"] == "datasets/shared/meshes/0.bcif"
@@ -0,0 +1,246 @@
+import gzip
+import io
+import threading
+import warnings
+from types import SimpleNamespace
+
+import certifi
+import httpx
+import pytest
+import urllib3
+from minio import Minio
+
+from app.core.model_codec import detect_encoding
+from app.services.storage_service import (
+    MAX_DELETE_BATCH,
+    MIN_PART_SIZE,
+    StorageService,
+    download_object,
+    download_prefix,
+    get_minio_storage,
+    guess_content_type,
+    part_size_for,
+    upload_directory,
+)
+
+
+class FakeResponse:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def read(self, decode_content: bool = True):
+        return self.data
+
+    def stream(self, chunk_size: int, decode_content: bool = True):
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i : i + chunk_size]
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+class FakeMinio:
+    def __init__(self, objects: dict[str, bytes]):
+        self.objects = objects
+        self.delete_batches: list[int] = []
+
+    def list_objects(self, bucket_name: str, prefix: str, recursive: bool):
+        return [
+            SimpleNamespace(object_name=name) for name in self.objects if name.startswith(prefix)
+        ]
+
+    def get_object(self, bucket_name: str, object_name: str):
+        self.reader_thread = threading.current_thread().name
+        return FakeResponse(self.objects[object_name])
+
+    def put_object(self, bucket_name, object_name, data, length, part_size, content_type):
+        self.objects[object_name] = (data.read(), part_size, content_type)
+
+    def remove_objects(self, bucket_name: str, delete_object_list):
+        self.delete_batches.append(len(delete_object_list))
+        return iter([])
+
+
+class GzipEncodedMinio(FakeMinio):
+    """Serves objects the way MinIO does after `put_bytes(content_encoding="gzip")`."""
+
+    def get_object(self, bucket_name: str, object_name: str):
+        return urllib3.HTTPResponse(
+            body=io.BytesIO(self.objects[object_name]),
+            headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+            status=200,
+            preload_content=False,
+        )
+
+
+def test_download_prefix_materializes_relative_paths(tmp_path):
+    client = FakeMinio(
+        {
+            "datasets/a/internal.json": b"{}",
+            "datasets/a/meshes/0.bcif": b"x" * 100,
+            "datasets/ab/other.json": b"not part of the entry",
+        }
+    )
+
+    stats = download_prefix(client, "datasets/a", str(tmp_path), concurrency=2, chunk_size=16)
+
+    assert stats.objects == 2
+    assert stats.bytes == 102
+    assert (tmp_path / "internal.json").read_bytes() == b"{}"
+    assert (tmp_path / "meshes" / "0.bcif").read_bytes() == b"x" * 100
+    assert not (tmp_path / "other.json").exists()
+
+
+def test_upload_directory_sets_content_types(tmp_path):
+    (tmp_path / "volumes").mkdir()
+    (tmp_path / "internal.json").write_bytes(b"{}")
+    (tmp_path / "volumes" / "0_0.bcif").write_bytes(b"\x00" * 10)
+    (tmp_path / "input.cvsx").write_bytes(b"raw")
+    client = FakeMinio({})
+
+    stats = upload_directory(client, str(tmp_path), "datasets/a/", exclude={"input.cvsx"})
+
+    assert stats.objects == 2
+    assert stats.bytes == 12
+    assert client.objects["datasets/a/internal.json"] == (b"{}", MIN_PART_SIZE, "application/json")
+    assert client.objects["datasets/a/volumes/0_0.bcif"][2] == "application/octet-stream"
+    assert "datasets/a/input.cvsx" not in client.objects
+
+
+def test_part_size_for():
+    mebibyte = 1024 * 1024
+
+    assert part_size_for(1) == MIN_PART_SIZE
+    assert part_size_for(40 * mebibyte + 1) == 41 * mebibyte
+    assert part_size_for(1024 * mebibyte) == 16 * mebibyte
+    assert part_size_for(500 * 1024 * mebibyte) * 10_000 >= 500 * 1024 * mebibyte
+
+
+def test_guess_content_type():
+    assert guess_content_type("segmentations/mesh/0_0_1.json") == "application/json"
+    assert guess_content_type("export.MVSX") == "application/zip"
+    assert guess_content_type("preview.png") == "image/png"
+    assert guess_content_type("unknown.xyz123") == "application/octet-stream"
+
+
+@pytest.mark.asyncio
+async def test_storage_service_runs_client_calls_off_the_event_loop():
+    client = FakeMinio({"datasets/a/internal.json": b"{}"})
+    storage = StorageService(client=client, bucket="test", max_workers=2)
+
+    data = await storage.get("datasets/a/internal.json")
+
+    assert data == b"{}"
+    assert client.reader_thread.startswith("storage")
+
+
+@pytest.mark.asyncio
+async def test_delete_directories_batches_multi_object_deletes():
+    objects = {f"datasets/a/volumes/{i}.bcif": b"" for i in range(2 * MAX_DELETE_BATCH)}
+    objects.update({f"revisions/a/{i}.json": b"" for i in range(500)})
+    objects["datasets/b/internal.json"] = b"{}"
+    client = FakeMinio(objects)
+    storage = StorageService(client=client, bucket="test", max_workers=2)
+
+    removed = await storage.delete_directories(["datasets/a/", "revisions/a/"])
+
+    assert removed == 2 * MAX_DELETE_BATCH + 500
+    assert client.delete_batches == [MAX_DELETE_BATCH, MAX_DELETE_BATCH, 500]
+
+
+@pytest.mark.asyncio
+async def test_encoded_objects_are_read_as_stored(tmp_path):
+    document = b'{"name":"model"}'
+    stored = gzip.compress(document, mtime=0)
+    client = GzipEncodedMinio({"datasets/a/internal.json": stored})
+    storage = StorageService(client=client, bucket="test", max_workers=1)
+
+    # urllib3 decodes by default, which would defeat serving the stored bytes as-is
+    assert client.get_object("test", "datasets/a/internal.json").read() == document
+
+    data = await storage.get("datasets/a/internal.json")
+    assert data == stored
+    assert detect_encoding(data) == "gzip"
+
+    size = download_object(client, "datasets/a/internal.json", str(tmp_path / "internal.json"))
+    assert size == len(stored)
+    assert (tmp_path / "internal.json").read_bytes() == stored
+
+
+async def gen_chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_upload_part_streams_chunks_to_presigned_url():
+    requests: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await request.aread()
+        return httpx.Response(200, headers={"ETag": '"part-etag"'})
+
+    storage = StorageService(
+        client=Minio("storage:9000", "access", "secret", secure=False, region="us-east-1"),
+        bucket="test",
+        max_workers=1,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    etag = await storage.upload_part("temp/a.cvsx", "upload-1", 3, gen_chunks(b"ab", b"cd"), 4)
+
+    [request] = requests
+    assert etag == "part-etag"
+    assert request.method == "PUT"
+    assert request.url.path == "/test/temp/a.cvsx"
+    assert request.url.params["uploadId"] == "upload-1"
+    assert request.url.params["partNumber"] == "3"
+    assert request.headers["Content-Length"] == "4"
+    assert "Transfer-Encoding" not in request.headers
+    assert request.content == b"abcd"
+
+
+@pytest.mark.asyncio
+async def test_upload_part_reports_missing_upload():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        return httpx.Response(404, text="<Error><Code>NoSuchUpload</Code></Error>")
+
+    storage = StorageService(
+        client=Minio("storage:9000", "access", "secret", secure=False, region="us-east-1"),
+        bucket="test",
+        max_workers=1,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    with pytest.raises(FileNotFoundError):
+        await storage.upload_part("temp/a.cvsx", "upload-1", 1, gen_chunks(b"ab"), 2)
+
+
+@pytest.mark.asyncio
+async def test_close_releases_http_client_and_executor():
+    storage = StorageService(
+        client=FakeMinio({}),
+        bucket="test",
+        max_workers=1,
+        http_client=httpx.AsyncClient(),
+    )
+
+    await storage.close()
+
+    assert storage.http_client.is_closed
+    with pytest.raises(RuntimeError):
+        await storage.run(lambda: None)
+
+
+def test_storage_client_uses_an_ssl_context_for_custom_cas(monkeypatch):
+    get_minio_storage.cache_clear()
+    monkeypatch.setenv("SSL_CERT_FILE", certifi.where())
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        get_minio_storage()
+    get_minio_storage.cache_clear()
@@ -0,0 +1,44 @@
+from app.core.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache[str, int](ttl=10, max_entries=10, clock=clock)
+    cache.put("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used_and_invalidates():
+    cache = TTLCache[str, int](ttl=10, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+
+
+def test_zero_ttl_disables_cache():
+    cache = TTLCache[str, int](ttl=0, max_entries=10)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
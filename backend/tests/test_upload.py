@@ -1,13 +1,15 @@
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
-from fastapi import status
+from fastapi import HTTPException, status
+from minio.datatypes import Part
 
 from app.api.v1.deps import get_required_user_from_state
 from app.database.models.entry_model import Entry, EntryStatus
 from app.database.models.share_link_model import ShareLink
+from app.database.models.upload_session_model import UploadSession
 from app.database.models.user_model import User
 from app.main import app
 from app.services.entry_service import EntryService, get_entry_service
@@ -70,3 +72,143 @@ async def test_upload_cvsx_success(client, override_upload_deps):
 
     # Verify the service was called
     mock_entry_service.create_entry.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_initiate_upload_returns_part_urls(client, override_upload_deps):
+    upload_session = UploadSession(
+        id=uuid4(),
+        filename="large.cvsx",
+        size_bytes=40 * 1024 * 1024,
+        part_size=16 * 1024 * 1024,
+        expires_at=datetime.now(timezone.utc),
+    )
+    part_urls = [f"http://storage/temp/large.cvsx?partNumber={n}" for n in (1, 2, 3)]
+    mock_entry_service.initiate_upload.return_value = (upload_session, part_urls)
+
+    response = await client.post(
+        "/api/v1/entries/uploads",
+        json={"filename": "large.cvsx", "size_bytes": upload_session.size_bytes},
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert data["id"] == str(upload_session.id)
+    assert data["part_size"] == upload_session.part_size
+    assert [part["part_number"] for part in data["parts"]] == [1, 2, 3]
+    assert data["parts"][2]["url"] == part_urls[2]
+    mock_entry_service.initiate_upload.assert_called_with(
+        user=mock_user,
+        filename="large.cvsx",
+        size_bytes=upload_session.size_bytes,
+        lattice_to_mesh=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_initiate_upload_rejects_empty_file(client, override_upload_deps):
+    response = await client.post(
+        "/api/v1/entries/uploads",
+        json={"filename": "empty.cvsx", "size_bytes": 0},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_upload_part_streams_body_to_service(client, override_upload_deps):
+    upload_id = uuid4()
+    received = bytearray()
+
+    async def upload_part(*, upload_session_id, user, part_number, chunks):
+        async for chunk in chunks:
+            received.extend(chunk)
+        return Part(part_number=part_number, etag="abc", size=len(received))
+
+    mock_entry_service.upload_part.side_effect = upload_part
+
+    response = await client.put(
+        f"/api/v1/entries/uploads/{upload_id}/parts/2",
+        content=b"chunk data",
+        headers={"Content-Type": "application/octet-stream"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"part_number": 2, "size": 10, "etag": "abc"}
+    assert received == b"chunk data"
+
+
+def part_upload_service(events: list[str]) -> EntryService:
+    service = EntryService(session=Mock())
+    service._get_pending_upload = AsyncMock(
+        return_value=UploadSession(
+            size_bytes=40,
+            part_size=16,
+            storage_key="temp/large.cvsx",
+            upload_id="upload-1",
+        )
+    )
+    service.upload_session_repo = AsyncMock()
+    service.upload_session_repo.commit.side_effect = lambda: events.append("commit")
+
+    async def upload_part(*, object_name, upload_id, part_number, chunks, length):
+        async for chunk in chunks:
+            events.append(f"chunk:{len(chunk)}")
+        return "abc"
+
+    service.storage = Mock()
+    service.storage.upload_part = AsyncMock(side_effect=upload_part)
+    return service
+
+
+async def body(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_upload_part_releases_session_before_streaming():
+    events: list[str] = []
+    service = part_upload_service(events)
+
+    part = await service.upload_part(
+        upload_session_id=uuid4(),
+        user=mock_user,
+        part_number=3,
+        chunks=body(b"1234", b"5678"),
+    )
+
+    assert (part.part_number, part.etag, part.size) == (3, "abc", 8)
+    assert events == ["commit", "chunk:4", "chunk:4"]
+    assert service.storage.upload_part.await_args.kwargs["length"] == 8
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chunks", "status_code"),
+    [
+        ((b"1234", b"56789"), status.HTTP_413_REQUEST_ENTITY_TOO_LARGE),
+        ((b"1234",), status.HTTP_400_BAD_REQUEST),
+    ],
+)
+async def test_upload_part_checks_size_while_streaming(chunks, status_code):
+    events: list[str] = []
+    service = part_upload_service(events)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.upload_part(
+            upload_session_id=uuid4(),
+            user=mock_user,
+            part_number=3,
+            chunks=body(*chunks),
+        )
+
+    assert exc_info.value.status_code == status_code
+    assert events == ["commit", "chunk:4"]
+
+
+def test_upload_session_part_sizes():
+    upload_session = UploadSession(size_bytes=40, part_size=16)
+
+    assert upload_session.part_count == 3
+    assert [upload_session.expected_part_size(n) for n in (1, 2, 3)] == [16, 16, 8]